@@ -0,0 +1,75 @@
+"""
+Bulk CLI throughput: postings/s of bulk_analyze.py as worker processes are added
+
+Writes a synthetic corpus whose links point at the fake services
+(benchmarks/fake_services.py), then runs the real CLI once per worker
+count and reports throughput, the speedup over one worker and the peak
+memory of the parent process (it only holds the in-flight chunks).
+
+Usage: python benchmarks/bench_bulk.py [--postings 2000 --workers 1,2,4,8]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import corpus
+import fake_services
+
+
+def run_cli(corpus_path: str, out_path: str, workers: int, extra: list) -> tuple:
+    """
+    Returns: (seconds, rows written, parent peak RSS in MB)
+    """
+    command = [sys.executable, '-c',
+               'import resource, sys, bulk_analyze; bulk_analyze.main(sys.argv[1:]); '
+               'print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, file=sys.stderr)',
+               corpus_path, '--out', out_path, '--workers', str(workers), '--fresh', *extra]
+    start = time.perf_counter()
+    finished = subprocess.run(command, cwd=REPO, capture_output=True, text=True, check=True)
+    seconds = time.perf_counter() - start
+    summary = json.loads(finished.stderr.strip().splitlines()[-2])
+    peak_kb = int(finished.stderr.strip().splitlines()[-1])
+    return seconds, summary['rows'], peak_kb / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--postings', type=int, default=2000)
+    parser.add_argument('--workers', default='1,2,4,8')
+    parser.add_argument('--page-delay', type=float, default=0.05, help="max fake page latency (s)")
+    parser.add_argument('--llm', action='store_true', help="include the (fake) LLM stage")
+    args = parser.parse_args()
+
+    server = fake_services.start_process()
+    extra = ['--llm'] if args.llm else []
+    # Inherited by the CLI and its workers
+    os.environ['SCAMSHIELD_LLM_URL'] = f"{server.base_url}/v1/chat/completions"
+    os.environ.setdefault('OPENROUTER_API_KEY', 'bench')
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            corpus_path = os.path.join(tmp, 'corpus.jsonl')
+            with open(corpus_path, 'w', encoding='utf-8') as f:
+                for posting in corpus.generate(args.postings, server.base_url, max_delay=args.page_delay):
+                    f.write(json.dumps(posting) + '\n')
+
+            print(f"{os.cpu_count()} cores, {args.postings:,} postings")
+            print(f"{'workers':>8}{'seconds':>9}{'post/s':>9}{'speedup':>9}{'parent MB':>11}")
+            baseline = None
+            for workers in (int(w) for w in args.workers.split(',')):
+                seconds, rows, peak = run_cli(corpus_path, os.path.join(tmp, 'out.jsonl'), workers, extra)
+                rate = rows / seconds
+                baseline = baseline or rate
+                print(f"{workers:>8}{seconds:>9.1f}{rate:>9.1f}{rate / baseline:>8.2f}x{peak:>11.0f}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Domain list lookups: hashed suffix index vs. the old substring scan
+
+Builds synthetic lists of growing size, then times index build, cold
+open (mmap) and lookups. Index lookups should stay flat as lists grow;
+the old `any(trusted in domain ...)` scan grows linearly.
+
+Usage: python benchmarks/bench_domain_lists.py [--sizes 11,10000,100000,500000]
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from domain_lists import DomainList, compile_list
+
+
+TLDS = ['com', 'in', 'co', 'xyz', 'online', 'co.in', 'net', 'org']
+PROBES = ['in.linkedin.com', 'www.naukri.com', 'linkedin.com.evil.xyz',
+          'a.b.c.d.careers-portal.co.in', 'unknown-site.online', 'jobs.example.org']
+
+
+def random_domain(rng: random.Random) -> str:
+    label = ''.join(rng.choice(string.ascii_lowercase + string.digits) for _ in range(rng.randint(5, 14)))
+    return f"{label}.{rng.choice(TLDS)}"
+
+
+def write_list(path: str, count: int, rng: random.Random) -> list:
+    domains = ['linkedin.com', 'naukri.com'] + [random_domain(rng) for _ in range(max(0, count - 2))]
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(domains) + '\n')
+    return domains
+
+
+def per_lookup_ns(fn, hosts: list, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for host in hosts:
+            fn(host)
+    return (time.perf_counter() - start) / (rounds * len(hosts)) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='11,10000,100000,500000')
+    parser.add_argument('--rounds', type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    print(f"{'domains':>10}{'build s':>10}{'open ms':>10}{'index ns':>11}{'scan ns':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in (int(s) for s in args.sizes.split(',')):
+            path = os.path.join(tmp, f"list_{size}.txt")
+            domains = write_list(path, size, rng)
+
+            start = time.perf_counter()
+            compile_list(path)
+            build = time.perf_counter() - start
+
+            start = time.perf_counter()
+            index = DomainList(path)
+            opened = time.perf_counter() - start
+
+            index_ns = per_lookup_ns(index.match, PROBES, args.rounds)
+            scan_rounds = max(1, args.rounds * 11 // size)
+            scan_ns = per_lookup_ns(lambda host: any(d in host for d in domains), PROBES, scan_rounds)
+
+            print(f"{len(index):>10,}{build:>10.2f}{opened * 1000:>10.2f}{index_ns:>11,.0f}{scan_ns:>12,.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+"""
+URL/domain extractor: fuzz invariants and flat latency on pathological input
+
+Times the extractor (and the whole shared feature pass) on adversarial
+texts of growing size and fails if cost per character grows with size.
+--legacy also times the regexes they replaced, for comparison.
+
+Usage: python benchmarks/bench_extractor.py [--fuzz 20000] [--max-size 30000] [--legacy]
+"""
+import argparse
+import random
+import os
+import re
+import sys
+import time
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from feature_extractor import extract_features
+from url_extractor import (COMMON_TLDS, MAX_DOMAIN_CANDIDATES, MAX_URL_CANDIDATES,
+                           TRAILING_PUNCTUATION, extract_domains, extract_urls)
+
+
+MAX_TEXT = 3000      # what UnifiedTextProcessor hands downstream
+FLAT_RATIO = 3.0     # allowed growth of per-char cost from smallest to largest size
+
+# The patterns the extractor replaced
+LEGACY = {
+    'url': re.compile(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+'),
+    'domain': re.compile(r'(?:www\.)?([a-zA-Z0-9-]+\.[a-zA-Z]{2,}(?:\.[a-zA-Z]{2,})?)'),
+    'email': re.compile(r'[\w\.-]+@([\w\.-]+)'),
+    'salary': re.compile(r'₹?\s*(\d+(?:,\d+)*)\s*(?:daily|per day|/day)'),
+}
+
+PATHOLOGICAL = {
+    'long word': lambda n: 'a' * n,
+    'digit run': lambda n: '1' * n,
+    'digit commas': lambda n: ('1,' * n)[:n],
+    'dotted labels': lambda n: ('a.' * n)[:n],
+    'hyphen labels': lambda n: ('a-' * n)[:n] + '.com',
+    'scheme spam': lambda n: ('http://' * n)[:n],
+    'one long url': lambda n: 'http://' + 'a' * (n - 7),
+    'url + brackets': lambda n: 'http://x.com/' + ')' * (n - 13),
+    'url + dots': lambda n: 'http://x.com/' + '.' * (n - 13),
+    'at chains': lambda n: ('a@' * n)[:n],
+    'many urls': lambda n: ('http://a.com/x ' * n)[:n],
+    'many domains': lambda n: ('site.com ' * n)[:n],
+}
+
+FUZZ_TOKENS = ['http://', 'https://', 'www.', '.', 'com', 'in', 'co', 'a', 'Z9', '-', '_',
+               '@', ':', '/', '?', '=', '&', '#', '(', ')', '[', ']', ',', '!', "'", '"',
+               ' ', ' ', '\n', '₹', '1', '99999', 'é', '%2F', 'gmail', 'per day']
+
+
+def best_time(fn, text: str, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def extractor(text: str):
+    urls = extract_urls(text)
+    extract_domains(text, urls)
+
+
+def features(text: str):
+    extract_features.__wrapped__(text).domains   # skip the lru_cache; URLs and domains are lazy
+
+
+# ═══════════════════════════════════════════
+# FLAT LATENCY
+# ═══════════════════════════════════════════
+def latency_table(sizes: list, repeat: int, legacy: bool) -> bool:
+    targets = {'extractor': extractor, 'features': features}
+    if legacy:
+        for name, pattern in LEGACY.items():
+            targets[f'legacy {name}'] = pattern.findall
+
+    header = f"{'input':<16}{'target':<16}" + ''.join(f"{n:>10,}" for n in sizes) + f"{'growth':>9}"
+    print("µs per 1k chars")
+    print(header)
+    flat = True
+    for case, make in PATHOLOGICAL.items():
+        for target, fn in targets.items():
+            legacy_target = target.startswith('legacy')
+            per_k = []
+            for n in sizes:
+                if legacy_target and n > MAX_TEXT:
+                    break   # quadratic ones would take minutes
+                text = make(n)
+                per_k.append(best_time(fn, text, repeat) / len(text) * 1e9)
+            growth = per_k[-1] / max(per_k[0], 1e-9)
+            if not legacy_target and growth > FLAT_RATIO:
+                flat = False
+            cells = [f"{v:>10.1f}" for v in per_k] + [f"{'-':>10}"] * (len(sizes) - len(per_k))
+            print(f"{case:<16}{target:<16}" + ''.join(cells) + f"{growth:>8.1f}x")
+    return flat
+
+
+# ═══════════════════════════════════════════
+# FUZZ
+# ═══════════════════════════════════════════
+def check(text: str) -> list:
+    """
+    Returns: list of invariant violations for one text
+    """
+    problems = []
+    urls = extract_urls(text)
+    domains = extract_domains(text, urls)
+
+    if len(urls) > MAX_URL_CANDIDATES or len(domains) > MAX_DOMAIN_CANDIDATES:
+        problems.append("candidate cap exceeded")
+    if len(set(urls)) != len(urls) or len(set(domains)) != len(domains):
+        problems.append("duplicates")
+    for url in urls:
+        if not url.startswith(('http://', 'https://')):
+            problems.append(f"bad scheme: {url!r}")
+        if url[-1] in TRAILING_PUNCTUATION:
+            problems.append(f"trailing punctuation: {url!r}")
+        if any(c.isspace() for c in url):
+            problems.append(f"whitespace in url: {url!r}")
+    hosts = set()
+    for url in urls:
+        host = urlsplit(url).hostname
+        while host.startswith('www.') and '.' in host[4:]:
+            host = host[4:]
+        hosts.add(host)
+    for domain in domains:
+        if domain != domain.lower() or (domain.startswith('www.') and '.' in domain[4:]):
+            problems.append(f"not normalized: {domain!r}")
+        if domain not in hosts and domain.rsplit('.', 1)[-1] not in COMMON_TLDS:
+            problems.append(f"unknown TLD: {domain!r}")
+    extract_features.__wrapped__(text).domains
+    return problems
+
+
+def fuzz(iterations: int, seed: int) -> tuple:
+    rng = random.Random(seed)
+    failures = 0
+    slowest = (0.0, '')
+    for _ in range(iterations):
+        text = ''.join(rng.choice(FUZZ_TOKENS) for _ in range(rng.randint(1, 400)))[:MAX_TEXT]
+        start = time.perf_counter()
+        try:
+            problems = check(text)
+        except Exception as e:
+            problems = [f"raised {e!r}"]
+        elapsed = time.perf_counter() - start
+        slowest = max(slowest, (elapsed, text))
+        if problems:
+            failures += 1
+            if failures <= 5:
+                print(f"FAIL {problems[:3]} for {text[:120]!r}")
+    return failures, slowest[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--fuzz', type=int, default=20000, help="random texts to check")
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--max-size', type=int, default=30000, help="largest pathological input")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--legacy', action='store_true', help="also time the replaced regexes")
+    args = parser.parse_args()
+
+    sizes = [n for n in (300, 1000, MAX_TEXT, 10000, 30000, 100000) if n <= args.max_size]
+    flat = latency_table(sizes, args.repeat, args.legacy)
+    failures, slowest = fuzz(args.fuzz, args.seed)
+
+    print(f"fuzz: {args.fuzz} texts, {failures} failures, slowest {slowest * 1000:.2f} ms")
+    print(f"latency flat (≤{FLAT_RATIO}x per-char growth): {'yes' if flat else 'NO'}")
+    sys.exit(0 if flat and not failures else 1)
+
+
+if __name__ == '__main__':
+    main()
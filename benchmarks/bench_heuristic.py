@@ -0,0 +1,73 @@
+"""
+Heuristic scorer throughput: one call per posting vs. one batched call
+
+Usage: python benchmarks/bench_heuristic.py [--postings N] [--repeat R]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from heuristic_scorer import score_many
+
+
+FRAGMENTS = [
+    "We are hiring a data analyst for our Pune office.",
+    "Company: Acme Analytics Pvt Ltd. Location: Pune. Role: Data Analyst.",
+    "Qualification: B.Tech or equivalent degree with 2+ years of experience.",
+    "Salary 8 LPA with health insurance and paid leave.",
+    "Apply through https://www.naukri.com/job-listings-123456.",
+    "URGENT HIRING!!! Work from home, earn daily ₹4,500 per day.",
+    "Pay a registration fee of ₹1,999 to confirm your slot.",
+    "Limited slots, act fast, whatsapp only 9876543210.",
+    "Contact hr.jobs@gmail.com or call +447911123456.",
+    "No experience needed, guaranteed income, be your own boss.",
+]
+
+
+def make_postings(count: int, seed: int = 42) -> list:
+    rng = random.Random(seed)
+    postings = []
+    for _ in range(count):
+        parts = [rng.choice(FRAGMENTS) for _ in range(rng.randint(3, 40))]
+        postings.append(' '.join(parts)[:3000])
+    return postings
+
+
+def bench_single(postings: list) -> float:
+    # Same work as AdvancedHeuristicScorer.analyze(), one posting per call
+    start = time.perf_counter()
+    for text in postings:
+        json.dumps(score_many([text])[0])
+    return time.perf_counter() - start
+
+
+def bench_batch(postings: list) -> float:
+    start = time.perf_counter()
+    for result in score_many(postings):
+        json.dumps(result)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--postings', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    postings = make_postings(args.postings)
+    best_single = min(bench_single(postings) for _ in range(args.repeat))
+    best_batch = min(bench_batch(postings) for _ in range(args.repeat))
+
+    print(f"postings: {len(postings)} (best of {args.repeat})")
+    print(f"single calls : {len(postings) / best_single:10,.0f} postings/s")
+    print(f"score_many   : {len(postings) / best_batch:10,.0f} postings/s")
+    print(f"speedup      : {best_single / best_batch:10.2f}x")
+
+
+if __name__ == '__main__':
+    main()
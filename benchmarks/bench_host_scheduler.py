@@ -0,0 +1,113 @@
+"""
+Host scheduler: a burst of messages linking to a tarpitting host, with
+and without per-host limits and the circuit breaker
+
+Every message links to one healthy page and one page on a host that never
+answers within the request timeout ("localhost" and "127.0.0.1" of the
+same fake server count as two hosts). Reports per-message latency,
+wall time, how many downloads reached the dead host and how many were
+open against it at once.
+
+Usage: python benchmarks/bench_host_scheduler.py [--messages 60 --threads 12 --timeout 1]
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fake_services
+import host_scheduler
+import http_client
+from domain_validator import EnhancedDomainValidator
+
+
+class CountingGet:
+    """
+    Wraps http_client.get to count downloads to the dead host and how
+    many were in flight at once
+    """
+
+    def __init__(self, get, dead_host: str):
+        self.get = get
+        self.dead_host = dead_host
+        self.attempts = 0
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, url, *args, **kwargs):
+        if self.dead_host not in url:
+            return self.get(url, *args, **kwargs)
+        with self.lock:
+            self.attempts += 1
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            return self.get(url, *args, **kwargs)
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+def run(server, args, enabled: bool) -> dict:
+    host_scheduler.ENABLED = enabled
+    host_scheduler.SCHEDULER = host_scheduler.HostScheduler(rate=args.rate, burst=args.rate)
+    port = server.base_url.rsplit(':', 1)[1]
+    counter = CountingGet(http_client.get, f"localhost:{port}")
+    http_client.get = counter
+    validator = EnhancedDomainValidator()
+
+    def message(i: int) -> float:
+        text = (f"Apply now: {server.base_url}/page?kind=job&n={i}&run={enabled} "
+                f"or http://localhost:{port}/page?delay=30&n={i}&run={enabled}")
+        started = time.perf_counter()
+        validator.validate_text(text)
+        return time.perf_counter() - started
+
+    try:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.threads) as pool:
+            latencies = sorted(pool.map(message, range(args.messages)))
+        wall = time.perf_counter() - started
+    finally:
+        http_client.get = counter.get
+    return {
+        'p50': statistics.median(latencies),
+        'p95': latencies[int(len(latencies) * 0.95) - 1],
+        'wall': wall,
+        'attempts': counter.attempts,
+        'peak': counter.peak
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--messages', type=int, default=60)
+    parser.add_argument('--threads', type=int, default=12)
+    parser.add_argument('--timeout', type=float, default=1.0, help="page request timeout (s)")
+    parser.add_argument('--rate', type=float, default=host_scheduler.RATE,
+                        help="per-host downloads/s; all healthy links share one host here")
+    args = parser.parse_args()
+
+    http_client.configure(timeout=args.timeout)
+    server = fake_services.start_process()
+    try:
+        print(f"{args.messages} messages on {args.threads} threads, {args.timeout:.1f}s request timeout, "
+              f"{args.rate:g}/s per host")
+        print(f"{'scheduler':<11}{'p50 ms':>9}{'p95 ms':>9}{'wall s':>9}{'dead-host GETs':>16}{'peak open':>11}")
+        for enabled in (False, True):
+            row = run(server, args, enabled)
+            print(f"{'on' if enabled else 'off':<11}{row['p50'] * 1000:>9.0f}{row['p95'] * 1000:>9.0f}"
+                  f"{row['wall']:>9.1f}{row['attempts']:>16}{row['peak']:>11}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Indicator store: build time, open time, lookup latency and memory
+
+Builds synthetic stores of growing size (phone numbers, UPI IDs, emails,
+domains), then times cold open, lookups of absent entities (answered by
+the Bloom filter) and of reported ones (Bloom + binary search), and reports
+the file size next to the memory the opened store actually holds.
+
+Usage: python benchmarks/bench_indicator_store.py [--sizes 1000,100000,1000000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from indicator_store import IndicatorStore, hash_entries, write_store
+
+
+def random_entry(rng: random.Random) -> tuple:
+    kind = rng.choice(('phone', 'phone', 'upi', 'email', 'domain'))
+    word = ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz0123456789') for _ in range(rng.randint(5, 12)))
+    if kind == 'phone':
+        return kind, f"{rng.choice('6789')}{rng.randrange(10 ** 9):09d}"
+    if kind == 'upi':
+        return kind, f"{word}@{rng.choice(('ybl', 'okaxis', 'paytm', 'upi'))}"
+    if kind == 'email':
+        return kind, f"{word}@{rng.choice(('gmail.com', 'hr-jobs.in', 'mail.xyz'))}"
+    return kind, f"{word}.{rng.choice(('com', 'in', 'xyz', 'online'))}"
+
+
+def per_lookup_ns(store: IndicatorStore, entries: list, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for kind, value in entries:
+            if kind == 'domain':
+                store.match_domain(value)
+            else:
+                store.contains(kind, value)
+    return (time.perf_counter() - start) / (rounds * len(entries)) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='1000,100000,1000000')
+    parser.add_argument('--rounds', type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    print(f"{'indicators':>11}{'build s':>9}{'file MB':>9}{'open ms':>9}"
+          f"{'heap KB':>9}{'miss ns':>9}{'hit ns':>9}{'false +':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in (int(s) for s in args.sizes.split(',')):
+            path = os.path.join(tmp, f"store_{size}.ssi")
+            entries = [random_entry(rng) for _ in range(size)]
+
+            start = time.perf_counter()
+            write_store(path, hash_entries(entries))
+            build = time.perf_counter() - start
+
+            tracemalloc.start()
+            start = time.perf_counter()
+            store = IndicatorStore(path)
+            opened = time.perf_counter() - start
+            heap = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+
+            hits = rng.sample(entries, min(200, size))
+            misses = [random_entry(rng) for _ in range(2000)]
+            false_positives = sum(
+                store.match_domain(v) is not None if k == 'domain' else store.contains(k, v)
+                for k, v in misses
+            )
+            miss_ns = per_lookup_ns(store, misses[:200], args.rounds)
+            hit_ns = per_lookup_ns(store, hits, args.rounds)
+
+            print(f"{len(store):>11,}{build:>9.2f}{os.path.getsize(path) / 1e6:>9.1f}{opened * 1000:>9.2f}"
+                  f"{heap / 1024:>9.1f}{miss_ns:>9,.0f}{hit_ns:>9,.0f}{false_positives / len(misses):>9.2%}")
+
+
+if __name__ == '__main__':
+    main()
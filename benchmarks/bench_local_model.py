@@ -0,0 +1,62 @@
+"""
+Local model: training time, weights file size, accuracy and inference latency
+
+Trains on a synthetic corpus (benchmarks/corpus.py), evaluates on a
+differently seeded one, and times inference one posting at a time and
+as one batch.
+
+Usage: python benchmarks/bench_local_model.py [--train 4000 --test 1000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import corpus
+from local_model import LocalModel, evaluate, train
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--train', type=int, default=4000)
+    parser.add_argument('--test', type=int, default=1000)
+    args = parser.parse_args()
+
+    training = corpus.generate(args.train, seed=1)
+    held_out = corpus.generate(args.test, seed=99)
+    texts = [p['text'] for p in held_out]
+    labels = [p['label'] == 'scam' for p in held_out]
+
+    start = time.perf_counter()
+    model = train([p['text'] for p in training], [p['label'] == 'scam' for p in training])
+    trained = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'local_model.npz')
+        model.save(path)
+        size = os.path.getsize(path)
+        model = LocalModel.load(path)
+
+    model.predict_proba(texts[:50])    # warm-up
+    start = time.perf_counter()
+    for text in texts:
+        model.predict_proba([text])
+    single = (time.perf_counter() - start) / len(texts)
+
+    start = time.perf_counter()
+    model.predict_proba(texts)
+    batch = (time.perf_counter() - start) / len(texts)
+
+    chars = sum(map(len, texts)) / len(texts)
+    print(f"train: {len(training):,} postings in {trained:.1f}s, weights file {size / 1024:.0f} KB")
+    print(f"eval:  {evaluate(model, texts, labels)}")
+    print(f"infer: {single * 1e6:.0f} µs/posting one at a time, {batch * 1e6:.0f} µs/posting "
+          f"batched (avg {chars:.0f} chars)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Near-duplicate index: lookup latency, recall and memory against index size
+
+Fills indexes of growing size with synthetic scam templates, then looks
+up copies with the phone number, salary and company name swapped (should
+hit), and unrelated postings (should miss). Reports per-lookup latency,
+the share of copies found, false matches, and the memory the index holds.
+
+Usage: python benchmarks/bench_near_duplicate.py [--sizes 1000,10000,50000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from near_duplicate import NearDuplicateIndex, signature
+
+VOCABULARY = ("work home earn daily registration fee slot whatsapp telegram join task payment "
+              "deposit refundable urgent hiring typing data entry simple guaranteed income bonus "
+              "training kit courier parcel review rating like share video channel verify account "
+              "bank details aadhar pan card interview selected candidate office manager team").split()
+COMPANIES = ["Star Digital Services", "Moon Tech Solutions", "Global Hire Pvt Ltd", "Bright Future Jobs",
+             "Sunrise Placements", "Skyline Careers"]
+
+
+def template(rng: random.Random) -> str:
+    # ~45 words, like a short chat-forwarded scam
+    words = [rng.choice(VOCABULARY) for _ in range(40)]
+    return (f"URGENT HIRING at {{company}}. {' '.join(words[:20])} earn {{salary}} per day. "
+            f"{' '.join(words[20:])} contact {{phone}} now.")
+
+
+def fill(text: str, rng: random.Random) -> str:
+    return text.format(company=rng.choice(COMPANIES), salary=rng.randint(1000, 9000),
+                       phone=f"9{rng.randrange(10 ** 9):09d}")
+
+
+def per_lookup_us(index: NearDuplicateIndex, texts: list) -> tuple:
+    """
+    Returns: (mean µs per lookup, number of texts that matched)
+    """
+    matched = 0
+    start = time.perf_counter()
+    for text in texts:
+        matched += index.lookup(text) is not None
+    return (time.perf_counter() - start) / len(texts) * 1e6, matched
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='1000,10000,50000')
+    parser.add_argument('--queries', type=int, default=500)
+    args = parser.parse_args()
+
+    rng = random.Random(21)
+    start = time.perf_counter()
+    for _ in range(200):
+        signature(fill(template(rng), rng))
+    signature_us = (time.perf_counter() - start) / 200 * 1e6
+    print(f"signature: {signature_us:.0f} µs per posting")
+
+    print(f"{'entries':>9}{'add µs':>9}{'heap MB':>9}{'B/entry':>9}"
+          f"{'hit µs':>9}{'recall':>9}{'miss µs':>9}{'false +':>9}")
+    for size in (int(s) for s in args.sizes.split(',')):
+        templates = [template(rng) for _ in range(size)]
+        index = NearDuplicateIndex(max_entries=size)
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        for text in templates:
+            index.add(fill(text, rng), {'llm_score': 90, 'scam_type': 'work-from-home'})
+        added = time.perf_counter() - start
+        heap = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        copies = [fill(text, rng) for text in rng.sample(templates, min(args.queries, size))]
+        unrelated = [fill(template(rng), rng) for _ in range(args.queries)]
+        hit_us, found = per_lookup_us(index, copies)
+        miss_us, false_matches = per_lookup_us(index, unrelated)
+
+        print(f"{len(index):>9,}{added / size * 1e6:>9.0f}{heap / 1e6:>9.1f}{heap / size:>9.0f}"
+              f"{hit_us:>9.0f}{found / len(copies):>9.1%}{miss_us:>9.0f}{false_matches / len(unrelated):>9.2%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,237 @@
+"""
+Offline end-to-end benchmark: every stage and the whole headless pipeline
+against local stand-ins for job pages and the LLM (benchmarks/fake_services.py)
+
+Reports p50/p95/p99 latency, throughput and tracemalloc peak per component
+and writes them as JSON so runs can be compared.
+
+Usage:
+    python benchmarks/bench_pipeline.py --postings 200 --out before.json
+    python benchmarks/bench_pipeline.py --postings 200 --compare before.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import corpus
+import fake_services
+import domain_validator
+import fetch_context
+import host_scheduler
+import llm_client
+import metrics
+import pipeline
+from heuristic_scorer import score_many
+from prompt_compactor import compact
+from result_formatter import format_report
+from score_combiner import combine_results
+from text_processor import MAX_PROMPT_SOURCE_CHARS, process_user_input
+
+
+# ═══════════════════════════════════════════
+# STATS
+# ═══════════════════════════════════════════
+def percentile(sorted_values: list, pct: float) -> float:
+    # Nearest rank
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+def summarize(latencies: list, wall: float) -> dict:
+    ordered = sorted(latencies)
+    return {
+        'count': len(ordered),
+        'p50_ms': round(percentile(ordered, 50) * 1000, 3),
+        'p95_ms': round(percentile(ordered, 95) * 1000, 3),
+        'p99_ms': round(percentile(ordered, 99) * 1000, 3),
+        'mean_ms': round(sum(ordered) / len(ordered) * 1000, 3) if ordered else 0.0,
+        'max_ms': round(ordered[-1] * 1000, 3) if ordered else 0.0,
+        'throughput_per_s': round(len(ordered) / wall, 2) if wall else 0.0
+    }
+
+
+def timed(fn, items: list, concurrency: int = 1) -> tuple:
+    """
+    Calls fn(item) for every item, timing each call
+    Returns: (outputs, summary_dict)
+    """
+    def one(item):
+        start = time.perf_counter()
+        out = fn(item)
+        return out, time.perf_counter() - start
+
+    start = time.perf_counter()
+    if concurrency > 1:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            runs = list(pool.map(one, items))
+    else:
+        runs = [one(item) for item in items]
+    wall = time.perf_counter() - start
+
+    return [out for out, _ in runs], summarize([t for _, t in runs], wall)
+
+
+def peak_memory(fn, items: list) -> int:
+    # Separate pass: tracemalloc slows everything down, so never time under it
+    tracemalloc.start()
+    try:
+        for item in items:
+            fn(item)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def clear_fetch_caches():
+    domain_validator.URL_CACHE.clear()
+    fetch_context.RECENT_PAGES.clear()
+
+
+# ═══════════════════════════════════════════
+# RUN
+# ═══════════════════════════════════════════
+def run(args) -> dict:
+    server = fake_services.start_process(llm_delay=args.llm_delay)
+    llm_client.API_URL = f"{server.base_url}/v1/chat/completions"
+    # Every fake page lives on one host; per-host limits would only measure
+    # themselves here (benchmarks/bench_host_scheduler.py covers them)
+    host_scheduler.SCHEDULER = host_scheduler.HostScheduler(max_per_host=1024, rate=0)
+    postings = corpus.generate(args.postings, server.base_url, seed=args.seed, max_delay=args.page_delay)
+    texts = [p['text'] for p in postings]
+    validator = domain_validator.EnhancedDomainValidator()
+
+    components = {}
+
+    def bench(name, fn, items, concurrency=1, before=None):
+        if before:
+            before()
+        outputs, summary = timed(fn, items, concurrency)
+        if before:
+            before()
+        summary['peak_kib'] = round(peak_memory(fn, items[:args.memory_sample]) / 1024, 1)
+        components[name] = summary
+        return outputs
+
+    processed = bench('text_processor', process_user_input, texts)
+    prompt_sources = [process_user_input(text, MAX_PROMPT_SOURCE_CHARS) for text in texts]
+    heuristic = bench('heuristic', lambda t: score_many([t])[0], processed)
+    compactions = bench('prompt_compactor', compact, prompt_sources)
+    domain = bench('domain_cold', validator.validate_text, processed, before=clear_fetch_caches)
+    for text in processed:
+        validator.validate_text(text)   # every link cached
+    bench('domain_warm', validator.validate_text, processed)
+    llm = bench('llm', pipeline.run_llm, prompt_sources)
+
+    stage_results = list(zip(heuristic, domain, llm))
+    combined = bench('combiner', lambda s: combine_results(*s), stage_results)
+    bench('formatter', format_report, combined)
+
+    clear_fetch_caches()
+    bench('end_to_end', lambda t: pipeline.analyze(t, use_cache=False), texts)
+    clear_fetch_caches()
+    _, concurrent = timed(lambda t: pipeline.analyze(t, use_cache=False), texts, args.concurrency)
+    components[f'end_to_end_x{args.concurrency}'] = concurrent
+
+    server.shutdown()
+
+    verdicts = {}
+    for posting, result in zip(postings, combined):
+        key = f"{posting['label']}->{result['final_verdict']}"
+        verdicts[key] = verdicts.get(key, 0) + 1
+
+    return {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'commit': git_commit(),
+            'postings': args.postings,
+            'seed': args.seed,
+            'page_delay_s': args.page_delay,
+            'llm_delay_s': args.llm_delay,
+            'concurrency': args.concurrency
+        },
+        'components': components,
+        'verdicts': verdicts,
+        'prompt': {
+            'tokens_in': sum(c.tokens_in for c in compactions),
+            'tokens_sent': sum(c.tokens_out for c in compactions),
+            'ratio': round(sum(c.tokens_out for c in compactions) / max(1, sum(c.tokens_in for c in compactions)), 3)
+        },
+        'instrumentation': metrics.summary()
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO,
+                              capture_output=True, text=True, timeout=5).stdout.strip()
+    except Exception:
+        return ''
+
+
+# ═══════════════════════════════════════════
+# OUTPUT
+# ═══════════════════════════════════════════
+def print_table(report: dict, baseline: dict = None):
+    base = (baseline or {}).get('components', {})
+    print(f"{'component':<18}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'ops/s':>10}{'peak KiB':>10}"
+          + (f"{'Δp50':>9}{'Δp95':>9}" if baseline else ''))
+    for name, row in report['components'].items():
+        peak = f"{row['peak_kib']:.0f}" if 'peak_kib' in row else '-'
+        line = (f"{name:<18}{row['p50_ms']:>10.2f}{row['p95_ms']:>10.2f}{row['p99_ms']:>10.2f}"
+                f"{row['throughput_per_s']:>10.1f}{peak:>10}")
+        if name in base:
+            line += f"{delta(base[name]['p50_ms'], row['p50_ms']):>9}{delta(base[name]['p95_ms'], row['p95_ms']):>9}"
+        print(line)
+    print(f"verdicts: {report['verdicts']}")
+    prompt = report.get('prompt')
+    if prompt:
+        print(f"prompt tokens: {prompt['tokens_in']} -> {prompt['tokens_sent']} (ratio {prompt['ratio']})")
+
+
+def delta(old: float, new: float) -> str:
+    if not old:
+        return 'n/a'
+    return f"{(new - old) / old * 100:+.0f}%"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--postings', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--page-delay', type=float, default=0.05, help="max fake page latency (s)")
+    parser.add_argument('--llm-delay', type=float, default=0.2, help="fake LLM latency (s)")
+    parser.add_argument('--concurrency', type=int, default=8, help="parallel analyses for the throughput run")
+    parser.add_argument('--memory-sample', type=int, default=50, help="postings per tracemalloc pass")
+    parser.add_argument('--out', help="write the JSON report here")
+    parser.add_argument('--compare', help="earlier JSON report to diff against")
+    args = parser.parse_args()
+
+    report = run(args)
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    print_table(report, baseline)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"report: {args.out}")
+
+
+if __name__ == '__main__':
+    main()
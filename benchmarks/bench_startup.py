@@ -0,0 +1,95 @@
+"""
+Cold start: import time per module and time to the first analysis
+
+Every measurement runs in a fresh interpreter, so nothing is cached
+between them. Import times are the median of a few runs of `import X` alone
+(dependencies included). Time to first analysis is measured three ways,
+against the fake services (benchmarks/fake_services.py):
+
+  no warm-up       SCAMSHIELD_WARMUP=0: the first request pays every import
+  warm-up, busy    the first request arrives right after import
+  warm-up, idle    the first request arrives once the warm-up is done
+
+Usage: python benchmarks/bench_startup.py [--runs 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fake_services
+
+MODULES = ['pipeline', 'domain_validator', 'text_processor', 'heuristic_scorer', 'local_model',
+           'http_client', 'llm_client', 'fetch_context', 'ocr_engine', 'startup',
+           'requests', 'numpy', 'asyncio', 'PIL.Image', 'pytesseract', 'bs4']
+
+IMPORT_ONE = """
+import time
+started = time.perf_counter()
+import {module}
+print(time.perf_counter() - started)
+"""
+
+FIRST_ANALYSIS = """
+import json, sys, time
+started = time.perf_counter()
+import pipeline, startup
+imported = time.perf_counter()
+if sys.argv[2] == 'idle':
+    startup.wait_ready(30)
+before = time.perf_counter()
+pipeline.analyze(sys.argv[1], use_cache=False)
+first = time.perf_counter()
+pipeline.analyze(sys.argv[1] + ' again', use_cache=False)
+print(json.dumps({'import': imported - started, 'first': first - before,
+                  'second': time.perf_counter() - first, 'total': first - started}))
+"""
+
+
+def python(code: str, *args, env: dict = None) -> str:
+    finished = subprocess.run([sys.executable, '-c', code, *args], cwd=REPO, capture_output=True,
+                              text=True, env={**os.environ, **(env or {})})
+    if finished.returncode:
+        raise RuntimeError(finished.stderr.strip().splitlines()[-1])
+    return finished.stdout.strip().splitlines()[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'module':<20}{'import ms':>10}")
+    for module in MODULES:
+        try:
+            runs = [float(python(IMPORT_ONE.format(module=module), env={'SCAMSHIELD_WARMUP': '0'}))
+                    for _ in range(args.runs)]
+        except RuntimeError:
+            print(f"{module:<20}{'n/a':>10}")
+            continue
+        print(f"{module:<20}{statistics.median(runs) * 1000:>10.1f}")
+
+    server = fake_services.start_process()
+    os.environ['SCAMSHIELD_LLM_URL'] = f"{server.base_url}/v1/chat/completions"
+    os.environ.setdefault('OPENROUTER_API_KEY', 'bench')
+    text = (f"URGENT HIRING work from home, earn 5000 per day. Pay the registration fee on WhatsApp. "
+            f"Details: {server.base_url}/page?kind=job&delay=0.01")
+    scenarios = [('no warm-up', '0', 'busy'), ('warm-up, busy', '1', 'busy'), ('warm-up, idle', '1', 'idle')]
+    try:
+        print(f"\n{'first analysis':<16}{'import':>9}{'first':>9}{'second':>9}{'total':>9}   (ms, median)")
+        for name, warmup, mode in scenarios:
+            runs = [json.loads(python(FIRST_ANALYSIS, text, mode, env={'SCAMSHIELD_WARMUP': warmup}))
+                    for _ in range(args.runs)]
+            row = {key: statistics.median(run[key] for run in runs) * 1000 for key in runs[0]}
+            print(f"{name:<16}{row['import']:>9.0f}{row['first']:>9.0f}{row['second']:>9.0f}{row['total']:>9.0f}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""
+Synthetic job-posting corpus: scam and legitimate postings across a range of
+lengths, URL counts and email counts
+
+Links point at benchmarks/fake_services.py, so domain checks never leave
+the machine. The same seed always gives the same corpus.
+
+Usage: python benchmarks/corpus.py --count 500 --base-url http://127.0.0.1:8765 > corpus.jsonl
+"""
+import argparse
+import json
+import random
+from urllib.parse import urlencode
+
+
+SCAM_SENTENCES = [
+    "URGENT HIRING!!! Work from home and earn ₹4,500 per day.",
+    "Pay a registration fee of ₹1,999 to confirm your slot.",
+    "Limited slots, act fast, contact us on WhatsApp only.",
+    "No experience needed, guaranteed income, be your own boss.",
+    "Join our Telegram group for daily tasks and instant payment.",
+    "Refundable security deposit of ₹5,000 required before joining.",
+    "Ghar baithe kamao, simple typing work, no interview.",
+    "Call now +447911123456 for immediate joining.",
+    "Dear candidate, you are selected kindly share your aadhar and bank details.",
+    "Earn 50 lakh per year doing simple like and share tasks.",
+]
+LEGIT_SENTENCES = [
+    "Acme Analytics Pvt Ltd is hiring a Data Analyst for our Pune office.",
+    "Qualification: B.Tech or equivalent degree with 2+ years of experience.",
+    "Salary 8 LPA with health insurance and paid leave.",
+    "Responsibilities include building dashboards and writing SQL reports.",
+    "The interview process has two technical rounds and one HR round.",
+    "Location: Bengaluru, hybrid, three days a week in office.",
+    "Company: Northwind Software. Role: Backend Engineer (Python).",
+    "Requirements: strong Python, REST APIs and PostgreSQL.",
+    "Please apply through our careers page; we never charge candidates.",
+    "Contact our recruitment team on 9876543210 during office hours.",
+]
+SCAM_EMAILS = ['hr.jobs{n}@gmail.com', 'recruit{n}@yahoo.com', 'careers{n}@rediffmail.com']
+LEGIT_EMAILS = ['careers{n}@acme-analytics.in', 'talent{n}@northwind.io']
+
+# Page shapes the fake server can serve: kind, status, redirects, size
+SCAM_PAGES = [('scam', 200, 0, 4096), ('plain', 200, 2, 2048), ('scam', 404, 0, 0), ('plain', 200, 4, 65536)]
+LEGIT_PAGES = [('job', 200, 0, 8192), ('job', 200, 1, 32768), ('job', 200, 0, 262144)]
+
+LENGTHS = (3, 10, 30, 80)      # sentences per posting
+URL_COUNTS = (0, 1, 2, 3, 5)
+EMAIL_COUNTS = (0, 1, 2)
+
+
+def page_url(base_url: str, kind: str, status: int, redirects: int, size: int, delay: float) -> str:
+    query = urlencode({'kind': kind, 'status': status, 'redirects': redirects,
+                       'size': size, 'delay': delay})
+    return f"{base_url}/page?{query}"
+
+
+def make_posting(rng: random.Random, n: int, scam: bool, base_url: str, delay: float) -> dict:
+    sentences = SCAM_SENTENCES if scam else LEGIT_SENTENCES
+    length = rng.choice(LENGTHS)
+    url_count = rng.choice(URL_COUNTS)
+    email_count = rng.choice(EMAIL_COUNTS)
+
+    parts = [rng.choice(sentences) for _ in range(length)]
+    if scam:
+        # Real scams borrow legit-sounding filler
+        parts += [rng.choice(LEGIT_SENTENCES) for _ in range(length // 3)]
+        rng.shuffle(parts)
+
+    pages = SCAM_PAGES if scam else LEGIT_PAGES
+    urls = [page_url(base_url, *rng.choice(pages), delay=round(rng.uniform(0, delay), 3))
+            for _ in range(url_count)]
+    emails = [rng.choice(SCAM_EMAILS if scam else LEGIT_EMAILS).format(n=n) for _ in range(email_count)]
+
+    for item in urls + emails:
+        parts.insert(rng.randint(0, len(parts)), f"Details: {item} .")
+
+    return {
+        'id': n,
+        'label': 'scam' if scam else 'legit',
+        'sentences': length,
+        'url_count': url_count,
+        'email_count': email_count,
+        'text': ' '.join(parts)
+    }
+
+
+def generate(count: int, base_url: str = 'http://127.0.0.1:8765', seed: int = 42,
+             scam_ratio: float = 0.5, max_delay: float = 0.05) -> list:
+    """
+    Builds `count` postings; page delays are drawn from 0..max_delay seconds
+    Returns: [{'id', 'label', 'sentences', 'url_count', 'email_count', 'text'}, ...]
+    """
+    rng = random.Random(seed)
+    return [make_posting(rng, n, rng.random() < scam_ratio, base_url, max_delay)
+            for n in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=500)
+    parser.add_argument('--base-url', default='http://127.0.0.1:8765')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--scam-ratio', type=float, default=0.5)
+    parser.add_argument('--max-delay', type=float, default=0.05)
+    args = parser.parse_args()
+
+    for posting in generate(args.count, args.base_url, args.seed, args.scam_ratio, args.max_delay):
+        print(json.dumps(posting, ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    main()
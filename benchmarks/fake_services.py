@@ -0,0 +1,219 @@
+"""
+Local stand-ins for the network: job pages for the Domain Validator and an
+OpenAI-style chat completions endpoint for the LLM branch
+
+Pages:  GET /page?delay=0.05&status=200&redirects=2&size=20000&kind=job
+        kind is job (og:type + keywords), scam (fee wording) or plain
+LLM:    POST /v1/chat/completions, replies after `llm_delay` seconds;
+        with "stream": true the reply is sent as server-sent events,
+        token by token, spread over `llm_delay`
+
+Usage: python benchmarks/fake_services.py [--port 8765]   (serves until Ctrl-C)
+"""
+import argparse
+import http.server
+import json
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+
+PAGE_HEADS = {
+    'job': "<meta property='og:type' content='job'>",
+    'scam': "",
+    'plain': "",
+}
+PAGE_BODIES = {
+    'job': "<h1>Data Analyst</h1><p>Job description, requirements, qualifications, "
+           "experience and salary. Apply now.</p>",
+    'scam': "<h1>URGENT HIRING</h1><p>Pay the registration fee and security deposit "
+            "today. Limited slots, immediate joining.</p>",
+    'plain': "<h1>Welcome</h1><p>Nothing to see here.</p>",
+}
+FILLER = "<p>Lorem ipsum dolor sit amet, consectetur adipiscing elit.</p>\n"
+
+LLM_SCAM_REPLY = {
+    'llm_score': 85,
+    'top_reasons': ["Upfront registration fee", "WhatsApp-only contact", "Unrealistic pay"],
+    'explain_brief': "Classic fee-first work-from-home scam.",
+    'scam_type': "work-from-home"
+}
+LLM_SAFE_REPLY = {
+    'llm_score': 15,
+    'top_reasons': ["Posted on a known job portal", "Realistic salary"],
+    'explain_brief': "Reads like an ordinary job listing.",
+    'scam_type': "unclear"
+}
+SCAM_HINTS = ('fee', 'deposit', 'whatsapp', 'telegram', 'per day')
+
+
+def page_html(kind: str, size: int) -> bytes:
+    head = f"<html><head><title>Jobs</title>{PAGE_HEADS.get(kind, '')}</head><body>"
+    body = PAGE_BODIES.get(kind, PAGE_BODIES['plain'])
+    html = head + body
+    if size > len(html):
+        html += FILLER * ((size - len(html)) // len(FILLER) + 1)
+    return (html[:max(size, len(head + body))] + "</body></html>").encode('utf-8')
+
+
+def llm_reply(user_text: str) -> str:
+    # Deterministic stand-in: fee/messaging wording reads as a scam
+    lowered = user_text.lower()
+    reply = LLM_SCAM_REPLY if any(hint in lowered for hint in SCAM_HINTS) else LLM_SAFE_REPLY
+    return "```json\n" + json.dumps(reply) + "\n```"
+
+
+class Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'   # keep-alive, like real sites
+    wbufsize = 64 * 1024            # headers + body in one send; avoids delayed-ACK stalls
+
+    def setup(self):
+        super().setup()
+        # Streamed tokens are tiny writes; don't let Nagle hold them back
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        time.sleep(float(query.get('delay', 0)))
+
+        redirects = int(query.get('redirects', 0))
+        if redirects > 0:
+            query['redirects'] = redirects - 1
+            query['delay'] = 0
+            self.send_response(302)
+            self.send_header('Location', f"{parts.path}?{urlencode(query)}")
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        status = int(query.get('status', 200))
+        body = page_html(query.get('kind', 'job'), int(query.get('size', 2048)))
+        self.send_bytes(status, body, 'text/html; charset=utf-8')
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        payload = json.loads(self.rfile.read(length) or b'{}')
+
+        user_text = next((m.get('content', '') for m in payload.get('messages', [])
+                          if m.get('role') == 'user'), '')
+        if payload.get('stream'):
+            self.stream_reply(llm_reply(user_text))
+            return
+        time.sleep(self.server.llm_delay)
+        reply = {'choices': [{'message': {'role': 'assistant', 'content': llm_reply(user_text)}}]}
+        self.send_bytes(200, json.dumps(reply).encode('utf-8'), 'application/json')
+
+    def stream_reply(self, content: str):
+        # ~4 characters per token, like a real tokenizer on English
+        tokens = [content[i:i + 4] for i in range(0, len(content), 4)]
+        pause = self.server.llm_delay / max(len(tokens), 1)
+        try:
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            for token in tokens:
+                time.sleep(pause)
+                event = {'choices': [{'delta': {'content': token}}]}
+                self.send_chunk(f"data: {json.dumps(event)}\n\n")
+                self.server.tokens_sent += 1
+            self.send_chunk("data: [DONE]\n\n")
+            self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True   # client stopped reading: stop generating
+
+    def send_chunk(self, text: str):
+        data = text.encode('utf-8')
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def send_bytes(self, status: int, body: bytes, content_type: str):
+        try:
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass   # client gave up (deadline/size cap); that's the point
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    llm_delay = 0.0
+    tokens_sent = 0     # streamed tokens actually written (early stops send fewer)
+
+    def handle_error(self, request, client_address):
+        # Clients dropping keep-alive connections are expected, not errors
+        if not isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            super().handle_error(request, client_address)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def start(port: int = 0, llm_delay: float = 0.0) -> FakeServer:
+    """
+    Starts both stand-ins on a background thread (port 0 = any free port)
+    Returns: the running server; .base_url for links, .shutdown() to stop
+    """
+    server = FakeServer(('127.0.0.1', port), Handler)
+    server.llm_delay = llm_delay
+    threading.Thread(target=server.serve_forever, daemon=True, name="fake-services").start()
+    return server
+
+
+class ServerProcess:
+    """
+    The stand-ins in a child process, same .base_url / .shutdown() as
+    FakeServer. Keeps their Python work (one wake-up per streamed token)
+    off the GIL of the process being measured.
+    """
+
+    def __init__(self, llm_delay: float = 0.0):
+        self._process = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), '--port', '0', '--llm-delay', str(llm_delay)],
+            stdout=subprocess.PIPE, text=True
+        )
+        # First line: "pages: http://127.0.0.1:PORT/page?..."
+        self.base_url = self._process.stdout.readline().split()[1].split('/page')[0]
+
+    def shutdown(self):
+        self._process.terminate()
+        self._process.wait()
+
+
+def start_process(llm_delay: float = 0.0) -> ServerProcess:
+    return ServerProcess(llm_delay)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--llm-delay', type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = start(args.port, args.llm_delay)
+    print(f"pages: {server.base_url}/page?kind=job&delay=0.1", flush=True)
+    print(f"llm:   {server.base_url}/v1/chat/completions", flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,291 @@
+"""
+Bulk analysis: score a JSONL or CSV file of postings across all cores
+
+The input is read as a stream and cut into chunks; chunks go to a pool of
+worker processes (one per core by default), each analyzing its postings
+on a few threads so page fetches overlap. Results are appended to a JSONL
+file as chunks finish (so not in input order; every row carries its `id`),
+with only a bounded number of chunks in flight, so memory stays flat
+however large the input.
+
+Progress is checkpointed next to the output. After a crash, running the
+same command again skips the chunks already done. It also cuts the output
+back to the last checkpoint, so nothing is written twice.
+
+Usage:
+    python bulk_analyze.py postings.jsonl --out results.jsonl
+    python bulk_analyze.py scraped.csv --out results.jsonl --text-field description --llm
+    python bulk_analyze.py postings.jsonl --out results.jsonl --workers 8 --fresh
+"""
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+
+CHUNK_SIZE = 64
+THREADS_PER_WORKER = int(os.environ.get('SCAMSHIELD_BULK_THREADS', 8))
+CHECKPOINT_EVERY = 5.0      # seconds between checkpoint writes
+
+# Result fields kept per row unless --full
+SUMMARY_FIELDS = ('final_score', 'final_verdict', 'risk_level', 'confidence', 'breakdown',
+                  'all_flags', 'early_exit', 'skip_reason')
+
+
+# ═══════════════════════════════════════════
+# INPUT (streamed)
+# ═══════════════════════════════════════════
+def read_postings(path: str, text_field: str, id_field: str, stats: Counter = None):
+    """
+    JSONL (objects or bare strings) or CSV, by extension; '-' is stdin JSONL
+    JSONL rows that are not valid JSON, or neither an object nor a string,
+    are skipped and counted in stats['bad_rows']
+    Yields: (id, text) in file order; id falls back to the row number
+    """
+    stats = Counter() if stats is None else stats
+    stream = sys.stdin if path == '-' else open(path, encoding='utf-8', newline='')
+    try:
+        if path.lower().endswith('.csv'):
+            csv.field_size_limit(sys.maxsize)
+            for number, row in enumerate(csv.DictReader(stream), 1):
+                yield (row.get(id_field) or number, row.get(text_field) or '')
+            return
+
+        for number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            if isinstance(row, str):
+                yield (number, row)
+            elif isinstance(row, dict):
+                yield (row.get(id_field, number), str(row.get(text_field) or ''))
+            else:
+                stats['bad_rows'] += 1
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def chunked(postings, size: int):
+    """
+    Yields: (chunk index, [(id, text), ...])
+    """
+    chunk = []
+    index = 0
+    for posting in postings:
+        chunk.append(posting)
+        if len(chunk) == size:
+            yield (index, chunk)
+            index += 1
+            chunk = []
+    if chunk:
+        yield (index, chunk)
+
+
+# ═══════════════════════════════════════════
+# WORKERS (one process per core)
+# ═══════════════════════════════════════════
+_options = None
+_threads = None
+
+
+def _init_worker(options: dict):
+    # Heavy imports happen here, once per worker process
+    global _options, _threads, pipeline
+    import pipeline
+    _options = options
+    _threads = ThreadPoolExecutor(max_workers=options['threads'], thread_name_prefix="bulk")
+
+
+def _analyze_one(posting: tuple) -> dict:
+    posting_id, text = posting
+    try:
+        result = pipeline.analyze(text, use_cache=_options['use_cache'], cascade=_options['cascade'],
+                                  use_llm=_options['llm'])
+    except Exception as e:
+        return {'id': posting_id, 'error': f"{type(e).__name__}: {e}"[:300]}
+    if not _options['full']:
+        result = {field: result[field] for field in SUMMARY_FIELDS if field in result}
+    return {'id': posting_id, **result}
+
+
+def analyze_chunk(index: int, postings: list) -> tuple:
+    """
+    Runs in a worker process, so the parent never re-parses the rows
+    Returns: (chunk index, JSONL text of its results, {verdict: count})
+    """
+    rows = list(_threads.map(_analyze_one, postings))
+    verdicts = Counter(row.get('final_verdict', 'ERROR') for row in rows)
+    return (index, ''.join(json.dumps(row, ensure_ascii=False) + '\n' for row in rows), dict(verdicts))
+
+
+# ═══════════════════════════════════════════
+# CHECKPOINTS
+# A chunk is done once its rows are in the output and a checkpoint
+# recording it (and the output size at that moment) is on disk.
+# ═══════════════════════════════════════════
+class Checkpoint:
+    """
+    Done chunks as a low-water mark plus the finished chunks above it
+    (chunks finish out of order), and the output size they account for
+    """
+
+    def __init__(self, path: str, settings: dict):
+        self.path = path
+        self.settings = settings
+        self.below = 0          # every chunk < below is done
+        self.above = set()
+        self.output_bytes = 0
+        self.rows = 0
+
+    def load(self) -> bool:
+        """
+        Returns: True when a checkpoint for the same run was found
+        """
+        if not os.path.exists(self.path):
+            return False
+        with open(self.path, encoding='utf-8') as f:
+            state = json.load(f)
+        if state['settings'] != self.settings:
+            raise SystemExit(f"{self.path} is from a run with other settings ({state['settings']}); "
+                             "use --fresh to start over")
+        self.below = state['below']
+        self.above = set(state['above'])
+        self.output_bytes = state['output_bytes']
+        self.rows = state['rows']
+        return True
+
+    def is_done(self, index: int) -> bool:
+        return index < self.below or index in self.above
+
+    def mark_done(self, index: int, rows: int):
+        self.above.add(index)
+        while self.below in self.above:
+            self.above.discard(self.below)
+            self.below += 1
+        self.rows += rows
+
+    def save(self, output_bytes: int):
+        self.output_bytes = output_bytes
+        state = {'settings': self.settings, 'below': self.below, 'above': sorted(self.above),
+                 'output_bytes': output_bytes, 'rows': self.rows}
+        tmp = f"{self.path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+
+# ═══════════════════════════════════════════
+# DRIVER
+# ═══════════════════════════════════════════
+def run(args) -> dict:
+    """
+    Returns: {'rows' (including resumed ones), 'skipped_chunks', 'bad_rows', 'seconds', 'verdicts' (this run)}
+    """
+    checkpoint_path = args.checkpoint or f"{args.out}.checkpoint"
+    settings = {'input': os.path.abspath(args.input) if args.input != '-' else '-',
+                'chunk_size': args.chunk_size, 'llm': args.llm, 'cascade': args.cascade, 'full': args.full}
+    checkpoint = Checkpoint(checkpoint_path, settings)
+    if args.fresh:
+        for path in (checkpoint_path, args.out):
+            if os.path.exists(path):
+                os.remove(path)
+    if not checkpoint.load() and os.path.exists(args.out) and os.path.getsize(args.out):
+        raise SystemExit(f"{args.out} already has results but no checkpoint; use --fresh to overwrite it")
+
+    # Rows written after the last checkpoint belong to chunks that will run again
+    out = open(args.out, 'ab')
+    out.truncate(checkpoint.output_bytes)
+    out.seek(0, os.SEEK_END)
+
+    options = {'threads': args.threads, 'llm': args.llm, 'cascade': args.cascade,
+               'use_cache': not args.no_cache, 'full': args.full}
+    input_stats = Counter()
+    chunks = chunked(read_postings(args.input, args.text_field, args.id_field, input_stats), args.chunk_size)
+    started = time.perf_counter()
+    last_checkpoint = started
+    resumed_rows = checkpoint.rows
+    skipped = 0
+    verdicts = Counter()
+    in_flight = {}
+
+    def finish(future):
+        nonlocal last_checkpoint
+        index, lines, chunk_verdicts = future.result()
+        out.write(lines.encode('utf-8'))
+        checkpoint.mark_done(index, sum(chunk_verdicts.values()))
+        verdicts.update(chunk_verdicts)
+        now = time.perf_counter()
+        if now - last_checkpoint >= CHECKPOINT_EVERY:
+            out.flush()
+            os.fsync(out.fileno())
+            checkpoint.save(out.tell())
+            last_checkpoint = now
+            log_progress(checkpoint.rows, checkpoint.rows - resumed_rows, now - started)
+
+    # spawn: workers start clean instead of inheriting this process's threads
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=args.workers, mp_context=context,
+                             initializer=_init_worker, initargs=(options,)) as pool:
+        for index, postings in chunks:
+            if checkpoint.is_done(index):
+                skipped += 1
+                continue
+            # Bounded: at most two chunks per worker queued or running
+            while len(in_flight) >= args.workers * 2:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    del in_flight[future]
+                    finish(future)
+            in_flight[pool.submit(analyze_chunk, index, postings)] = index
+
+        for future in list(in_flight):
+            finish(future)
+
+    out.flush()
+    os.fsync(out.fileno())
+    checkpoint.save(out.tell())
+    out.close()
+    if input_stats['bad_rows']:
+        print(f"Skipped {input_stats['bad_rows']:,} unreadable input rows", file=sys.stderr)
+    return {'rows': checkpoint.rows, 'skipped_chunks': skipped, 'bad_rows': input_stats['bad_rows'],
+            'seconds': round(time.perf_counter() - started, 2), 'verdicts': dict(verdicts)}
+
+
+def log_progress(total: int, this_run: int, seconds: float):
+    print(f"{total:,} postings done, {this_run / seconds:.1f}/s", file=sys.stderr, flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('input', help="JSONL or CSV file ('-' for JSONL on stdin)")
+    parser.add_argument('--out', required=True, help="results JSONL (appended to when resuming)")
+    parser.add_argument('--text-field', default='text')
+    parser.add_argument('--id-field', default='id')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="processes (default: one per core)")
+    parser.add_argument('--threads', type=int, default=THREADS_PER_WORKER, help="postings in parallel per worker")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('--llm', action='store_true', help="also run the LLM stage (off by default)")
+    parser.add_argument('--cascade', action='store_true', help="with --llm: only when it can change the verdict")
+    parser.add_argument('--no-cache', action='store_true', help="skip the result cache and near-duplicate reuse")
+    parser.add_argument('--full', action='store_true', help="write the whole result per posting")
+    parser.add_argument('--checkpoint', help="checkpoint file (default: <out>.checkpoint)")
+    parser.add_argument('--fresh', action='store_true', help="ignore any checkpoint and overwrite the output")
+    args = parser.parse_args(argv)
+
+    summary = run(args)
+    print(json.dumps(summary), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,294 @@
+"""
+Trusted / blocked domain lists with constant-time suffix lookup
+
+Lists are plain text files (one domain per line, '#' comments). Each is
+compiled once into an open-addressing hash table of 8-byte BLAKE2b
+hashes of the listed domains, stored next to the list as `<file>.idx`
+and memory-mapped, so start-up cost doesn't grow with list size.
+A lookup hashes each suffix of the host ("jobs.linkedin.com",
+"linkedin.com") and probes the table: cost depends on the host's label
+count, never on how many domains are listed.
+
+Usage:
+    python domain_lists.py build data/trusted_domains.txt
+    python domain_lists.py check data/trusted_domains.txt in.linkedin.com linkedin.com.evil.xyz
+"""
+import argparse
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+
+from metrics import log
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+TRUSTED_FILE = os.environ.get('SCAMSHIELD_TRUSTED_DOMAINS', os.path.join(DATA_DIR, 'trusted_domains.txt'))
+BLOCKED_FILE = os.environ.get('SCAMSHIELD_BLOCKED_DOMAINS', os.path.join(DATA_DIR, 'blocked_domains.txt'))
+RELOAD_CHECK = float(os.environ.get('SCAMSHIELD_DOMAIN_LIST_RELOAD', 30))   # seconds between mtime checks
+
+# magic, format version, entry count, slot count, content digest
+HEADER = struct.Struct('<4sIQQ16s')
+MAGIC = b'SSDL'
+FORMAT_VERSION = 1
+SLOT = struct.Struct('<Q')
+
+# Entries that would match whole registries. Single labels ('com') are
+# always refused; these are the multi-label ones we actually see.
+PUBLIC_SUFFIXES = frozenset("""
+    co.in net.in org.in gov.in ac.in edu.in res.in firm.in gen.in ind.in nic.in
+    co.uk org.uk ac.uk gov.uk me.uk ltd.uk plc.uk
+    com.au net.au org.au edu.au gov.au co.nz org.nz co.jp ne.jp or.jp
+    com.sg com.my com.pk com.bd com.np com.lk com.cn com.hk com.tw com.br
+    com.mx com.ar co.za com.ng co.ke com.ph com.vn co.id co.kr
+    github.io blogspot.com herokuapp.com appspot.com netlify.app vercel.app
+    web.app firebaseapp.com pages.dev workers.dev azurewebsites.net
+    cloudfront.net s3.amazonaws.com wixsite.com weebly.com
+""".split())
+
+
+def normalize_domain(name: str) -> str:
+    """
+    Lowercase, no wildcard/leading dot, no trailing dot, no 'www.'
+    """
+    name = name.strip().lower()
+    if name.startswith('*.'):
+        name = name[2:]
+    name = name.strip('.')
+    if name.startswith('www.') and '.' in name[4:]:
+        name = name[4:]
+    return name
+
+
+def is_public_suffix(name: str) -> bool:
+    return '.' not in name or name in PUBLIC_SUFFIXES
+
+
+def domain_hash(name: str) -> int:
+    # 0 marks an empty slot
+    value = int.from_bytes(hashlib.blake2b(name.encode('utf-8'), digest_size=8).digest(), 'little')
+    return value or 1
+
+
+def read_entries(path: str) -> list:
+    """
+    Returns: normalized, de-duplicated domains from a list file
+    """
+    entries = set()
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            name = normalize_domain(line.split('#', 1)[0])
+            if not name:
+                continue
+            if is_public_suffix(name):
+                log.warning("Skipping public suffix %r in %s", name, path)
+                continue
+            entries.add(name)
+    return sorted(entries)
+
+
+def build_index(entries: list) -> bytes:
+    """
+    Serializes entries into the on-disk hash table format
+    """
+    hashes = sorted({domain_hash(name) for name in entries})
+    capacity = 8
+    while capacity < len(hashes) * 2:   # load factor <= 0.5
+        capacity *= 2
+
+    slots = [0] * capacity
+    mask = capacity - 1
+    for value in hashes:
+        i = value & mask
+        while slots[i]:
+            i = (i + 1) & mask
+        slots[i] = value
+
+    body = struct.pack(f'<{capacity}Q', *slots)
+    digest = hashlib.blake2b(body, digest_size=16).digest()
+    return HEADER.pack(MAGIC, FORMAT_VERSION, len(hashes), capacity, digest) + body
+
+
+def compile_list(path: str, index_path: str = None) -> str:
+    """
+    (Re)builds `<path>.idx` atomically: write a temp file, then rename
+    Returns: the index path
+    """
+    index_path = index_path or path + '.idx'
+    data = build_index(read_entries(path))
+    tmp = f"{index_path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, index_path)
+    return index_path
+
+
+class _Index:
+    """
+    One immutable, loaded table; DomainList swaps whole instances on reload
+    """
+    __slots__ = ('buffer', 'count', 'mask', 'version')
+
+    def __init__(self, buffer):
+        magic, fmt, count, capacity, digest = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or fmt != FORMAT_VERSION or len(buffer) != HEADER.size + capacity * SLOT.size:
+            raise ValueError("not a domain list index")
+        self.buffer = buffer
+        self.count = count
+        self.mask = capacity - 1
+        self.version = digest.hex()
+
+    def __contains__(self, value: int) -> bool:
+        buffer, mask, unpack = self.buffer, self.mask, SLOT.unpack_from
+        i = value & mask
+        while True:
+            slot = unpack(buffer, HEADER.size + i * 8)[0]
+            if slot == value:
+                return True
+            if slot == 0:
+                return False
+            i = (i + 1) & mask
+
+
+class DomainList:
+    """
+    File-backed domain set matched on registrable-domain boundaries:
+    'linkedin.com' matches 'in.linkedin.com' but not 'linkedin.com.evil.xyz'
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._index = None
+        self._mtime = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+        self.reload()
+
+    def __len__(self):
+        return self._index.count
+
+    def __contains__(self, host: str) -> bool:
+        return self.match(host) is not None
+
+    @property
+    def version(self) -> str:
+        # Content digest: changes exactly when the list does
+        return self._index.version
+
+    def match(self, host: str):
+        """
+        Returns: the listed domain covering host (most specific), or None
+        """
+        self.maybe_reload()
+        index = self._index   # one read: a concurrent reload can't mix tables
+        host = (host or '').lower().rstrip('.')
+        start = 0
+        while True:
+            dot = host.find('.', start)
+            if dot < 0:
+                return None   # never match a bare TLD
+            suffix = host[start:]
+            if domain_hash(suffix) in index:
+                return suffix
+            start = dot + 1
+
+    def reload(self):
+        """
+        Loads the list, recompiling its index if the text file is newer
+        Readers keep using the old table until the new one is swapped in
+        """
+        with self._lock:
+            self._index, self._mtime = self._load()
+            self._checked = time.monotonic()
+        log.info("Loaded %d domains from %s", self._index.count, self.path)
+
+    def maybe_reload(self):
+        """
+        Re-reads the list if its file changed (checked every RELOAD_CHECK s)
+        """
+        now = time.monotonic()
+        if now - self._checked < RELOAD_CHECK:
+            return
+        self._checked = now
+        try:
+            changed = os.stat(self.path).st_mtime_ns != self._mtime
+        except OSError:
+            changed = self._mtime is not None
+        if changed:
+            self.reload()
+
+    def _load(self) -> tuple:
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            log.warning("Domain list %s not found; using an empty list", self.path)
+            return _Index(build_index([])), None
+
+        index_path = self.path + '.idx'
+        try:
+            if os.stat(index_path).st_mtime_ns < mtime:
+                raise FileNotFoundError(index_path)   # stale
+            return self._map(index_path), mtime
+        except (OSError, ValueError):
+            pass
+
+        try:
+            return self._map(compile_list(self.path, index_path)), mtime
+        except OSError:
+            # Read-only install: keep the compiled table in memory
+            return _Index(build_index(read_entries(self.path))), mtime
+
+    @staticmethod
+    def _map(index_path: str) -> _Index:
+        with open(index_path, 'rb') as f:
+            return _Index(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+_lists = {}
+_lists_lock = threading.Lock()
+
+
+def get_list(path: str) -> DomainList:
+    """
+    Shared DomainList per file path (loaded on first use)
+    """
+    with _lists_lock:
+        if path not in _lists:
+            _lists[path] = DomainList(path)
+        return _lists[path]
+
+
+def trusted() -> DomainList:
+    return get_list(TRUSTED_FILE)
+
+
+def blocked() -> DomainList:
+    return get_list(BLOCKED_FILE)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    sub = parser.add_subparsers(dest='command', required=True)
+    build = sub.add_parser('build', help="compile list files into .idx tables")
+    build.add_argument('files', nargs='+')
+    check = sub.add_parser('check', help="look hosts up in a list")
+    check.add_argument('file')
+    check.add_argument('hosts', nargs='+')
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        for path in args.files:
+            started = time.perf_counter()
+            index_path = compile_list(path)
+            print(f"{index_path}: {len(DomainList(path)):,} domains in {time.perf_counter() - started:.2f}s")
+    else:
+        domains = DomainList(args.file)
+        for host in args.hosts:
+            print(f"{host}: {domains.match(host) or '-'}")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,11 +1,75 @@
-from langflow.custom import Component
-from langflow.io import MessageTextInput, Output
-from langflow.schema.message import Message
-import re
+try:
+    from langflow.custom import Component
+    from langflow.io import MessageTextInput, Output
+    from langflow.schema.message import Message
+except ImportError:  # headless use without Langflow (see pipeline.py)
+    from headless import Component, MessageTextInput, Output, Message
+import os
 import json
-import requests
+import contextvars
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait
 from urllib.parse import urlparse
-from bs4 import BeautifulSoup
+
+import domain_lists
+import fetch_context
+import host_scheduler
+import indicator_store
+import metrics
+import progress
+import startup
+from feature_extractor import extract_features
+from page_inspector import document_signals, inspect_stream
+from verdict_cache import TTLCache, normalize_url
+
+requests = startup.lazy_import('requests')    # only its exception types are needed here
+
+
+MAX_URLS = 3                # Only the first few URLs in a message are visited
+URL_CHECK_WORKERS = 3       # Upper bound on concurrent fetches per message
+URL_CHECK_DEADLINE = 6.0    # Seconds for all URL checks of one message together
+MAX_PAGE_BYTES = fetch_context.MAX_PAGE_BYTES  # Per page read cap
+
+# Allow/block lists live in data/*.txt (see domain_lists.py); matched on
+# registrable-domain boundaries, reloaded when the files change
+TRUSTED_DOMAINS = domain_lists.trusted()
+BLOCKED_DOMAINS = domain_lists.blocked()
+
+# Look for job-related keywords on the page
+JOB_KEYWORDS = ['salary', 'requirements', 'qualifications', 
+                'experience', 'apply now', 'job description']
+
+# Scam indicators on the page
+PAGE_SCAM_INDICATORS = ['registration fee', 'processing fee', 'security deposit',
+                        'immediate joining', 'urgent hiring', 'limited slots']
+
+# ═══════════════════════════════════════════
+# FETCH CACHE
+# Page signals per normalized URL
+# Set SCAMSHIELD_CACHE_DB to a file path to persist it in SQLite
+# ═══════════════════════════════════════════
+CACHE_DB = os.environ.get('SCAMSHIELD_CACHE_DB')
+URL_CACHE = TTLCache(
+    maxsize=int(os.environ.get('SCAMSHIELD_URL_CACHE_SIZE', 10000)),
+    ttl=float(os.environ.get('SCAMSHIELD_URL_CACHE_TTL', 3600)),
+    path=CACHE_DB,
+    table='url_signals'
+)
+
+
+# One URL's share of the domain score; failed=True when the page couldn't
+# be read (timeout, connection error), so the result says nothing lasting
+UrlCheck = namedtuple('UrlCheck', ['score', 'flags', 'failed'], defaults=(False,))
+
+
+def timeout_result(url: str) -> UrlCheck:
+    """Scoring for a URL that didn't answer in time"""
+    return UrlCheck(25, [f"⚠️ URL timed out (slow/suspicious): {url}"], True)
+
+
+def connection_result(url: str) -> UrlCheck:
+    """Scoring for a URL whose host couldn't be reached"""
+    return UrlCheck(35, [f"🚨 Could not connect to URL: {url}"], True)
 
 
 class EnhancedDomainValidator(Component):
@@ -25,41 +89,48 @@ class EnhancedDomainValidator(Component):
     ]
     
     def validate_domains(self) -> Message:
+        with metrics.timer('domain'):
+            result = self.validate_text(self.text_input)
+        progress.report(self, self.text_input, 'domain', result)
+        return Message(text=json.dumps(result))
+    
+    def validate_text(self, text: str) -> dict:
+        """
+        Scores the domains, emails and URLs found in text
+        Returns: {'domain_score', 'domain_flags'}
+        """
         try:
-            text = self.text_input
             score = 0
             flags = []
+            fetch_failed = False
             
             # ═══════════════════════════════════════════
             # TRUSTED PLATFORMS (Baseline Check)
             # ═══════════════════════════════════════════
-            trusted_domains = [
-                'linkedin.com', 'naukri.com', 'indeed.com', 
-                'internshala.com', 'shine.com', 'monster.com',
-                'glassdoor.com', 'foundit.in', 'apna.co',
-                'hirist.com', 'freshersworld.com'
-            ]
-            
-            # ═══════════════════════════════════════════
-            # EXTRACT URLs FROM TEXT
-            # ═══════════════════════════════════════════
-            url_pattern = r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+'
-            urls = re.findall(url_pattern, text)
-            
-            # Also check for domains mentioned without http
-            domain_pattern = r'(?:www\.)?([a-zA-Z0-9-]+\.[a-zA-Z]{2,}(?:\.[a-zA-Z]{2,})?)'
-            mentioned_domains = re.findall(domain_pattern, text)
+            trusted_domains = TRUSTED_DOMAINS
             
             # ═══════════════════════════════════════════
-            # EXTRACT EMAIL DOMAINS
+            # URLs AND EMAIL DOMAINS (shared extraction stage)
             # ═══════════════════════════════════════════
-            emails = re.findall(r'[\w\.-]+@([\w\.-]+)', text)
+            features = extract_features(text)
+            lower = features.lower
+            urls = features.urls
+            emails = features.email_domains
             
             # ═══════════════════════════════════════════
             # CHECK EMAIL DOMAINS
             # ═══════════════════════════════════════════
+            store = indicator_store.get_store()
             for email_domain in emails:
-                if email_domain.lower() in ['gmail.com', 'yahoo.com', 'hotmail.com', 
+                blocked = BLOCKED_DOMAINS.match(email_domain)
+                if blocked:
+                    score += 40
+                    flags.append(f"🚨 Email from blocklisted domain: {blocked}")
+                elif store.match_domain(email_domain):
+                    # Scored with the other reported domains below; never
+                    # a corporate-email bonus
+                    continue
+                elif email_domain.lower() in ['gmail.com', 'yahoo.com', 'hotmail.com', 
                                               'outlook.com', 'rediffmail.com']:
                     score += 20
                     flags.append(f"🚩 Generic email provider: {email_domain}")
@@ -68,26 +139,37 @@ class EnhancedDomainValidator(Component):
                     score -= 10
                     flags.append(f"✅ Corporate email domain: {email_domain}")
             
+            # ═══════════════════════════════════════════
+            # KNOWN SCAM DOMAINS (indicator store)
+            # Reported hosts are already decided, so their URLs aren't visited
+            # ═══════════════════════════════════════════
+            reported = self.reported_domains(features)
+            for domain in reported:
+                score += 50
+                flags.append(f"🚨 CRITICAL: reported scam domain: {domain}")
+            
             # ═══════════════════════════════════════════
             # PROCESS EACH URL (ACTUAL BROWSING)
             # ═══════════════════════════════════════════
             if urls:
-                for url in urls[:3]:  # Limit to 3 URLs to avoid timeout
-                    url_score, url_flags = self.check_url(url, trusted_domains)
-                    score += url_score
-                    flags.extend(url_flags)
+                to_visit = [url for url in urls
+                            if not indicator_store.get_store().match_domain(urlparse(url).hostname)]
+                for check in self.check_urls(to_visit[:MAX_URLS], trusted_domains):
+                    score += check.score
+                    flags.extend(check.flags)
+                    fetch_failed = fetch_failed or check.failed
             else:
                 # No URLs found - suspicious for job postings
-                if any(keyword in text.lower() for keyword in ['apply', 'job', 'hiring', 'position']):
+                if any(keyword in lower for keyword in ['apply', 'job', 'hiring', 'position']):
                     score += 25
                     flags.append("🚩 No official URL provided for application")
             
             # ═══════════════════════════════════════════
             # CHECK FOR MESSAGING APP RECRUITMENT
             # ═══════════════════════════════════════════
-            if 'whatsapp' in text.lower() or 'telegram' in text.lower():
+            if 'whatsapp' in lower or 'telegram' in lower:
                 has_legitimate_url = any(
-                    any(trusted in url.lower() for trusted in trusted_domains) 
+                    trusted_domains.match(urlparse(url).hostname)
                     for url in urls
                 )
                 if not has_legitimate_url:
@@ -106,131 +188,243 @@ class EnhancedDomainValidator(Component):
                 'domain_score': score,
                 'domain_flags': flags
             }
+            if fetch_failed:
+                result['fetch_failed'] = True
             
-            return Message(text=json.dumps(result))
+            return result
             
         except Exception as e:
+            metrics.inc('errors_total', stage='domain')
             error_result = {
                 'domain_score': 50,
                 'domain_flags': [f"⚠️ Error in domain validation: {str(e)}"]
             }
-            return Message(text=json.dumps(error_result))
+            return error_result
+    
+    @staticmethod
+    def reported_domains(features) -> list:
+        """
+        Looks every URL host, bare domain and email domain up in the
+        known-scam indicator store (suffix match, like the blocklist)
+        Returns: the reported domains that matched, each once
+        """
+        store = indicator_store.get_store()
+        found = []
+        for domain in features.domains + features.email_domains:
+            match = store.match_domain(domain)
+            if match and match not in found:
+                found.append(match)
+        return found
     
     # ═══════════════════════════════════════════
-    # URL CHECKING FUNCTION (THE MAGIC PART)
+    # CONCURRENT URL CHECKS (ONE SHARED DEADLINE)
     # ═══════════════════════════════════════════
-    def check_url(self, url: str, trusted_domains: list) -> tuple:
+    def check_urls(self, urls: list, trusted_domains: domain_lists.DomainList) -> list:
         """
-        Actually visits the URL and analyzes the page
-        Returns: (score_adjustment, flags_list)
+        Runs check_url for every URL in parallel, bounded by URL_CHECK_DEADLINE
+        URLs still pending at the deadline get the regular timeout scoring
+        Returns: [UrlCheck, ...] in the order of urls
         """
-        score = 0
-        flags = []
+        if not urls:
+            return []
         
+        pool = ThreadPoolExecutor(
+            max_workers=min(len(urls), URL_CHECK_WORKERS),
+            thread_name_prefix="url-check"
+        )
         try:
-            # Set timeout to avoid hanging
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            
-            response = requests.get(url, timeout=5, headers=headers, allow_redirects=True)
-            
-            # ═══════════════════════════════════════════
-            # CHECK 1: HTTP Status Code
-            # ═══════════════════════════════════════════
-            if response.status_code == 200:
-                flags.append(f"✅ URL is accessible: {urlparse(url).netloc}")
-            elif response.status_code == 404:
-                score += 40
-                flags.append(f"🚨 URL not found (404): {url}")
-                return (score, flags)
-            else:
-                score += 20
-                flags.append(f"⚠️ URL returned status {response.status_code}")
-            
-            # ═══════════════════════════════════════════
-            # CHECK 2: HTTPS (Secure Connection)
-            # ═══════════════════════════════════════════
-            if url.startswith('https://'):
-                score -= 5
-                flags.append("✅ Uses secure HTTPS")
-            else:
-                score += 15
-                flags.append("🚩 No HTTPS encryption")
-            
-            # ═══════════════════════════════════════════
-            # CHECK 3: Trusted Platform
-            # ═══════════════════════════════════════════
-            domain = urlparse(url).netloc.lower()
-            is_trusted = any(trusted in domain for trusted in trusted_domains)
-            
-            if is_trusted:
-                score -= 30
-                flags.append(f"✅ Posted on trusted platform: {domain}")
-            else:
-                score += 15
-                flags.append(f"⚠️ Unknown platform: {domain}")
-            
-            # ═══════════════════════════════════════════
-            # CHECK 4: Parse HTML Content
-            # ═══════════════════════════════════════════
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Check for job-related meta tags
-            og_type = soup.find('meta', property='og:type')
-            if og_type and 'job' in og_type.get('content', '').lower():
-                score -= 15
-                flags.append("✅ Confirmed job posting page")
-            
-            # Check for job schema markup
-            job_schema = soup.find('script', type='application/ld+json')
-            if job_schema and 'JobPosting' in job_schema.string:
-                score -= 10
-                flags.append("✅ Contains structured job data")
-            
-            # ═══════════════════════════════════════════
-            # CHECK 5: Content Analysis
-            # ═══════════════════════════════════════════
-            page_text = soup.get_text().lower()
-            
-            # Look for job-related keywords
-            job_keywords = ['salary', 'requirements', 'qualifications', 
-                           'experience', 'apply now', 'job description']
-            keyword_count = sum(1 for keyword in job_keywords if keyword in page_text)
-            
-            if keyword_count >= 4:
-                score -= 10
-                flags.append(f"✅ Page contains job details ({keyword_count}/6 keywords)")
-            elif keyword_count < 2:
-                score += 10
-                flags.append("⚠️ Page lacks proper job description")
-            
-            # Check for scam indicators on page
-            scam_indicators = ['registration fee', 'processing fee', 'security deposit',
-                              'immediate joining', 'urgent hiring', 'limited slots']
-            scam_count = sum(1 for indicator in scam_indicators if indicator in page_text)
+            futures = [
+                pool.submit(contextvars.copy_context().run, self.check_url, url, trusted_domains)
+                for url in urls
+            ]
+            wait(futures, timeout=URL_CHECK_DEADLINE)
             
-            if scam_count >= 2:
-                score += 20
-                flags.append(f"🚨 Page contains {scam_count} scam indicators")
+            results = []
+            for url, future in zip(urls, futures):
+                if future.done():
+                    results.append(future.result())
+                else:
+                    metrics.inc('timeouts_total', stage='url_deadline')
+                    results.append(timeout_result(url))
+            return results
+        finally:
+            # Don't hold the message hostage to stragglers; their own
+            # request timeout lets the threads exit on their own
+            pool.shutdown(wait=False, cancel_futures=True)
+    
+    # ═══════════════════════════════════════════
+    # URL CHECKING FUNCTION (THE MAGIC PART)
+    # ═══════════════════════════════════════════
+    def check_url(self, url: str, trusted_domains: domain_lists.DomainList) -> UrlCheck:
+        """
+        Actually visits the URL and analyzes the page
+        Blocklisted hosts are flagged without being fetched
+        Fetch results are cached per normalized URL, so repeat links skip
+        the network but render exactly the flags a fresh fetch would
+        Returns: UrlCheck(score_adjustment, flags_list, failed)
+        """
+        try:
+            host = self.host_signals(url, trusted_domains)
+            if host['blocked']:
+                return UrlCheck(50, [f"🚨 Blocklisted scam domain: {host['blocked']}"])
             
-            # ═══════════════════════════════════════════
-            # CHECK 6: Redirects (Suspicious)
-            # ═══════════════════════════════════════════
-            if len(response.history) > 2:
-                score += 15
-                flags.append(f"⚠️ Multiple redirects detected ({len(response.history)})")
+            key = normalize_url(url)
+            signals = URL_CACHE.get(key)
+            if signals is None:
+                signals = self.fetch_signals(url)
+                URL_CACHE.set(key, signals)
             
-            return (score, flags)
+            return UrlCheck(*score_url(url, signals, host))
+        
+        except host_scheduler.HostUnavailable as e:
+            # Breaker open (or the host's queue full): same scoring as the
+            # failure it stands in for, without waiting on the network
+            metrics.inc('errors_total', stage='fetch', kind='host_unavailable')
+            return timeout_result(url) if e.reason == 'timeout' else connection_result(url)
             
         except requests.exceptions.Timeout:
-            return (25, [f"⚠️ URL timed out (slow/suspicious): {url}"])
+            metrics.inc('timeouts_total', stage='fetch')
+            return timeout_result(url)
         
         except requests.exceptions.SSLError:
-            return (30, [f"🚨 SSL certificate error: {url}"])
+            metrics.inc('errors_total', stage='fetch', kind='ssl')
+            return UrlCheck(30, [f"🚨 SSL certificate error: {url}"])
         
         except requests.exceptions.ConnectionError:
-            return (35, [f"🚨 Could not connect to URL: {url}"])
+            metrics.inc('errors_total', stage='fetch', kind='connection')
+            return connection_result(url)
         
         except Exception as e:
-            return (20, [f"⚠️ Error checking URL: {str(e)[:50]}"])
+            metrics.inc('errors_total', stage='fetch', kind='other')
+            metrics.log.debug("URL check failed for %s: %r", url, e)
+            return UrlCheck(20, [f"⚠️ Error checking URL: {str(e)[:50]}"], True)
+    
+    def host_signals(self, url: str, trusted_domains: domain_lists.DomainList) -> dict:
+        """
+        Host-level signals: hashed suffix lookups, O(labels) per list
+        Returns: {'trusted': bool, 'blocked': listed domain or None}
+        """
+        hostname = urlparse(url).hostname
+        return {
+            'trusted': trusted_domains.match(hostname) is not None,
+            'blocked': BLOCKED_DOMAINS.match(hostname)
+        }
+    
+    def fetch_signals(self, url: str) -> dict:
+        """
+        Reads the page (at most MAX_PAGE_BYTES) through an incremental
+        parser and keeps only what the scoring needs
+        The response comes from fetch_context: if the Text Processor already
+        downloaded and parsed this URL, its document is reused as is
+        Network errors propagate so they are scored (and never cached)
+        """
+        # 'fetch' times connect + redirects + headers; the body streams
+        # through the parser, so its download counts as 'html_parse'
+        with metrics.timer('fetch'):
+            page = fetch_context.fetch(url)
+        
+        if page.status == 404:
+            return {'status': 404}
+        
+        with metrics.timer('html_parse'):
+            if page.has_document:
+                signals = document_signals(page.document(), JOB_KEYWORDS, PAGE_SCAM_INDICATORS)
+            else:
+                signals, _ = inspect_stream(
+                    page.chunks(),
+                    page.encoding,
+                    JOB_KEYWORDS,
+                    PAGE_SCAM_INDICATORS,
+                    MAX_PAGE_BYTES
+                )
+        
+        signals['status'] = page.status
+        signals['redirects'] = page.redirects
+        return signals
+
+
+def score_url(url: str, signals: dict, host: dict) -> tuple:
+    """
+    Turns fetched page signals into (score_adjustment, flags_list)
+    """
+    score = 0
+    flags = []
+    
+    # ═══════════════════════════════════════════
+    # CHECK 1: HTTP Status Code
+    # ═══════════════════════════════════════════
+    status = signals['status']
+    if status == 200:
+        flags.append(f"✅ URL is accessible: {urlparse(url).netloc}")
+    elif status == 404:
+        score += 40
+        flags.append(f"🚨 URL not found (404): {url}")
+        return (score, flags)
+    else:
+        score += 20
+        flags.append(f"⚠️ URL returned status {status}")
+    
+    # ═══════════════════════════════════════════
+    # CHECK 2: HTTPS (Secure Connection)
+    # ═══════════════════════════════════════════
+    if url.startswith('https://'):
+        score -= 5
+        flags.append("✅ Uses secure HTTPS")
+    else:
+        score += 15
+        flags.append("🚩 No HTTPS encryption")
+    
+    # ═══════════════════════════════════════════
+    # CHECK 3: Trusted Platform
+    # ═══════════════════════════════════════════
+    domain = urlparse(url).netloc.lower()
+    
+    if host['trusted']:
+        score -= 30
+        flags.append(f"✅ Posted on trusted platform: {domain}")
+    else:
+        score += 15
+        flags.append(f"⚠️ Unknown platform: {domain}")
+    
+    # ═══════════════════════════════════════════
+    # CHECK 4: HTML Content (og:type, JSON-LD)
+    # ═══════════════════════════════════════════
+    if signals['og_job']:
+        score -= 15
+        flags.append("✅ Confirmed job posting page")
+    
+    if signals['job_schema']:
+        score -= 10
+        flags.append("✅ Contains structured job data")
+    
+    # ═══════════════════════════════════════════
+    # CHECK 5: Content Analysis
+    # ═══════════════════════════════════════════
+    keyword_count = signals['keyword_count']
+    
+    if keyword_count >= 4:
+        score -= 10
+        flags.append(f"✅ Page contains job details ({keyword_count}/6 keywords)")
+    elif keyword_count < 2:
+        score += 10
+        flags.append("⚠️ Page lacks proper job description")
+    
+    # Check for scam indicators on page
+    scam_count = signals['scam_count']
+    
+    if scam_count >= 2:
+        score += 20
+        flags.append(f"🚨 Page contains {scam_count} scam indicators")
+    
+    # ═══════════════════════════════════════════
+    # CHECK 6: Redirects (Suspicious)
+    # ═══════════════════════════════════════════
+    if signals['redirects'] > 2:
+        score += 15
+        flags.append(f"⚠️ Multiple redirects detected ({signals['redirects']})")
+    
+    return (score, flags)
+
+
+def cache_stats() -> dict:
+    return {'url': URL_CACHE.stats()}
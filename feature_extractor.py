@@ -0,0 +1,113 @@
+import re
+from functools import lru_cache
+
+import metrics
+from url_extractor import extract_domains, extract_urls
+
+
+# ═══════════════════════════════════════════
+# SHARED EXTRACTION (compiled once at import)
+# Heuristic Scorer and Domain Validator both read these, so each text is
+# lowercased and scanned once and both stages see the same matches.
+# The lookbehinds let a match start only where the run it needs begins;
+# without them a long digit/word run costs quadratic time.
+# ═══════════════════════════════════════════
+EMAIL_RE = re.compile(r'(?<![\w.-])([\w.-]+)@([\w.-]+)')
+PHONE_RE = re.compile(r'(?:\+91|0)?[6-9]\d{9}')
+INTL_PHONE_RE = re.compile(r'\+(?!91)\d{1,3}\d{7,}')
+DAILY_SALARY_RE = re.compile(r'₹?\s*(?<!\d)(?<!\d,)(\d+(?:,\d+)*)\s*(?:daily|per day|/day)')
+ANNUAL_SALARY_RE = re.compile(r'₹?\s*(?<!\d)(?<!\d,)(\d+(?:,\d+)*)\s*(?:lpa|per annum|/year)')
+
+class Features:
+    """
+    Every shared match for one processed text
+    All match tuples are immutable so cached instances can be shared safely
+    urls and domains are extracted on first access: the Heuristic Scorer
+    never reads them, so its batch path doesn't pay for URL parsing
+    """
+    __slots__ = (
+        'text',             # processed text as given
+        'lower',            # text.lower()
+        'email_domains',    # part after '@', original case
+        'emails',           # full addresses with a dotted domain, lowercased
+        'upi_ids',          # name@handle with a bare handle (9876543210@ybl), lowercased
+        'phones',           # Indian mobile numbers
+        'intl_phones',      # non +91 international numbers
+        'daily_salaries',   # amounts before 'per day' / 'daily' / '/day'
+        'annual_salaries',  # amounts before 'lpa' / 'per annum' / '/year'
+        '_urls',
+        '_domains',
+    )
+
+    def __init__(self, **fields):
+        for name, value in fields.items():
+            setattr(self, name, value)
+        self._urls = None
+        self._domains = None
+
+    @property
+    def urls(self) -> tuple:
+        """
+        http(s) URLs, normalized, deduplicated, in order
+        """
+        # Two threads racing here both compute the same tuple; either one sticks
+        if self._urls is None:
+            with metrics.timer('features'):
+                self._urls = tuple(extract_urls(self.text))
+        return self._urls
+
+    @property
+    def domains(self) -> tuple:
+        """
+        URL hosts + bare domains with a known TLD, lowercased
+        """
+        if self._domains is None:
+            urls = self.urls
+            with metrics.timer('features'):
+                self._domains = tuple(extract_domains(self.text, urls))
+        return self._domains
+
+
+def split_addresses(addresses: list, upi: bool) -> list:
+    """
+    UPI IDs are handle-only ('@ybl', '@okaxis'); anything with a dotted
+    domain is an email address
+    Returns: lowercased, deduplicated addresses of the requested kind
+    """
+    found = []
+    for local, domain in addresses:
+        domain = domain.rstrip('.').lower()
+        local = local.strip('.').lower()
+        if not local or not domain:
+            continue
+        is_upi = domain.isalpha() and len(local) >= 2
+        if upi != is_upi or (not upi and '.' not in domain):
+            continue
+        address = f"{local}@{domain}"
+        if address not in found:
+            found.append(address)
+    return found
+
+
+@lru_cache(maxsize=1024)
+def extract_features(text: str) -> Features:
+    """
+    One pass of every shared pattern over a processed text (URLs and
+    domains on first use, see Features)
+    Cached: the stages of one analysis get the same object back
+    Returns: Features
+    """
+    with metrics.timer('features'):
+        lower = text.lower()
+        addresses = EMAIL_RE.findall(text)
+        return Features(
+            text=text,
+            lower=lower,
+            email_domains=tuple(domain for _, domain in addresses),
+            emails=tuple(split_addresses(addresses, upi=False)),
+            upi_ids=tuple(split_addresses(addresses, upi=True)),
+            phones=tuple(PHONE_RE.findall(lower)),
+            intl_phones=tuple(INTL_PHONE_RE.findall(lower)),
+            daily_salaries=tuple(DAILY_SALARY_RE.findall(lower)),
+            annual_salaries=tuple(ANNUAL_SALARY_RE.findall(lower)),
+        )
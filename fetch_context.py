@@ -0,0 +1,232 @@
+"""
+Request-scoped fetch results: each URL is downloaded and parsed at most
+once per analysis
+
+A pasted URL is read by the Text Processor (page text) and again by the
+Domain Validator (page signals). Inside `scope()` both get the same
+FetchedPage: status, redirect history, final URL, the raw bytes and the
+parsed document. Bytes are pulled from the socket on demand and kept, so a
+consumer that stops early (the validator, once every signal is decided)
+doesn't force the whole download, and a later one replays what was read
+before reading on. Failures are shared too: a dead link times out once.
+Each page holds its host's download slot (host_scheduler.py) until the
+body is read or the page is released.
+
+Outside a scope (components run one by one by Langflow) pages are read in
+full and kept in a small short-TTL cache instead, so the same sharing
+happens without holding connections open between components.
+"""
+import contextvars
+import os
+import threading
+from contextlib import contextmanager
+
+import host_scheduler
+import http_client
+import metrics
+from page_inspector import CHUNK_SIZE, parse_document
+from verdict_cache import TTLCache, normalize_url
+
+
+MAX_PAGE_BYTES = int(os.environ.get('SCAMSHIELD_MAX_PAGE_BYTES', 1024 * 1024))  # Per page read cap
+RECENT_PAGES = TTLCache(
+    maxsize=int(os.environ.get('SCAMSHIELD_FETCH_SHARE_SIZE', 32)),
+    ttl=float(os.environ.get('SCAMSHIELD_FETCH_SHARE_TTL', 30)),
+    table='fetch_share'
+)
+
+# normalized URL -> _Slot for the current analysis; None outside scope()
+_pages = contextvars.ContextVar('scamshield_fetch_pages', default=None)
+
+
+class FetchedPage:
+    """
+    One GET response, shareable between threads and stages
+    """
+
+    def __init__(self, url: str, response, max_bytes: int = MAX_PAGE_BYTES,
+                 lease=host_scheduler.NO_LEASE):
+        self.url = url
+        self.final_url = response.url
+        self.status = response.status_code
+        self.history = tuple((r.status_code, r.url) for r in response.history)
+        self.encoding = response.encoding
+        self.max_bytes = max_bytes
+
+        self._response = response
+        self._lease = lease
+        self._body = response.iter_content(chunk_size=CHUNK_SIZE)
+        self._chunks = []
+        self._bytes = 0
+        self._complete = False
+        self._document = None
+        self._lock = threading.Lock()          # body reads
+        self._parse_lock = threading.Lock()    # the one parse
+
+    @property
+    def redirects(self) -> int:
+        return len(self.history)
+
+    @property
+    def content(self) -> bytes:
+        return b''.join(self.chunks())
+
+    @property
+    def has_document(self) -> bool:
+        return self._document is not None
+
+    def chunks(self):
+        """
+        Yields the body (up to max_bytes): buffered chunks first, then
+        reads on from the connection
+        """
+        i = 0
+        while True:
+            with self._lock:
+                if i < len(self._chunks):
+                    chunk = self._chunks[i]
+                elif self._complete:
+                    return
+                else:
+                    chunk = self._read_chunk()
+                    if chunk is None:
+                        return
+            i += 1
+            yield chunk
+
+    def document(self):
+        """
+        Parsed once, on first request
+        Returns: page_inspector.PageDocument
+        """
+        with self._parse_lock:
+            if self._document is None:
+                self._document = parse_document(self.chunks(), self.encoding, self.max_bytes)
+        return self._document
+
+    def read_all(self):
+        for _ in self.chunks():
+            pass
+
+    def release(self):
+        """
+        Closes the connection; what hasn't been read by now never will be
+        Doesn't wait for a reader blocked on the socket: closing it is
+        what unblocks a straggler
+        A host that sent part of the body counts as healthy; one that
+        sent none yet counts neither way
+        """
+        self._finish(succeeded=bool(self._chunks))
+
+    def _read_chunk(self):
+        # Caller holds the lock
+        if self._bytes >= self.max_bytes:
+            self._finish()
+            return None
+        try:
+            chunk = next(self._body)
+        except StopIteration:
+            self._finish()
+            return None
+        except Exception as e:
+            # A body that stalls counts against the host like a failed
+            # connect; a read cut short by release() already freed the slot
+            self._lease.release(e)
+            raise
+        chunk = chunk[:self.max_bytes - self._bytes]
+        self._chunks.append(chunk)
+        self._bytes += len(chunk)
+        return chunk
+
+    def _finish(self, succeeded: bool = True):
+        self._complete = True
+        self._response.close()
+        self._lease.release(succeeded=succeeded)
+
+
+class _Slot:
+    """
+    Per-URL entry in a scope: the first caller fetches, the rest wait
+    """
+    __slots__ = ('lock', 'page', 'error')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.page = None
+        self.error = None
+
+
+def _download(url: str, timeout: float = None) -> FetchedPage:
+    # Per-host slot, rate limit and breaker (host_scheduler.py); an open
+    # breaker raises HostUnavailable without touching the network. The
+    # page keeps the slot until its body is read or it's released
+    lease = host_scheduler.acquire(url)
+    try:
+        metrics.inc('fetches_total')
+        response = http_client.get(url, timeout=timeout, allow_redirects=True, stream=True)
+        return FetchedPage(url, response, lease=lease)
+    except BaseException as e:
+        lease.release(e)
+        raise
+
+
+def fetch(url: str, timeout: float = None) -> FetchedPage:
+    """
+    The shared page for url, downloading it on first use
+    `timeout` only applies if this call is the one that downloads;
+    network errors propagate
+    Returns: FetchedPage
+    """
+    key = normalize_url(url)
+    pages = _pages.get()
+
+    if pages is None:
+        page = RECENT_PAGES.get(key)
+        if page is None:
+            page = _download(url, timeout)
+            try:
+                page.read_all()   # nothing stays open between components
+            finally:
+                page.release()
+            RECENT_PAGES.set(key, page)
+        return page
+
+    slot = pages.setdefault(key, _Slot())   # dict.setdefault is atomic
+    with slot.lock:
+        if slot.error is not None:
+            raise slot.error
+        if slot.page is None:
+            try:
+                slot.page = _download(url, timeout)
+            except Exception as e:
+                slot.error = e
+                raise
+            metrics.inc('cache_requests_total', cache='fetch_scope', result='miss')
+        else:
+            metrics.inc('cache_requests_total', cache='fetch_scope', result='hit')
+        return slot.page
+
+
+@contextmanager
+def scope():
+    """
+    Shares fetches between everything that runs inside (including threads
+    started with contextvars.copy_context()); connections close on exit
+    Nested scopes join the outer one
+    """
+    if _pages.get() is not None:
+        yield
+        return
+    pages = {}
+    token = _pages.set(pages)
+    try:
+        yield
+    finally:
+        _pages.reset(token)
+        for slot in list(pages.values()):
+            if slot.page is not None:
+                slot.page.release()
+
+
+def in_scope() -> bool:
+    return _pages.get() is not None
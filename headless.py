@@ -0,0 +1,35 @@
+"""
+Minimal stand-ins for the Langflow classes the components build on, so
+the component modules import and run without Langflow installed (see
+pipeline.py). Inside Langflow the real classes are always used.
+"""
+
+
+class Component:
+    def __init__(self, **kwargs):
+        for name, value in kwargs.items():
+            setattr(self, name, value)
+
+
+class Message:
+    def __init__(self, text: str = '', **kwargs):
+        self.text = text
+        for name, value in kwargs.items():
+            setattr(self, name, value)
+
+    def __str__(self):
+        return self.text or ''
+
+
+class _Spec:
+    # Input/Output declarations only matter to the Langflow editor
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+class MessageTextInput(_Spec):
+    pass
+
+
+class Output(_Spec):
+    pass
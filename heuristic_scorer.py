@@ -1,77 +1,165 @@
-from langflow.custom import Component
-from langflow.io import MessageTextInput, Output
-from langflow.schema.message import Message
-import re
+try:
+    from langflow.custom import Component
+    from langflow.io import MessageTextInput, Output
+    from langflow.schema.message import Message
+except ImportError:  # headless use without Langflow (see pipeline.py)
+    from headless import Component, MessageTextInput, Output, Message
+from collections import namedtuple
 import json
+import time
 
+import indicator_store
+import metrics
+import progress
+from feature_extractor import extract_features
+from pattern_matcher import AhoCorasick
 
-class AdvancedHeuristicScorer(Component):
-    display_name = "Advanced Heuristic Scorer"
-    description = "Enhanced pattern detection with 50+ scam indicators"
-    
-    inputs = [
-        MessageTextInput(
-            name="text_input",
-            display_name="Text to Analyze",
-            info="Job posting text"
-        )
-    ]
+
+# ═══════════════════════════════════════════
+# RULE TABLES (compiled once at import)
+# ═══════════════════════════════════════════
+
+# CRITICAL RED FLAGS (30+ points each)
+CRITICAL_PATTERNS = {
+    'registration fee': 35,
+    'processing fee': 35,
+    'security deposit': 35,
+    'pay for training': 35,
+    'investment required': 40,
+    'send money': 40,
+    'western union': 45,
+    'gift card': 45,
+    'bitcoin': 40,
+    'cryptocurrency': 40
+}
+
+# HIGH-RISK INDICATORS (20-25 points)
+HIGH_RISK = {
+    'urgent hiring': 25,
+    'limited slots': 25,
+    'act fast': 25,
+    'immediate joining': 25,
+    'first come first serve': 25,
+    'telegram': 20,
+    'whatsapp only': 25,
+    'no experience needed': 15,
+    'work from home': 10,
+    'earn daily': 25,
+    'guaranteed income': 30,
+    'easy money': 30
+}
+
+GRAMMAR_ISSUES = [
+    'cant', 'wont', 'dont',  # Missing apostrophes
+    'pls', 'plz', 'msg',     # Abbreviations
+    'dm me', 'inbox me'       # Unprofessional
+]
+
+REQUIRED_FIELDS = {
+    'company name': ['company:', 'organization:', 'employer:'],
+    'job title': ['position:', 'role:', 'job title:'],
+    'location': ['location:', 'city:', 'office:'],
+    'qualifications': ['qualification', 'education', 'degree']
+}
+
+MANIPULATION_WORDS = [
+    'amazing opportunity', 'once in lifetime',
+    'exclusive offer', 'secret method',
+    'financial freedom', 'be your own boss',
+    'passive income', 'get rich'
+]
+
+SUSPICIOUS_EMAIL_DOMAINS = ['gmail.com', 'yahoo.com', 'hotmail.com',
+                            'outlook.com', 'rediffmail.com']
+
+# One entry per keyword; `group` ties required-field keywords to their field
+Rule = namedtuple('Rule', ['category', 'pattern', 'weight', 'group'])
+
+CRITICAL_RULES = [Rule('critical', p, w, None) for p, w in CRITICAL_PATTERNS.items()]
+HIGH_RISK_RULES = [Rule('high_risk', p, w, None) for p, w in HIGH_RISK.items()]
+GRAMMAR_RULES = [Rule('grammar', p, 0, None) for p in GRAMMAR_ISSUES]
+REQUIRED_RULES = [Rule('required', kw, 0, field)
+                  for field, keywords in REQUIRED_FIELDS.items() for kw in keywords]
+MANIPULATION_RULES = [Rule('manipulation', p, 0, None) for p in MANIPULATION_WORDS]
+
+RULE_MATCHER = AhoCorasick(
+    (rule.pattern, rule)
+    for rule in (CRITICAL_RULES + HIGH_RISK_RULES + GRAMMAR_RULES +
+                 REQUIRED_RULES + MANIPULATION_RULES)
+)
+
+
+# Reported-indicator hits (indicator_store.py); a confirmed report
+# outweighs any single keyword
+REPORTED_INDICATOR_WEIGHT = 50
+INDICATOR_LABELS = {'phone': 'phone number', 'upi': 'UPI ID', 'email': 'email'}
+
+
+def reported_indicators(features) -> list:
+    """
+    Looks every extracted phone number, UPI ID and email address up in the
+    known-scam indicator store
+    Returns: [(kind, value), ...] for the reported ones, each entity once
+    """
+    store = indicator_store.get_store()
+    hits = []
+    seen = set()
+    candidates = ([('phone', p) for p in features.phones + features.intl_phones]
+                  + [('upi', u) for u in features.upi_ids]
+                  + [('email', e) for e in features.emails])
+    for kind, value in candidates:
+        key = indicator_store.indicator_key(kind, value)
+        if key in seen:
+            continue
+        seen.add(key)
+        if store.contains(kind, value):
+            hits.append((kind, value))
+    return hits
+
+
+def score_many(texts) -> list:
+    """
+    Scores a batch of raw texts with the shared, precompiled rule tables
+    Regex extractions come from feature_extractor (shared with the Domain Validator)
+    Returns: list of {'heuristic_score', 'heuristic_flags'} dicts, in input order
+    """
+    # A one-text call is a pipeline branch and shares the cached features
+    # with the Domain Validator; a batch would only churn that cache
+    texts = list(texts)
+    extract = extract_features if len(texts) == 1 else extract_features.__wrapped__
     
-    outputs = [
-        Output(display_name="Heuristic Result", name="output", method="analyze")
-    ]
+    # Bind the matchers once for the whole batch
+    matches = RULE_MATCHER.matches
+    clock = time.perf_counter
+    observe = metrics.observe
+    results = []
     
-    def analyze(self) -> Message:
-        text = self.text_input.lower()
+    for raw_text in texts:
+        started = clock()
+        features = extract(raw_text)
+        text = features.lower
         score = 0
         flags = []
         
-    
-        critical_patterns = {
-            'registration fee': 35,
-            'processing fee': 35,
-            'security deposit': 35,
-            'pay for training': 35,
-            'investment required': 40,
-            'send money': 40,
-            'western union': 45,
-            'gift card': 45,
-            'bitcoin': 40,
-            'cryptocurrency': 40
-        }
-        
-        for pattern, points in critical_patterns.items():
-            if pattern in text:
-                score += points
-                flags.append(f"🚨 CRITICAL: '{pattern}' detected")
+        # Single pass over the text for every keyword rule
+        hits = matches(text)
         
-    
-        high_risk = {
-            'urgent hiring': 25,
-            'limited slots': 25,
-            'act fast': 25,
-            'immediate joining': 25,
-            'first come first serve': 25,
-            'telegram': 20,
-            'whatsapp only': 25,
-            'no experience needed': 15,
-            'work from home': 10,
-            'earn daily': 25,
-            'guaranteed income': 30,
-            'easy money': 30
-        }
+        for rule in CRITICAL_RULES:
+            if rule in hits:
+                score += rule.weight
+                flags.append(f"🚨 CRITICAL: '{rule.pattern}' detected")
         
-        for pattern, points in high_risk.items():
-            if pattern in text:
-                score += points
-                flags.append(f"⚠️ High Risk: '{pattern}'")
+        for rule in HIGH_RISK_RULES:
+            if rule in hits:
+                score += rule.weight
+                flags.append(f"⚠️ High Risk: '{rule.pattern}'")
         
         # ═══════════════════════════════════════════
         # SALARY REALITY CHECK (NEW!)
         # ═══════════════════════════════════════════
         
         # Daily salary check
-        daily_salary = re.findall(r'₹?\s*(\d+(?:,\d+)*)\s*(?:daily|per day|/day)', text)
+        daily_salary = features.daily_salaries
         for match in daily_salary:
             amount = int(match.replace(',', ''))
             if amount > 3000:  # ₹3k+ daily = ₹90k+ monthly
@@ -82,7 +170,7 @@ class AdvancedHeuristicScorer(Component):
                 flags.append(f"🚨 EXTREME: ₹{amount:,}/day (impossible)")
         
         # Monthly/Annual salary check
-        monthly_salary = re.findall(r'₹?\s*(\d+(?:,\d+)*)\s*(?:lpa|per annum|/year)', text)
+        monthly_salary = features.annual_salaries
         for match in monthly_salary:
             amount = int(match.replace(',', ''))
             if amount > 5000000:  # 50L+ for entry-level
@@ -92,15 +180,14 @@ class AdvancedHeuristicScorer(Component):
         # ═══════════════════════════════════════════
         # PHONE NUMBER PATTERNS (NEW!)
         # ═══════════════════════════════════════════
-        phone_pattern = r'(?:\+91|0)?[6-9]\d{9}'
-        phones = re.findall(phone_pattern, text)
+        phones = features.phones
         
         if len(phones) > 2:
             score += 20
             flags.append(f"📱 Multiple phone numbers ({len(phones)})")
         
         # Check for international numbers (scam indicator)
-        intl_phones = re.findall(r'\+(?!91)\d{1,3}\d{7,}', text)
+        intl_phones = features.intl_phones
         if intl_phones:
             score += 30
             flags.append(f"🌍 International phone number detected")
@@ -108,26 +195,24 @@ class AdvancedHeuristicScorer(Component):
         # ═══════════════════════════════════════════
         # EMAIL PATTERNS (NEW!)
         # ═══════════════════════════════════════════
-        emails = re.findall(r'[\w\.-]+@([\w\.-]+)', text)
-        
-        suspicious_emails = ['gmail.com', 'yahoo.com', 'hotmail.com', 
-                            'outlook.com', 'rediffmail.com']
+        emails = [domain.lower() for domain in features.email_domains]
         
         for domain in emails:
-            if domain.lower() in suspicious_emails:
+            if domain.lower() in SUSPICIOUS_EMAIL_DOMAINS:
                 score += 15
                 flags.append(f"📧 Generic email domain: {domain}")
         
         # ═══════════════════════════════════════════
-        # GRAMMAR & SPELLING ISSUES (NEW!)
+        # KNOWN SCAM INDICATORS (reported numbers / UPI IDs / emails)
         # ═══════════════════════════════════════════
-        grammar_issues = [
-            'cant', 'wont', 'dont',  # Missing apostrophes
-            'pls', 'plz', 'msg',     # Abbreviations
-            'dm me', 'inbox me'       # Unprofessional
-        ]
+        for kind, value in reported_indicators(features):
+            score += REPORTED_INDICATOR_WEIGHT
+            flags.append(f"🚨 CRITICAL: reported scam {INDICATOR_LABELS[kind]}: {value}")
         
-        grammar_count = sum(1 for issue in grammar_issues if issue in text)
+        # ═══════════════════════════════════════════
+        # GRAMMAR & SPELLING ISSUES (NEW!)
+        # ═══════════════════════════════════════════
+        grammar_count = sum(1 for rule in GRAMMAR_RULES if rule in hits)
         if grammar_count >= 2:
             score += 15
             flags.append(f"✍️ Poor grammar/spelling ({grammar_count} issues)")
@@ -135,17 +220,8 @@ class AdvancedHeuristicScorer(Component):
         # ═══════════════════════════════════════════
         # MISSING CRITICAL INFO (NEW!)
         # ═══════════════════════════════════════════
-        required_fields = {
-            'company name': ['company:', 'organization:', 'employer:'],
-            'job title': ['position:', 'role:', 'job title:'],
-            'location': ['location:', 'city:', 'office:'],
-            'qualifications': ['qualification', 'education', 'degree']
-        }
-        
-        missing_count = 0
-        for field, keywords in required_fields.items():
-            if not any(keyword in text for keyword in keywords):
-                missing_count += 1
+        found_fields = {rule.group for rule in REQUIRED_RULES if rule in hits}
+        missing_count = len(REQUIRED_FIELDS) - len(found_fields)
         
         if missing_count >= 3:
             score += 20
@@ -154,14 +230,7 @@ class AdvancedHeuristicScorer(Component):
         # ═══════════════════════════════════════════
         # EMOTIONAL MANIPULATION (NEW!)
         # ═══════════════════════════════════════════
-        manipulation_words = [
-            'amazing opportunity', 'once in lifetime', 
-            'exclusive offer', 'secret method',
-            'financial freedom', 'be your own boss',
-            'passive income', 'get rich'
-        ]
-        
-        manipulation_count = sum(1 for word in manipulation_words if word in text)
+        manipulation_count = sum(1 for rule in MANIPULATION_RULES if rule in hits)
         if manipulation_count >= 2:
             score += 20
             flags.append(f"🎭 Emotional manipulation tactics detected")
@@ -184,4 +253,29 @@ class AdvancedHeuristicScorer(Component):
             'heuristic_flags': flags[:10]  # Limit to 10 flags
         }
         
+        results.append(result)
+        observe('heuristic', clock() - started)
+    
+    return results
+
+
+class AdvancedHeuristicScorer(Component):
+    display_name = "Advanced Heuristic Scorer"
+    description = "Enhanced pattern detection with 50+ scam indicators"
+    
+    inputs = [
+        MessageTextInput(
+            name="text_input",
+            display_name="Text to Analyze",
+            info="Job posting text"
+        )
+    ]
+    
+    outputs = [
+        Output(display_name="Heuristic Result", name="output", method="analyze")
+    ]
+    
+    def analyze(self) -> Message:
+        result = score_many([self.text_input])[0]
+        progress.report(self, self.text_input, 'heuristic', result)
         return Message(text=json.dumps(result))
@@ -0,0 +1,322 @@
+"""
+Outbound page fetches, scheduled per host: concurrency cap, token-bucket
+rate limit and a circuit breaker
+
+A scam host that is down or tarpitting costs every message linking to it
+the full request timeout, and a burst of such messages ties up that many
+threads. Every page download (fetch_context._download) takes a Lease from
+acquire(url) and gives it back once the body has been read, which per host:
+
+  - lets at most SCAMSHIELD_HOST_CONCURRENCY downloads run at once
+  - starts at most SCAMSHIELD_HOST_RATE downloads a second (bursts up to
+    SCAMSHIELD_HOST_BURST)
+  - opens the breaker after SCAMSHIELD_BREAKER_FAILURES timeouts or
+    connection errors in a row. While open, requests fail at once with
+    HostUnavailable carrying the last failure's kind, and the Domain
+    Validator scores that exactly like the timeout or connection error
+    would have been. After SCAMSHIELD_BREAKER_COOLDOWN seconds one probe
+    request goes through (half-open). Success closes the breaker again;
+    failure keeps it open for another cool-down. A download only counts
+    as a success once its body arrived, so a host that answers headers
+    and then stalls the body trips the breaker too.
+
+A download that can't get a slot or a token within SCAMSHIELD_HOST_WAIT
+seconds fails the same way, as a timeout. SCAMSHIELD_HOST_SCHEDULER=0
+turns all of it off.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+import http_client
+import metrics
+import startup
+from metrics import log
+
+# Exception types only
+requests = startup.lazy_import('requests')
+urllib3 = startup.lazy_import('urllib3')
+
+
+ENABLED = os.environ.get('SCAMSHIELD_HOST_SCHEDULER', '1') == '1'
+# Default cap: the sockets the HTTP pool keeps per host anyway
+MAX_PER_HOST = int(os.environ.get('SCAMSHIELD_HOST_CONCURRENCY', http_client.POOL_MAXSIZE))
+RATE = float(os.environ.get('SCAMSHIELD_HOST_RATE', 50))            # downloads per second per host
+BURST = float(os.environ.get('SCAMSHIELD_HOST_BURST', 100))
+MAX_WAIT = float(os.environ.get('SCAMSHIELD_HOST_WAIT', 5))         # seconds queued for a slot/token
+FAILURE_THRESHOLD = int(os.environ.get('SCAMSHIELD_BREAKER_FAILURES', 3))
+COOL_DOWN = float(os.environ.get('SCAMSHIELD_BREAKER_COOLDOWN', 30))
+MAX_HOSTS = 4096        # host states kept; ones without leases are dropped oldest first
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+
+class HostUnavailable(Exception):
+    """
+    A download the scheduler refused to make
+    reason: 'timeout' or 'connection', the failure it stands in for
+    """
+
+    def __init__(self, host: str, reason: str, message: str):
+        super().__init__(message)
+        self.host = host
+        self.reason = reason
+
+
+class CircuitOpen(HostUnavailable):
+    pass
+
+
+class HostBusy(HostUnavailable):
+    pass
+
+
+def failure_reason(error):
+    """
+    Returns: 'timeout', 'connection' or None for errors that say nothing
+    about the host being down (SSL, bad URL, ...)
+    """
+    if isinstance(error, HostUnavailable):
+        return None
+    if isinstance(error, requests.exceptions.Timeout):
+        return 'timeout'
+    if isinstance(error, requests.exceptions.ConnectionError) \
+            and not isinstance(error, requests.exceptions.SSLError):
+        # A read timeout mid-body surfaces as ConnectionError(ReadTimeoutError)
+        cause = error.args[0] if error.args else None
+        return 'timeout' if isinstance(cause, urllib3.exceptions.ReadTimeoutError) else 'connection'
+    return None
+
+
+def host_key(url: str) -> str:
+    parts = urlsplit(url)
+    host = (parts.hostname or '').lower()
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    return f"{host}:{port}" if port else host
+
+
+# ═══════════════════════════════════════════
+# PER-HOST STATE
+# ═══════════════════════════════════════════
+class _Host:
+    __slots__ = ('cond', 'active', 'tokens', 'refilled', 'state', 'failures',
+                 'last_reason', 'opened_at', 'probing')
+
+    def __init__(self, burst: float):
+        self.cond = threading.Condition(threading.Lock())
+        self.active = 0
+        self.tokens = burst
+        self.refilled = time.monotonic()
+        self.state = CLOSED
+        self.failures = 0
+        self.last_reason = 'connection'
+        self.opened_at = 0.0
+        self.probing = False
+
+
+class Lease:
+    """
+    One admitted download; release() exactly once when it's over
+    (later calls are ignored, so a closing scope and a failing reader
+    can both try)
+    """
+    __slots__ = ('scheduler', 'key', 'host', 'probe', 'released')
+
+    def __init__(self, scheduler, key: str, host: _Host, probe: bool):
+        self.scheduler = scheduler
+        self.key = key
+        self.host = host
+        self.probe = probe
+        self.released = False
+
+    def release(self, error=None, succeeded: bool = True):
+        """
+        Frees the slot and feeds the outcome to the breaker: error is a
+        failure (if it says anything about the host), else succeeded=True
+        a success; succeeded=False tells nothing either way
+        """
+        self.scheduler._release(self, error, succeeded)
+
+
+class _NoLease:
+    __slots__ = ()
+
+    def release(self, error=None, succeeded: bool = True):
+        pass
+
+
+NO_LEASE = _NoLease()
+
+
+class HostScheduler:
+    """
+    Thread-safe per-host slots, token buckets and breakers
+    """
+
+    def __init__(self, max_per_host: int = MAX_PER_HOST, rate: float = RATE, burst: float = BURST,
+                 max_wait: float = MAX_WAIT, failure_threshold: int = FAILURE_THRESHOLD,
+                 cool_down: float = COOL_DOWN, max_hosts: int = MAX_HOSTS):
+        self.max_per_host = max_per_host
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self.max_wait = max_wait
+        self.failure_threshold = failure_threshold
+        self.cool_down = cool_down
+        self.max_hosts = max_hosts
+        self._hosts = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _host(self, key: str) -> _Host:
+        with self._lock:
+            host = self._hosts.get(key)
+            if host is None:
+                host = self._hosts[key] = _Host(self.burst)
+                if len(self._hosts) > self.max_hosts:
+                    self._drop_idle()
+            else:
+                self._hosts.move_to_end(key)
+            return host
+
+    def _drop_idle(self):
+        # Caller holds self._lock. Trims back to max_hosts, oldest first:
+        # hosts whose breaker state no longer matters (closed, or open
+        # with the cool-down over) go before ones still cooling down;
+        # hosts holding leases or a probe, and the one just added, always stay
+        now = time.monotonic()
+        for cooled_only in (True, False):
+            for key, host in list(self._hosts.items())[:-1]:
+                if len(self._hosts) <= self.max_hosts:
+                    return
+                if host.active or host.probing:
+                    continue
+                if cooled_only and host.state != CLOSED and now - host.opened_at < self.cool_down:
+                    continue
+                del self._hosts[key]
+
+    def acquire(self, key: str) -> Lease:
+        """
+        Waits for a slot and a token for host `key`
+        Raises: CircuitOpen while the breaker is open, HostBusy after max_wait
+        Returns: the Lease holding the slot (lease.probe: this request is
+        the half-open probe)
+        """
+        host = self._host(key)
+        deadline = time.monotonic() + self.max_wait
+        with host.cond:
+            probe = self._admit(key, host)
+            while host.active >= self.max_per_host:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not host.cond.wait(remaining):
+                    self._cancel_probe(host, probe)
+                    metrics.inc('host_rejections_total', reason='busy')
+                    raise HostBusy(key, 'timeout', f"{key}: too many downloads in flight")
+            if host.state != CLOSED and not probe:
+                # The breaker opened while this request was queued
+                probe = self._admit(key, host)
+
+            # Token bucket (rate <= 0: unlimited); a missing token is reserved
+            # (tokens go negative) and paid for by sleeping, so waiters keep their order
+            now = time.monotonic()
+            delay = 0.0
+            if self.rate > 0:
+                host.tokens = min(self.burst, host.tokens + (now - host.refilled) * self.rate)
+                host.refilled = now
+                if host.tokens < 1:
+                    delay = (1 - host.tokens) / self.rate
+            if now + delay > deadline:
+                self._cancel_probe(host, probe)
+                metrics.inc('host_rejections_total', reason='rate')
+                raise HostBusy(key, 'timeout', f"{key}: rate limited")
+            host.tokens -= 1
+            host.active += 1
+
+        if delay:
+            with metrics.timer('host_wait'):
+                time.sleep(delay)
+        return Lease(self, key, host, probe)
+
+    def _admit(self, key: str, host: _Host) -> bool:
+        # Caller holds host.cond; raises while open, picks the one probe once cooled down
+        if host.state == CLOSED:
+            return False
+        if host.state == OPEN and time.monotonic() - host.opened_at >= self.cool_down:
+            self._transition(key, host, HALF_OPEN)
+        if host.state == HALF_OPEN and not host.probing:
+            host.probing = True
+            return True
+        metrics.inc('host_rejections_total', reason='open')
+        raise CircuitOpen(key, host.last_reason, f"{key}: circuit open after repeated {host.last_reason} failures")
+
+    def _cancel_probe(self, host: _Host, probe: bool):
+        if probe:
+            host.probing = False
+
+    def _release(self, lease: Lease, error, succeeded: bool):
+        # The lease's own _Host: the table may have dropped and re-created
+        # the key since, and the waiters to wake are on this one
+        host = lease.host
+        with host.cond:
+            if lease.released:
+                return
+            lease.released = True
+            host.active -= 1
+            host.cond.notify()
+            if lease.probe:
+                host.probing = False
+            reason = failure_reason(error) if error is not None else None
+            self._record(lease.key, host, reason, error is None and succeeded)
+
+    def _record(self, key: str, host: _Host, reason, succeeded: bool):
+        # Caller holds host.cond
+        if reason is not None:
+            host.failures += 1
+            host.last_reason = reason
+            if host.state == HALF_OPEN or (host.state == CLOSED and host.failures >= self.failure_threshold):
+                host.opened_at = time.monotonic()
+                self._transition(key, host, OPEN)
+                host.cond.notify_all()    # queued requests fail fast too
+        elif succeeded:
+            host.failures = 0
+            if host.state != CLOSED:
+                self._transition(key, host, CLOSED)
+
+    def _transition(self, key: str, host: _Host, state: str):
+        host.state = state
+        metrics.inc('breaker_transitions_total', to=state)
+        log.info("Circuit for %s is now %s (%d consecutive failures)", key, state, host.failures)
+
+    def state(self, key: str) -> str:
+        with self._lock:
+            host = self._hosts.get(key)
+        return host.state if host is not None else CLOSED
+
+    def stats(self) -> dict:
+        with self._lock:
+            hosts = list(self._hosts.items())
+        return {
+            'hosts': len(hosts),
+            'open': sorted(key for key, host in hosts if host.state != CLOSED),
+            'active': sum(host.active for _, host in hosts)
+        }
+
+    def clear(self):
+        with self._lock:
+            self._hosts.clear()
+
+
+SCHEDULER = HostScheduler()
+
+
+def acquire(url: str):
+    """
+    lease = host_scheduler.acquire(url), then lease.release(...) once the
+    response body is read (or the request failed)
+    Raises: HostUnavailable instead of admitting the download
+    Returns: a Lease (a no-op one when the scheduler is off)
+    """
+    return SCHEDULER.acquire(host_key(url)) if ENABLED else NO_LEASE
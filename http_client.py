@@ -0,0 +1,89 @@
+import os
+import threading
+
+import startup
+
+requests = startup.lazy_import('requests')    # imported on the first request (or by the warm-up)
+
+
+# ═══════════════════════════════════════════
+# SETTINGS (environment overrides, or configure())
+# ═══════════════════════════════════════════
+USER_AGENT = os.environ.get(
+    'SCAMSHIELD_USER_AGENT',
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+)
+POOL_CONNECTIONS = int(os.environ.get('SCAMSHIELD_HTTP_POOL_CONNECTIONS', 32))  # hosts kept warm
+POOL_MAXSIZE = int(os.environ.get('SCAMSHIELD_HTTP_POOL_MAXSIZE', 8))           # sockets per host
+TIMEOUT = float(os.environ.get('SCAMSHIELD_HTTP_TIMEOUT', 5))                   # seconds
+
+_session = None
+_lock = threading.Lock()
+
+
+def _build_session() -> 'requests.Session':
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        max_retries=0
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update({
+        'User-Agent': USER_AGENT,
+        'Connection': 'keep-alive'
+    })
+    return session
+
+
+def get_session() -> 'requests.Session':
+    """
+    Process-wide session: keep-alive connections pooled per host
+    """
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def configure(pool_connections: int = None, pool_maxsize: int = None,
+              timeout: float = None, user_agent: str = None):
+    """
+    Changes pool sizes / default timeout / User-Agent
+    The current session is closed and rebuilt on next use
+    """
+    global POOL_CONNECTIONS, POOL_MAXSIZE, TIMEOUT, USER_AGENT
+    if pool_connections is not None:
+        POOL_CONNECTIONS = pool_connections
+    if pool_maxsize is not None:
+        POOL_MAXSIZE = pool_maxsize
+    if timeout is not None:
+        TIMEOUT = timeout
+    if user_agent is not None:
+        USER_AGENT = user_agent
+    close()
+
+
+def close():
+    global _session
+    with _lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def get(url: str, timeout: float = None, **kwargs) -> 'requests.Response':
+    """
+    GET through the shared pool; same arguments as requests.get
+    """
+    return get_session().get(url, timeout=TIMEOUT if timeout is None else timeout, **kwargs)
+
+
+def post(url: str, timeout: float = None, **kwargs) -> 'requests.Response':
+    """
+    POST through the shared pool; same arguments as requests.post
+    """
+    return get_session().post(url, timeout=TIMEOUT if timeout is None else timeout, **kwargs)
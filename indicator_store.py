@@ -0,0 +1,402 @@
+"""
+Known-scam indicator store: phone numbers, UPI IDs, emails and domains
+
+Indicators are kept as 8-byte BLAKE2b hashes of "kind:normalized value",
+compiled into one file: a Bloom filter followed by the sorted hash array.
+The file is memory-mapped, so opening a store of millions of indicators
+reads only the header and resident memory is just the pages lookups touch.
+A lookup checks a few Bloom bits (almost every clean entity stops there)
+and only on a Bloom hit binary-searches the sorted array, so false
+positives never reach the scorers.
+
+Reports added between builds go to an append-only log next to the store
+(`<store>.log`, one "kind<TAB>value" per line) that is loaded into a small
+in-memory set; `compact` folds it into a fresh store file.
+
+Usage:
+    python indicator_store.py build reports.tsv [more.tsv ...]      # kind<TAB>value lines
+    python indicator_store.py build --kind phone numbers.txt         # one value per line
+    python indicator_store.py append phone 9876543210 upi fake.hr@ybl
+    python indicator_store.py compact
+    python indicator_store.py check phone +91-98765-43210 domain jobs.fake-hr.xyz
+"""
+import argparse
+import hashlib
+import math
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left
+
+from metrics import log
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+STORE_FILE = os.environ.get('SCAMSHIELD_INDICATORS', os.path.join(DATA_DIR, 'indicators.ssi'))
+RELOAD_CHECK = float(os.environ.get('SCAMSHIELD_INDICATOR_RELOAD', 30))   # seconds between mtime checks
+BLOOM_BITS_PER_ENTRY = 10    # ~1% false positives with 7 probes
+BLOOM_PROBES = 7
+
+KINDS = ('phone', 'upi', 'email', 'domain')
+
+# magic, format version, entry count, bloom size in bytes, probes, content digest
+HEADER = struct.Struct('<4sIQQI16s')
+MAGIC = b'SSIS'
+FORMAT_VERSION = 1
+
+
+# ═══════════════════════════════════════════
+# NORMALIZATION
+# Reports arrive in every format people type; the same number or ID has
+# to hash the same whether it came from a report or from a message.
+# ═══════════════════════════════════════════
+def normalize_phone(value: str) -> str:
+    digits = ''.join(c for c in value if c.isdigit())
+    # Indian mobiles: drop +91 / 0 so "+91 98765 43210" == "098765-43210"
+    if len(digits) == 12 and digits.startswith('91') and digits[2] in '6789':
+        return digits[2:]
+    if len(digits) == 11 and digits.startswith('0') and digits[1] in '6789':
+        return digits[1:]
+    return digits
+
+
+def normalize_domain(value: str) -> str:
+    value = value.strip().lower().rstrip('.')
+    while value.startswith('www.') and '.' in value[4:]:
+        value = value[4:]
+    return value
+
+
+NORMALIZERS = {
+    'phone': normalize_phone,
+    'upi': lambda value: value.strip().lower(),
+    'email': lambda value: value.strip().lower().rstrip('.'),
+    'domain': normalize_domain,
+}
+
+
+def indicator_key(kind: str, value: str) -> str:
+    """
+    Returns: "kind:normalized value", or '' if nothing is left to store
+    """
+    if kind not in NORMALIZERS:
+        raise ValueError(f"unknown indicator kind {kind!r} (expected one of {', '.join(KINDS)})")
+    value = NORMALIZERS[kind](value)
+    return f"{kind}:{value}" if value else ''
+
+
+def indicator_hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def bloom_positions(value: int, bits: int, probes: int):
+    # Double hashing from the two halves of the (already uniform) hash
+    low, high = value & 0xFFFFFFFF, (value >> 32) | 1
+    for i in range(probes):
+        yield (low + i * high) % bits
+
+
+# ═══════════════════════════════════════════
+# BUILD
+# ═══════════════════════════════════════════
+def read_entries(path: str, kind: str = None):
+    """
+    Yields (kind, value) from a report file: "kind<TAB>value" (or comma)
+    lines, or bare values when kind is given; '#' starts a comment
+    """
+    with open(path, encoding='utf-8') as f:
+        for number, line in enumerate(f, 1):
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+            if kind:
+                yield kind, line
+                continue
+            parts = line.replace(',', '\t', 1).split('\t', 1)
+            if len(parts) != 2 or parts[0].strip().lower() not in NORMALIZERS:
+                log.warning("Skipping malformed indicator at %s:%d", path, number)
+                continue
+            yield parts[0].strip().lower(), parts[1].strip()
+
+
+def build_store(hashes) -> bytes:
+    """
+    Serializes a set of indicator hashes into the on-disk format
+    """
+    values = array('Q', sorted(set(hashes)))
+    count = len(values)
+    bloom_bytes = max(8, math.ceil(count * BLOOM_BITS_PER_ENTRY / 64) * 8)
+    bits = bloom_bytes * 8
+    bloom = bytearray(bloom_bytes)
+    for value in values:
+        for pos in bloom_positions(value, bits, BLOOM_PROBES):
+            bloom[pos >> 3] |= 1 << (pos & 7)
+
+    if sys.byteorder != 'little':
+        values.byteswap()
+    body = bytes(bloom) + values.tobytes()
+    digest = hashlib.blake2b(body, digest_size=16).digest()
+    return HEADER.pack(MAGIC, FORMAT_VERSION, count, bloom_bytes, BLOOM_PROBES, digest) + body
+
+
+def write_store(path: str, hashes) -> str:
+    """
+    (Re)writes the store atomically: write a temp file, then rename
+    Returns: the store path
+    """
+    data = build_store(hashes)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return path
+
+
+def hash_entries(entries) -> set:
+    hashes = set()
+    for kind, value in entries:
+        key = indicator_key(kind, value)
+        if key:
+            hashes.add(indicator_hash(key))
+    return hashes
+
+
+class _Table:
+    """
+    One immutable, loaded store file; IndicatorStore swaps whole instances
+    """
+    __slots__ = ('buffer', 'bloom', 'bits', 'probes', 'values', 'count', 'version')
+
+    def __init__(self, buffer):
+        magic, fmt, count, bloom_bytes, probes, digest = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or fmt != FORMAT_VERSION or len(buffer) != HEADER.size + bloom_bytes + count * 8:
+            raise ValueError("not an indicator store")
+        self.buffer = buffer
+        view = memoryview(buffer)
+        self.bloom = view[HEADER.size:HEADER.size + bloom_bytes]
+        self.bits = bloom_bytes * 8
+        self.probes = probes
+        values = view[HEADER.size + bloom_bytes:]
+        if sys.byteorder == 'little':
+            self.values = values.cast('Q')    # bisect straight on the mapped pages
+        else:
+            self.values = array('Q', values)
+            self.values.byteswap()
+        self.count = count
+        self.version = digest.hex()
+
+    def __contains__(self, value: int) -> bool:
+        bloom = self.bloom
+        for pos in bloom_positions(value, self.bits, self.probes):
+            if not bloom[pos >> 3] & (1 << (pos & 7)):
+                return False
+        values = self.values
+        i = bisect_left(values, value)
+        return i < self.count and values[i] == value
+
+    def __iter__(self):
+        return iter(self.values)
+
+
+EMPTY = build_store(())
+
+
+# ═══════════════════════════════════════════
+# STORE
+# ═══════════════════════════════════════════
+class IndicatorStore:
+    """
+    Read-mostly indicator set: compiled table + appended reports
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.log_path = path + '.log'
+        self._table = _Table(EMPTY)
+        self._appended = frozenset()
+        self._stamp = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+        self.reload()
+
+    def __len__(self):
+        return self._table.count + len(self._appended)
+
+    @property
+    def version(self) -> str:
+        return f"{self._table.version[:16]}+{len(self._appended)}"
+
+    def contains(self, kind: str, value: str) -> bool:
+        self.maybe_reload()
+        key = indicator_key(kind, value)
+        if not key:
+            return False
+        value = indicator_hash(key)
+        return value in self._appended or value in self._table
+
+    def match_domain(self, host: str):
+        """
+        Returns: the reported domain covering host (most specific), or None
+        """
+        self.maybe_reload()
+        host = normalize_domain(host or '')
+        table, appended = self._table, self._appended
+        start = 0
+        while True:
+            dot = host.find('.', start)
+            if dot < 0:
+                return None   # never match a bare TLD
+            suffix = host[start:]
+            value = indicator_hash('domain:' + suffix)
+            if value in appended or value in table:
+                return suffix
+            start = dot + 1
+
+    def append(self, entries) -> int:
+        """
+        Records new reports in the log; visible to this process at once and
+        to others on their next reload check
+        Returns: number of entries written
+        """
+        lines = []
+        hashes = set()
+        for kind, value in entries:
+            key = indicator_key(kind, value)
+            if key:
+                lines.append(f"{kind}\t{key.split(':', 1)[1]}\n")
+                hashes.add(indicator_hash(key))
+        if not lines:
+            return 0
+        with self._lock:
+            with open(self.log_path, 'a', encoding='utf-8') as f:
+                f.write(''.join(lines))
+            self._appended = self._appended | hashes
+        return len(lines)
+
+    def compact(self) -> str:
+        """
+        Merges the append log into a new store file and clears the log
+        """
+        with self._lock:
+            hashes = set(self._table)
+            hashes.update(hash_entries(self._read_log()))
+            write_store(self.path, hashes)
+            try:
+                os.remove(self.log_path)
+            except FileNotFoundError:
+                pass
+        self.reload()
+        return self.path
+
+    def reload(self):
+        """
+        Maps the store file and re-reads the append log
+        Readers keep using the old table until the new one is swapped in
+        """
+        with self._lock:
+            self._stamp = self._file_stamp()
+            self._table = self._load()
+            self._appended = frozenset(hash_entries(self._read_log()))
+            self._checked = time.monotonic()
+        log.info("Loaded %d indicators (%d appended) from %s", len(self), len(self._appended), self.path)
+
+    def maybe_reload(self):
+        """
+        Re-reads the store if either file changed (checked every RELOAD_CHECK s)
+        """
+        now = time.monotonic()
+        if now - self._checked < RELOAD_CHECK:
+            return
+        self._checked = now
+        if self._file_stamp() != self._stamp:
+            self.reload()
+
+    def _file_stamp(self) -> tuple:
+        stamp = []
+        for path in (self.path, self.log_path):
+            try:
+                stat = os.stat(path)
+                stamp.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    def _load(self) -> _Table:
+        try:
+            with open(self.path, 'rb') as f:
+                return _Table(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        except FileNotFoundError:
+            return _Table(EMPTY)
+        except (OSError, ValueError) as e:
+            log.warning("Indicator store %s unreadable (%s); using an empty store", self.path, e)
+            return _Table(EMPTY)
+
+    def _read_log(self) -> list:
+        try:
+            return list(read_entries(self.log_path))
+        except FileNotFoundError:
+            return []
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> IndicatorStore:
+    """
+    Shared store for STORE_FILE (loaded on first use)
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = IndicatorStore(STORE_FILE)
+        return _store
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--store', default=STORE_FILE)
+    sub = parser.add_subparsers(dest='command', required=True)
+    build = sub.add_parser('build', help="compile report files into a new store (replaces it)")
+    build.add_argument('--kind', choices=KINDS, help="files hold bare values of this kind")
+    build.add_argument('files', nargs='+')
+    append = sub.add_parser('append', help="add reports without rebuilding")
+    append.add_argument('pairs', nargs='+', metavar='KIND VALUE')
+    sub.add_parser('compact', help="fold the append log into the store")
+    check = sub.add_parser('check', help="look indicators up")
+    check.add_argument('pairs', nargs='+', metavar='KIND VALUE')
+    args = parser.parse_args()
+
+    def pairs(items):
+        if len(items) % 2:
+            parser.error("expected KIND VALUE pairs")
+        return list(zip(items[::2], items[1::2]))
+
+    if args.command == 'build':
+        started = time.perf_counter()
+        hashes = set()
+        for path in args.files:
+            hashes.update(hash_entries(read_entries(path, args.kind)))
+        write_store(args.store, hashes)
+        print(f"{args.store}: {len(hashes):,} indicators in {time.perf_counter() - started:.2f}s")
+    elif args.command == 'append':
+        print(f"appended {IndicatorStore(args.store).append(pairs(args.pairs))} indicators")
+    elif args.command == 'compact':
+        store = IndicatorStore(args.store)
+        print(f"{store.compact()}: {len(store):,} indicators")
+    else:
+        store = IndicatorStore(args.store)
+        for kind, value in pairs(args.pairs):
+            if kind == 'domain':
+                hit = store.match_domain(value)
+            else:
+                hit = indicator_key(kind, value) if store.contains(kind, value) else None
+            print(f"{kind} {value}: {hit or '-'}")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,106 @@
+import json
+import os
+
+import http_client
+import metrics
+
+
+# ═══════════════════════════════════════════
+# OPENROUTER SETTINGS (same model/prompt as the Langflow flow)
+# ═══════════════════════════════════════════
+API_URL = os.environ.get('SCAMSHIELD_LLM_URL', 'https://openrouter.ai/api/v1/chat/completions')
+API_KEY = os.environ.get('OPENROUTER_API_KEY', '')
+MODEL = os.environ.get('SCAMSHIELD_LLM_MODEL', 'openai/gpt-oss-safeguard-20b')
+TEMPERATURE = float(os.environ.get('SCAMSHIELD_LLM_TEMPERATURE', 0.7))
+TIMEOUT = float(os.environ.get('SCAMSHIELD_LLM_TIMEOUT', 60))
+
+SYSTEM_PROMPT = (
+    "You are ScamShield AI, India's #1 job scam detection expert.  Analyze "
+    "this job posting using Indian market context:  **Provide JSON output "
+    "ONLY:** {   \"llm_score\": <0-100>,   \"top_reasons\": [     \"reason 1\",     "
+    "\"reason 2\",     \"reason 3\",     \"reason 4\"   ],   \"explain_brief\": \"1-2 "
+    "sentence explanation\",   \"scam_type\": "
+    "\"<work-from-home|investment|identity-theft|fake-company|pyramid|unclear>\" "
+    "}  **Scoring Guide:** - 0-25: Legitimate (LinkedIn verified, proper "
+    "company, realistic salary) - 26-60: Suspicious (vague details, generic "
+    "email, mild red flags) - 61-100: High-risk scam (upfront fees, "
+    "WhatsApp-only, unrealistic promises)  **India-Specific Red Flags:** - "
+    "Telegram/WhatsApp recruitment - Registration/processing fees - "
+    "Unrealistic salaries (>₹5,000/day or >₹50L/year for entry-level) - \"Ghar "
+    "baithe kamao\" language - No company registration details - Payment in "
+    "gift cards/crypto  **Be concise. Focus on concrete red flags.**"
+)
+
+
+def request(text: str, stream: bool = False) -> tuple:
+    """
+    Returns: (headers, payload) for one posting
+    """
+    headers = {'Content-Type': 'application/json'}
+    if API_KEY:
+        headers['Authorization'] = f"Bearer {API_KEY}"
+    
+    payload = {
+        'model': MODEL,
+        'temperature': TEMPERATURE,
+        'messages': [
+            {'role': 'system', 'content': SYSTEM_PROMPT},
+            {'role': 'user', 'content': text}
+        ]
+    }
+    if stream:
+        payload['stream'] = True
+    return headers, payload
+
+
+def complete(text: str) -> str:
+    """
+    Sends one posting to the model
+    Returns: the raw reply text (the LLM Parser turns it into JSON)
+    """
+    headers, payload = request(text)
+    
+    with metrics.timer('llm'):
+        response = http_client.post(API_URL, json=payload, headers=headers, timeout=TIMEOUT)
+        response.raise_for_status()
+        return response.json()['choices'][0]['message']['content'] or ''
+
+
+def stream(text: str):
+    """
+    Same request with server-sent events: yields the reply text as it is
+    generated. Closing the generator early drops the connection, which
+    makes the provider stop generating (and billing) the rest.
+    A server that answers with plain JSON instead is handled too.
+    Yields: reply text chunks
+    """
+    headers, payload = request(text, stream=True)
+    headers['Accept'] = 'text/event-stream'
+    
+    with metrics.timer('llm'):
+        response = http_client.post(API_URL, json=payload, headers=headers, timeout=TIMEOUT, stream=True)
+        with response:
+            response.raise_for_status()
+            if 'text/event-stream' not in response.headers.get('Content-Type', ''):
+                yield response.json()['choices'][0]['message']['content'] or ''
+                return
+            
+            try:
+                for line in response.iter_lines():
+                    # 'data: {...}' events; ':' comment lines are keep-alives
+                    if not line.startswith(b'data:'):
+                        continue
+                    data = line[5:].strip()
+                    if data == b'[DONE]':
+                        break
+                    event = json.loads(data)
+                    if 'error' in event:
+                        raise RuntimeError(f"LLM stream error: {event['error']}")
+                    choices = event.get('choices') or [{}]
+                    content = (choices[0].get('delta') or {}).get('content')
+                    if content:
+                        yield content
+            except GeneratorExit:
+                # The parser has what it needs; the rest is never generated
+                metrics.inc('llm_streams_stopped_total')
+                raise
@@ -0,0 +1,264 @@
+try:
+    from langflow.custom import Component
+    from langflow.io import MessageTextInput, Output
+    from langflow.schema.message import Message
+except ImportError:  # headless use without Langflow (see pipeline.py)
+    from headless import Component, MessageTextInput, Output, Message
+import json
+import re
+
+
+# ═══════════════════════════════════════════
+# INCREMENTAL JSON SCAN
+# The model reply is fed in as it streams. One pass finds the first JSON
+# object (fences and chatter around it are just skipped) and decodes each
+# top-level member once, as soon as its value ends, so the work is
+# linear in the reply and we know the moment the fields we need are in.
+# This file is also the LLM Parser component's code in ScamShield.json,
+# so it only depends on the standard library.
+# ═══════════════════════════════════════════
+
+# Everything the Score Combiner and Result Formatter read
+STOP_FIELDS = ('llm_score', 'top_reasons', 'explain_brief')
+
+# Names models use for the score besides the one the prompt asks for
+SCORE_ALIASES = ('llm_score', 'llm_risk', 'risk_score', 'score')
+MAX_REASONS = 4
+
+STRING_SPECIAL = re.compile(r'[\\"]')
+STRUCTURAL = re.compile(r'[{}\[\]",:]')
+
+
+class StreamingJSONParser:
+    """
+    feed() reply text in any chunking; `fields` fills up member by member
+    `done` turns true when every stop field is complete (or the object
+    closed), which is when generation can be cut off
+    """
+
+    def __init__(self, stop_fields=STOP_FIELDS):
+        self.stop_fields = tuple(stop_fields)
+        self.fields = {}
+        self.closed = False
+        self.bad_members = 0
+
+        # Text of the top-level member being read, from just after its '{'
+        # or ',': earlier chunks' parts plus the current chunk from _seg.
+        # _key_start / _value_start are offsets into it.
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._reset_member()
+
+    @property
+    def done(self) -> bool:
+        if self.closed:
+            return True
+        return bool(self.stop_fields) and all(field in self.fields for field in self.stop_fields)
+
+    def feed(self, chunk: str) -> bool:
+        """
+        Scans the new chunk only, jumping between the characters that
+        matter; text before the current member is dropped, so the work
+        stays linear however the reply is chunked
+        Returns: done
+        """
+        text = chunk
+        self._seg = 0
+        i = 0
+        end = len(text)
+        while i < end and not self.done:
+            if self._escape:
+                self._escape = False
+                i += 1
+                continue
+
+            if self._in_string:
+                match = STRING_SPECIAL.search(text, i)
+                if match is None:
+                    i = end
+                    break
+                i = match.start()
+                if text[i] == '\\':
+                    self._escape = True
+                else:
+                    self._in_string = False
+                    if self._depth == 1 and self._key_start is not None and self._key is None:
+                        self._key = self._decode(self._member(text, i + 1)[self._key_start:])
+                i += 1
+                continue
+
+            if self._depth == 0:
+                i = text.find('{', i)
+                if i < 0:
+                    i = end
+                    break
+                self._depth = 1
+                self._reset_member(i + 1)
+                i += 1
+                continue
+
+            match = STRUCTURAL.search(text, i)
+            if match is None:
+                i = end
+                break
+            i = match.start()
+            c = text[i]
+            if c == '"':
+                self._in_string = True
+                if self._depth == 1 and self._key_start is None:
+                    self._key_start = self._offset(i)
+            elif c == '{' or c == '[':
+                self._depth += 1
+            elif c == '}' or c == ']':
+                if self._depth == 1:
+                    self._end_member(self._member(text, i))
+                    self._reset_member(i + 1)
+                    # A brace pair in prose isn't our object; keep looking
+                    self.closed = bool(self.fields)
+                self._depth -= 1
+            elif c == ',':
+                if self._depth == 1:
+                    self._end_member(self._member(text, i))
+                    self._reset_member(i + 1)
+            elif self._depth == 1 and self._key is not None and self._value_start is None:
+                self._value_start = self._offset(i + 1)   # ':'
+            i += 1
+        if self._depth >= 1 and self._seg < i:
+            self._parts.append(text[self._seg:i])
+            self._parts_len += i - self._seg
+        return self.done
+
+    def result(self) -> dict:
+        """
+        A reply cut off mid-object still counts up to its last complete value
+        Returns: the normalized record; ValueError if there is no score
+        """
+        if not self.done and self._depth == 1 and not self._in_string:
+            self._end_member(''.join(self._parts))
+            self._reset_member()
+        return normalize_record(self.fields)
+
+    def _offset(self, i: int) -> int:
+        # Position i of the current chunk as an offset into the member
+        return self._parts_len + i - self._seg
+
+    def _member(self, text: str, i: int) -> str:
+        # The member's text up to position i of the current chunk
+        return ''.join(self._parts) + text[self._seg:i]
+
+    def _reset_member(self, start: int = 0):
+        self._parts = []
+        self._parts_len = 0
+        self._seg = start
+        self._key_start = None
+        self._key = None
+        self._value_start = None
+
+    def _end_member(self, member: str):
+        if self._key is not None and self._value_start is not None:
+            raw = member[self._value_start:].strip()
+            try:
+                self.fields[self._key] = json.loads(raw)
+            except ValueError:
+                self.bad_members += 1
+
+    def _decode(self, quoted: str):
+        try:
+            return json.loads(quoted)
+        except ValueError:
+            return None
+
+
+def normalize_record(fields: dict) -> dict:
+    """
+    The one record shape the combiner reads, whatever the model sent:
+    score as an int in 0-100 (also taken from llm_risk & co.), reasons as
+    a short list of strings
+    Returns: {'llm_score', 'top_reasons', 'explain_brief', 'scam_type'}
+    """
+    score = next((fields[name] for name in SCORE_ALIASES if fields.get(name) is not None), None)
+    if score is None:
+        raise ValueError("no risk score in the model reply")
+    score = max(0, min(100, round(float(score))))
+
+    reasons = fields.get('top_reasons') or []
+    if isinstance(reasons, str):
+        reasons = [reasons]
+    reasons = [str(reason).strip() for reason in reasons if str(reason).strip()][:MAX_REASONS]
+
+    return {
+        'llm_score': score,
+        'top_reasons': reasons,
+        'explain_brief': str(fields.get('explain_brief') or '').strip(),
+        'scam_type': str(fields.get('scam_type') or 'unclear')
+    }
+
+
+def error_record(error: Exception) -> dict:
+    """
+    Neutral stand-in when nothing usable came back
+    """
+    return {
+        'llm_score': 50,
+        'top_reasons': [f"Parse error: {str(error)[:100]}"],
+        'explain_brief': "Analysis incomplete due to parsing error.",
+        'scam_type': 'unclear',
+        'parse_error': True
+    }
+
+
+def parse_llm_text(llm_text: str) -> dict:
+    """
+    Pulls the JSON verdict out of the raw model reply
+    Returns: normalized record (error_record if there is none)
+    """
+    parser = StreamingJSONParser(stop_fields=())   # whole reply is here: read the whole object
+    parser.feed(llm_text)
+    try:
+        return parser.result()
+    except Exception as e:
+        return error_record(e)
+
+
+def parse_llm_stream(chunks) -> dict:
+    """
+    Consumes reply text chunks (see llm_client.stream) until the stop
+    fields are complete, then closes the stream so generation stops
+    Returns: normalized record (error_record if there is none)
+    """
+    parser = StreamingJSONParser()
+    try:
+        for chunk in chunks:
+            if parser.feed(chunk):
+                break
+    finally:
+        close = getattr(chunks, 'close', None)
+        if close:
+            close()
+    try:
+        return parser.result()
+    except Exception as e:
+        return error_record(e)
+
+
+class LLMParser(Component):
+    display_name = "LLM Parser"
+    description = "Parse LLM JSON response"
+
+    inputs = [
+        MessageTextInput(
+            name="llm_output",
+            display_name="LLM Output"
+        )
+    ]
+
+    outputs = [
+        Output(display_name="Parsed Data", name="output", method="parse_llm")
+    ]
+
+    def parse_llm(self) -> Message:
+        llm_data = parse_llm_text(str(self.llm_output))
+
+        # Return as Message with JSON string
+        return Message(text=json.dumps(llm_data))
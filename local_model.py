@@ -0,0 +1,417 @@
+"""
+Local statistical scorer: hashed n-gram features + logistic regression
+
+A CPU-only contextual signal next to the remote LLM: word unigrams and
+bigrams plus character 3/4-grams (digits masked, so swapped phone numbers
+and amounts look alike) are hashed into 2^18 buckets and scored with a
+logistic regression trained offline on labeled postings. Inference is a
+few NumPy gathers, well under a millisecond per posting; score_many()
+scores a whole batch in one vectorized pass.
+
+The model adds a fourth input to the Score Combiner, and when it is
+confident (probability >= SCAMSHIELD_LOCAL_CONFIDENCE or <= 1 - that)
+the pipeline skips the LLM call. Without a trained weights file
+(SCAMSHIELD_LOCAL_MODEL, default data/local_model.npz) nothing changes.
+
+Usage:
+    python local_model.py train labeled.jsonl [more.jsonl ...]    # {"text": ..., "label": "scam"|"legit"}
+    python local_model.py evaluate held_out.jsonl
+    python local_model.py score "Pay ₹999 registration fee on WhatsApp"
+"""
+try:
+    from langflow.custom import Component
+    from langflow.io import MessageTextInput, Output
+    from langflow.schema.message import Message
+except ImportError:  # headless use without Langflow (see pipeline.py)
+    from headless import Component, MessageTextInput, Output, Message
+import argparse
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+import metrics
+import startup
+from metrics import log
+
+# The local model is optional; the pipeline runs without NumPy, and with
+# it installed NumPy is only imported once there is a model to load
+np = startup.lazy_import('numpy') if startup.available('numpy') else None
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+MODEL_FILE = os.environ.get('SCAMSHIELD_LOCAL_MODEL', os.path.join(DATA_DIR, 'local_model.npz'))
+
+# Skip the LLM when the model is at least this sure either way
+CONFIDENCE = float(os.environ.get('SCAMSHIELD_LOCAL_CONFIDENCE', 0.97))
+SKIP_LLM = os.environ.get('SCAMSHIELD_LOCAL_SKIP_LLM', '1') == '1'
+
+DIM_BITS = 18
+CHAR_NGRAMS = (3, 4)
+MAX_CHARS = 4000        # features from the first 4000 chars are plenty
+FORMAT_VERSION = 1
+
+# Separate seeds per feature family so they don't share buckets on purpose
+_WORD_SEED = 0x9E3779B9
+_BIGRAM_SEED = 0x85EBCA6B
+_CHAR_SEED = 0xC2B2AE35
+
+# Polynomial hash mod 2^32; the multiplier is odd, so it has an inverse
+# and every prefix hash comes out of one cumsum (see feature_ids)
+_MULTIPLIER = 0x01000193
+_MAX_BYTES = MAX_CHARS * 4 + 1
+
+
+def _powers(base: int, count: int):
+    # [1, base, base^2, ...] mod 2^32
+    return np.cumprod(np.concatenate(([1], np.full(count - 1, base))).astype(np.uint32), dtype=np.uint32)
+
+
+@functools.lru_cache(maxsize=None)
+def _hash_tables() -> tuple:
+    # Built on first use so importing this module doesn't need NumPy
+    return (_powers(_MULTIPLIER, _MAX_BYTES + 1), _powers(pow(_MULTIPLIER, -1, 1 << 32), _MAX_BYTES + 1))
+
+
+# ═══════════════════════════════════════════
+# FEATURES
+# Everything runs on the UTF-8 bytes as NumPy arrays: one prefix-hash
+# pass gives the hash of any byte range, so words, word pairs and char
+# n-grams are all a few vectorized ops instead of a Python loop per token.
+# ═══════════════════════════════════════════
+def _mix(h, dim_bits: int):
+    # Murmur3 finalizer on uint32 arrays, then the top bits pick the bucket
+    h = h ^ (h >> np.uint32(16))
+    h = h * np.uint32(0x85EBCA6B)
+    h = h ^ (h >> np.uint32(13))
+    h = h * np.uint32(0xC2B2AE35)
+    h = h ^ (h >> np.uint32(16))
+    return h >> np.uint32(32 - dim_bits)
+
+
+def feature_ids(text: str, dim_bits: int = DIM_BITS):
+    """
+    Hashed feature buckets present in text: words, word pairs and char
+    3/4-grams of the lowercased text, every digit read as '0'
+    Returns: sorted unique uint32 array
+    """
+    raw = np.frombuffer(text[:MAX_CHARS].lower().encode('utf-8'), dtype=np.uint8)
+    digit = (raw >= 48) & (raw <= 57)
+    is_word = digit | ((raw >= 97) & (raw <= 122)) | (raw >= 128)
+    data = np.where(digit, 48, raw).astype(np.uint32)
+    size = len(data)
+
+    # prefix[i] = sum(data[j] * M^(i-1-j) for j < i), all mod 2^32
+    powers, inverse_powers = _hash_tables()
+    prefix = np.zeros(size + 1, dtype=np.uint32)
+    prefix[1:] = powers[:size] * np.cumsum(data * inverse_powers[:size], dtype=np.uint32)
+
+    def span_hash(starts, ends):
+        return prefix[ends] - prefix[starts] * powers[ends - starts]
+
+    edges = np.diff(np.concatenate(([0], is_word.view(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    words = span_hash(starts, np.flatnonzero(edges == -1))
+    parts = [words ^ np.uint32(_WORD_SEED),
+             (words[:-1] * np.uint32(_MULTIPLIER) + words[1:]) ^ np.uint32(_BIGRAM_SEED)]
+
+    for n in CHAR_NGRAMS:
+        if size >= n:
+            starts = np.arange(size - n + 1)
+            parts.append(span_hash(starts, starts + n) ^ np.uint32(_CHAR_SEED + n))
+
+    # Sort + drop repeats (np.unique's hash path is slower on arrays this size)
+    ids = np.sort(_mix(np.concatenate(parts), dim_bits))
+    return ids[np.concatenate(([True], ids[1:] != ids[:-1]))] if len(ids) else ids
+
+
+def featurize(texts, dim_bits: int = DIM_BITS) -> tuple:
+    """
+    Sparse batch: row and column of every present feature, and its value
+    (1/sqrt(features in the row), so long postings don't score higher just
+    for being long)
+    Returns: (rows, cols, values) NumPy arrays
+    """
+    ids = [feature_ids(text, dim_bits) for text in texts]
+    lengths = np.array([len(row) for row in ids], dtype=np.int64)
+    rows = np.repeat(np.arange(len(ids)), lengths)
+    cols = np.concatenate(ids) if ids else np.zeros(0, dtype=np.uint32)
+    values = np.repeat(1.0 / np.sqrt(np.maximum(lengths, 1)), lengths).astype(np.float32)
+    return rows, cols, values
+
+
+def _sigmoid(z):
+    return 1.0 / (1.0 + np.exp(-np.clip(z, -30, 30)))
+
+
+# ═══════════════════════════════════════════
+# MODEL
+# ═══════════════════════════════════════════
+class LocalModel:
+    """
+    Logistic regression over hashed features; weights is a dense float32
+    vector of 2^dim_bits entries (1 MB), stored sparse on disk
+    """
+
+    def __init__(self, weights, bias: float, dim_bits: int = DIM_BITS):
+        self.weights = weights.astype(np.float32)
+        self.bias = float(bias)
+        self.dim_bits = dim_bits
+
+    def predict_proba(self, texts) -> 'np.ndarray':
+        """
+        Vectorized batch inference
+        Returns: P(scam) per text
+        """
+        rows, cols, values = featurize(texts, self.dim_bits)
+        z = np.bincount(rows, weights=self.weights[cols] * values, minlength=len(texts)) + self.bias
+        return _sigmoid(z)
+
+    def save(self, path: str):
+        """
+        Compact file: only the non-zero weights, as float16
+        """
+        index = np.flatnonzero(self.weights).astype(np.uint32)
+        tmp = f"{path}.tmp.npz"
+        np.savez_compressed(
+            tmp, version=np.int32(FORMAT_VERSION), dim_bits=np.int32(self.dim_bits),
+            bias=np.float32(self.bias), index=index, weight=self.weights[index].astype(np.float16)
+        )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'LocalModel':
+        with np.load(path, allow_pickle=False) as data:
+            if int(data['version']) != FORMAT_VERSION:
+                raise ValueError(f"{path}: unsupported local model version {int(data['version'])}")
+            dim_bits = int(data['dim_bits'])
+            weights = np.zeros(1 << dim_bits, dtype=np.float32)
+            weights[data['index']] = data['weight'].astype(np.float32)
+            return cls(weights, float(data['bias']), dim_bits)
+
+
+def train(texts: list, labels: list, dim_bits: int = DIM_BITS, epochs: int = 8, batch_size: int = 64,
+          learning_rate: float = 0.5, l2: float = 1e-6, seed: int = 0) -> LocalModel:
+    """
+    Mini-batch logistic regression with AdaGrad steps; only the buckets a
+    batch touches are updated, so an epoch costs O(total features)
+    Returns: LocalModel
+    """
+    dim = 1 << dim_bits
+    ids = [feature_ids(text, dim_bits) for text in texts]
+    scale = [1.0 / np.sqrt(max(len(row), 1)) for row in ids]
+    y = np.asarray(labels, dtype=np.float64)
+    weights = np.zeros(dim, dtype=np.float64)
+    squared = np.full(dim, 1e-8)
+    bias = 0.0
+    bias_squared = 1e-8
+    rng = np.random.default_rng(seed)
+
+    for _ in range(epochs):
+        order = rng.permutation(len(ids))
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            lengths = [len(ids[i]) for i in batch]
+            rows = np.repeat(np.arange(len(batch)), lengths)
+            cols = np.concatenate([ids[i] for i in batch])
+            values = np.repeat([scale[i] for i in batch], lengths)
+
+            p = _sigmoid(np.bincount(rows, weights=weights[cols] * values, minlength=len(batch)) + bias)
+            error = (p - y[batch]) / len(batch)
+
+            touched, inverse = np.unique(cols, return_inverse=True)
+            grad = np.bincount(inverse, weights=error[rows] * values, minlength=len(touched))
+            grad += l2 * weights[touched]
+            squared[touched] += grad * grad
+            weights[touched] -= learning_rate * grad / np.sqrt(squared[touched])
+
+            bias_grad = error.sum()
+            bias_squared += bias_grad * bias_grad
+            bias -= learning_rate * bias_grad / np.sqrt(bias_squared)
+
+    return LocalModel(weights, bias, dim_bits)
+
+
+# ═══════════════════════════════════════════
+# SHARED MODEL + PIPELINE HELPERS
+# ═══════════════════════════════════════════
+_model = None
+_model_loaded = False
+_model_lock = threading.Lock()
+
+
+def get_model():
+    """
+    Shared model from MODEL_FILE (loaded on first use)
+    Returns: LocalModel, or None without NumPy or a weights file
+    """
+    global _model, _model_loaded
+    with _model_lock:
+        if not _model_loaded:
+            _model_loaded = True
+            if np is None:
+                log.info("NumPy not installed; local model disabled")
+            elif os.path.exists(MODEL_FILE):
+                try:
+                    _model = LocalModel.load(MODEL_FILE)
+                except Exception as e:
+                    metrics.inc('errors_total', stage='local_model')
+                    log.warning("Could not load local model %s: %s", MODEL_FILE, e)
+        return _model
+
+
+def reload():
+    """
+    Drops the shared model so the next call reads MODEL_FILE again
+    """
+    global _model, _model_loaded
+    with _model_lock:
+        _model = None
+        _model_loaded = False
+
+
+def to_result(probability: float) -> dict:
+    return {
+        'local_score': int(round(probability * 100)),
+        'local_probability': round(float(probability), 4),
+        'confident': bool(probability >= CONFIDENCE or probability <= 1 - CONFIDENCE)
+    }
+
+
+def score_many(texts) -> list:
+    """
+    Scores a batch of processed texts in one vectorized pass
+    Returns: list of {'local_score', 'local_probability', 'confident'}
+    dicts in input order, or None per text without a model
+    """
+    texts = list(texts)
+    model = get_model()
+    if model is None:
+        return [None] * len(texts)
+    started = time.perf_counter()
+    probabilities = model.predict_proba(texts)
+    metrics.observe('local_model', time.perf_counter() - started)
+    return [to_result(p) for p in probabilities]
+
+
+def score(text: str):
+    """
+    Returns: the local model result for one text, or None without a model
+    """
+    return score_many([text])[0]
+
+
+def skips_llm(local) -> bool:
+    """
+    True when the local result is confident enough to skip the LLM call
+    """
+    return SKIP_LLM and local is not None and local['confident']
+
+
+class LocalModelScorer(Component):
+    display_name = "Local Model Scorer"
+    description = "CPU-only n-gram scam classifier (fourth input to the Score Combiner)"
+
+    inputs = [
+        MessageTextInput(
+            name="text_input",
+            display_name="Processed Text"
+        )
+    ]
+
+    outputs = [
+        Output(display_name="Local Result", name="output", method="score_text")
+    ]
+
+    def score_text(self) -> Message:
+        # Empty result when no model is trained: the combiner then ignores it
+        return Message(text=json.dumps(score(str(self.text_input)) or {}))
+
+
+# ═══════════════════════════════════════════
+# TRAINING CLI
+# ═══════════════════════════════════════════
+LABELS = {'scam': 1, 'fraud': 1, '1': 1, 'true': 1, 'legit': 0, 'safe': 0, 'legitimate': 0, '0': 0, 'false': 0}
+
+
+def read_labeled(paths: list, text_field: str, label_field: str) -> tuple:
+    """
+    Reads JSONL rows; labels may be scam/legit, 1/0 or true/false
+    Returns: (texts, labels)
+    """
+    texts, labels = [], []
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                row = json.loads(line)
+                label = LABELS.get(str(row[label_field]).strip().lower())
+                if label is None:
+                    raise ValueError(f"{path}:{number}: unknown label {row[label_field]!r}")
+                texts.append(str(row[text_field]))
+                labels.append(label)
+    return texts, labels
+
+
+def evaluate(model: LocalModel, texts: list, labels: list) -> dict:
+    probabilities = model.predict_proba(texts)
+    predicted = probabilities >= 0.5
+    actual = np.asarray(labels, dtype=bool)
+    confident = (probabilities >= CONFIDENCE) | (probabilities <= 1 - CONFIDENCE)
+    return {
+        'postings': len(texts),
+        'accuracy': round(float((predicted == actual).mean()), 4),
+        'precision': round(float(actual[predicted].mean()), 4) if predicted.any() else 0.0,
+        'recall': round(float(predicted[actual].mean()), 4) if actual.any() else 0.0,
+        'confident_share': round(float(confident.mean()), 4),
+        'confident_accuracy': round(float((predicted == actual)[confident].mean()), 4) if confident.any() else 0.0
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--model', default=MODEL_FILE)
+    sub = parser.add_subparsers(dest='command', required=True)
+    train_cmd = sub.add_parser('train', help="fit the model on labeled JSONL and write the weights file")
+    train_cmd.add_argument('files', nargs='+')
+    train_cmd.add_argument('--epochs', type=int, default=8)
+    train_cmd.add_argument('--holdout', type=float, default=0.1, help="share of rows kept back for the report")
+    evaluate_cmd = sub.add_parser('evaluate', help="accuracy of the weights file on labeled JSONL")
+    evaluate_cmd.add_argument('files', nargs='+')
+    for cmd in (train_cmd, evaluate_cmd):
+        cmd.add_argument('--text-field', default='text')
+        cmd.add_argument('--label-field', default='label')
+    score_cmd = sub.add_parser('score', help="score texts with the weights file")
+    score_cmd.add_argument('texts', nargs='+')
+    args = parser.parse_args()
+
+    if np is None:
+        parser.error("the local model needs NumPy (pip install numpy)")
+
+    if args.command == 'train':
+        texts, labels = read_labeled(args.files, args.text_field, args.label_field)
+        order = np.random.default_rng(0).permutation(len(texts))
+        held = set(order[:int(len(texts) * args.holdout)].tolist())
+        fit = [i for i in range(len(texts)) if i not in held]
+
+        started = time.perf_counter()
+        model = train([texts[i] for i in fit], [labels[i] for i in fit], epochs=args.epochs)
+        model.save(args.model)
+        print(f"{args.model}: {len(fit):,} postings in {time.perf_counter() - started:.1f}s, "
+              f"{np.count_nonzero(model.weights):,} weights, {os.path.getsize(args.model) / 1024:.0f} KB")
+        if held:
+            print(json.dumps(evaluate(model, [texts[i] for i in held], [labels[i] for i in held])))
+    elif args.command == 'evaluate':
+        texts, labels = read_labeled(args.files, args.text_field, args.label_field)
+        print(json.dumps(evaluate(LocalModel.load(args.model), texts, labels)))
+    else:
+        model = LocalModel.load(args.model)
+        for text, probability in zip(args.texts, model.predict_proba(args.texts)):
+            print(f"{to_result(probability)}  {text[:60]}")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,248 @@
+import atexit
+import contextvars
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+
+
+# ═══════════════════════════════════════════
+# LOGGING
+# Off unless SCAMSHIELD_LOG_LEVEL is set (DEBUG, INFO, ...). Records go
+# through a queue to a background thread, so a request never blocks on
+# a terminal or pipe. Use %-style args: disabled calls never format.
+# ═══════════════════════════════════════════
+LOG_LEVEL = os.environ.get('SCAMSHIELD_LOG_LEVEL', '').upper()
+
+log = logging.getLogger('scamshield')
+_listener = None
+
+
+def setup_logging(level: str = None, stream=None):
+    """
+    Sends scamshield log records to stderr (or stream) off the request path
+    """
+    global _listener
+    _stop_listener()
+    log.handlers.clear()
+
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s %(threadName)s: %(message)s'))
+    records = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(records, handler)
+    _listener.start()
+
+    log.addHandler(logging.handlers.QueueHandler(records))
+    log.setLevel(level or LOG_LEVEL or 'INFO')
+    log.propagate = False
+
+
+def _stop_listener():
+    # Flushes queued records (called at exit too)
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(_stop_listener)
+
+if LOG_LEVEL:
+    setup_logging(LOG_LEVEL)
+else:
+    log.addHandler(logging.NullHandler())
+    log.setLevel(logging.WARNING)
+
+
+# ═══════════════════════════════════════════
+# METRICS
+# Stage latency histograms plus labelled counters, rendered in the
+# Prometheus text format. SCAMSHIELD_METRICS=0 turns recording off;
+# SCAMSHIELD_METRICS_FILE is written at exit (node_exporter textfile).
+# ═══════════════════════════════════════════
+ENABLED = os.environ.get('SCAMSHIELD_METRICS', '1') != '0'
+METRICS_FILE = os.environ.get('SCAMSHIELD_METRICS_FILE')
+
+# Seconds; spans a regex pass through a slow page fetch or LLM call
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+           0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+COUNTER_HELP = {
+    'cache_requests_total': "Cache lookups by cache and result (hit/miss)",
+    'timeouts_total': "Operations that ran out of time, by stage",
+    'errors_total': "Operations that failed, by stage",
+    'fetches_total': "Pages downloaded (each URL once per analysis, see fetch_context.py)",
+    'llm_streams_stopped_total': "LLM replies cut off once the verdict fields were complete",
+    'llm_skipped_total': "LLM calls not made, by reason (cascade, local_model, near_duplicate)",
+    'prompt_tokens_total': "Estimated LLM prompt tokens: kind=original before compaction, kind=sent after",
+    'host_rejections_total': "Page downloads refused by the host scheduler, by reason (open, busy, rate)",
+    'breaker_transitions_total': "Per-host circuit breaker state changes, by new state",
+}
+
+_lock = threading.Lock()
+_histograms = {}    # stage -> [bucket counts..., +Inf count, sum]
+_counters = {}      # (name, ((label, value), ...)) -> count
+
+# Per-request stage timings for the combiner's optional `timings` block
+_timings = contextvars.ContextVar('scamshield_timings', default=None)
+
+
+def observe(stage: str, seconds: float):
+    """
+    Records one stage duration (and into the active timings dict, if any)
+    """
+    timings = _timings.get()
+    if timings is not None:
+        with _lock:   # branch threads share the dict
+            timings[stage] = timings.get(stage, 0.0) + seconds
+    if not ENABLED:
+        return
+
+    with _lock:
+        hist = _histograms.get(stage)
+        if hist is None:
+            hist = _histograms[stage] = [0] * (len(BUCKETS) + 1) + [0.0]
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                hist[i] += 1
+                break
+        else:
+            hist[len(BUCKETS)] += 1
+        hist[-1] += seconds
+
+
+def inc(name: str, amount: int = 1, **labels):
+    if not ENABLED:
+        return
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+
+class timer:
+    """
+    with metrics.timer('heuristic'): ...   records the block's duration
+    """
+    __slots__ = ('stage', 'started')
+
+    def __init__(self, stage: str):
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.stage, time.perf_counter() - self.started)
+        return False
+
+
+class collect_timings:
+    """
+    with metrics.collect_timings() as timings: ...
+    Every stage timed in this context (and in threads started with a copy
+    of it, see pipeline.py) adds its seconds to `timings`
+    """
+    __slots__ = ('timings', 'token')
+
+    def __enter__(self) -> dict:
+        self.timings = {}
+        self.token = _timings.set(self.timings)
+        return self.timings
+
+    def __exit__(self, *exc):
+        _timings.reset(self.token)
+        return False
+
+
+def current_timings():
+    """
+    Returns: the timings dict of the enclosing collect_timings(), or None
+    """
+    return _timings.get()
+
+
+def timings_ms(timings: dict) -> dict:
+    return {stage: round(seconds * 1000, 2) for stage, seconds in timings.items()}
+
+
+# ═══════════════════════════════════════════
+# EXPORT
+# ═══════════════════════════════════════════
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(pairs) -> str:
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in pairs) + '}'
+
+
+def render_prometheus() -> str:
+    """
+    Returns: all metrics in the Prometheus text exposition format
+    """
+    with _lock:
+        histograms = {stage: list(hist) for stage, hist in _histograms.items()}
+        counters = dict(_counters)
+
+    lines = []
+    if histograms:
+        lines.append("# HELP scamshield_stage_seconds Time spent per pipeline stage")
+        lines.append("# TYPE scamshield_stage_seconds histogram")
+        for stage in sorted(histograms):
+            hist = histograms[stage]
+            cumulative = 0
+            for bound, count in zip(BUCKETS + ('+Inf',), hist):
+                cumulative += count
+                lines.append(f"scamshield_stage_seconds_bucket{_labels([('stage', stage), ('le', bound)])} {cumulative}")
+            lines.append(f"scamshield_stage_seconds_sum{_labels([('stage', stage)])} {hist[-1]:.6f}")
+            lines.append(f"scamshield_stage_seconds_count{_labels([('stage', stage)])} {cumulative}")
+
+    for name in sorted({name for name, _ in counters}):
+        lines.append(f"# HELP scamshield_{name} {COUNTER_HELP.get(name, name)}")
+        lines.append(f"# TYPE scamshield_{name} counter")
+        for (counter, labels), value in sorted(counters.items()):
+            if counter == name:
+                lines.append(f"scamshield_{name}{_labels(labels)} {value}")
+
+    return '\n'.join(lines) + '\n' if lines else ''
+
+
+def write_textfile(path: str = None):
+    """
+    Writes render_prometheus() to path atomically (tmp file + rename)
+    """
+    path = path or METRICS_FILE
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(render_prometheus())
+    os.replace(tmp, path)
+
+
+def summary() -> dict:
+    """
+    Per stage: count and mean ms; plus every counter. Handy for --json dumps
+    """
+    with _lock:
+        stages = {
+            stage: {'count': sum(hist[:-1]),
+                    'mean_ms': round(hist[-1] / sum(hist[:-1]) * 1000, 3) if sum(hist[:-1]) else 0.0}
+            for stage, hist in _histograms.items()
+        }
+        counters = {name + _labels(labels): value for (name, labels), value in _counters.items()}
+    return {'stages': stages, 'counters': counters}
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+
+
+if METRICS_FILE:
+    atexit.register(write_textfile)
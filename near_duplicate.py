@@ -0,0 +1,248 @@
+"""
+Near-duplicate scam templates: MinHash signatures + an LSH band index
+
+Scammers reuse one template and only swap the phone number, salary or
+company name, so the exact-text result cache (result_cache.py) misses the
+copies. Every posting the LLM called a SCAM is indexed here by a MinHash
+signature of its word shingles (digits masked); a new posting whose
+estimated similarity to a stored one reaches the threshold reuses that
+LLM assessment instead of making a new call. Heuristic and domain checks
+still run on the new text.
+
+Memory is bounded: at most SCAMSHIELD_NEAR_DUP_SIZE entries (~2 KB
+each), least recently matched evicted first, each expiring after
+SCAMSHIELD_NEAR_DUP_TTL seconds. SCAMSHIELD_NEAR_DUP=0 turns reuse off.
+"""
+import hashlib
+import operator
+import os
+import re
+import threading
+import time
+from array import array
+from collections import OrderedDict
+
+import metrics
+from result_cache import text_key
+
+
+ENABLED = os.environ.get('SCAMSHIELD_NEAR_DUP', '1') == '1'
+THRESHOLD = float(os.environ.get('SCAMSHIELD_NEAR_DUP_THRESHOLD', 0.7))
+MAX_ENTRIES = int(os.environ.get('SCAMSHIELD_NEAR_DUP_SIZE', 20000))
+TTL = float(os.environ.get('SCAMSHIELD_NEAR_DUP_TTL', 7 * 24 * 3600))
+
+# 16 bands x 4 rows: a pair at similarity 0.7 shares a band with
+# probability 0.99, one at 0.3 with 0.12 (and is then rejected on the
+# full signature). Swapping a company name and a number in a short
+# posting already drops it to ~0.7.
+NUM_PERM = 64           # signature slots (one-permutation hashing: 64 bins)
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_WORDS = 3
+MIN_WORDS = 8           # shorter texts are too generic to match on
+
+# The LLM fields a reused entry carries
+RECORD_FIELDS = ('llm_score', 'top_reasons', 'explain_brief', 'scam_type')
+
+WORD_RE = re.compile(r'[^\W_]+')
+_BIN_SHIFT = 64 - (NUM_PERM - 1).bit_length()    # top bits of the hash pick the bin
+_VALUE_BITS = 26                                  # value kept per bin; room for the borrow offset
+_VALUE_MASK = (1 << _VALUE_BITS) - 1
+_EMPTY = 1 << 32
+
+
+# ═══════════════════════════════════════════
+# SIGNATURES
+# ═══════════════════════════════════════════
+def shingles(text: str) -> set:
+    """
+    Hashed word 3-grams of the lowercased text; every digit run reads as
+    '#', so swapped phone numbers and amounts don't change the set
+    Returns: set of 64-bit ints (empty below MIN_WORDS words)
+    """
+    words = ['#' if word.isdigit() else word for word in WORD_RE.findall(text.lower())]
+    if len(words) < MIN_WORDS:
+        return set()
+    joined = {' '.join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+    return {
+        int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'little')
+        for shingle in joined
+    }
+
+
+def signature(text: str):
+    """
+    MinHash signature by one-permutation hashing: each shingle hash goes to
+    one of NUM_PERM bins and every bin keeps its smallest value, so the
+    cost is one hash per shingle instead of NUM_PERM. An empty bin borrows
+    the next non-empty bin's value plus an offset per step (densification),
+    which keeps equal slots an unbiased estimate of the Jaccard similarity.
+    Returns: array('I') of NUM_PERM values, or None for too-short text
+    """
+    hashes = shingles(text)
+    if not hashes:
+        return None
+    bins = [_EMPTY] * NUM_PERM
+    for h in hashes:
+        slot = h >> _BIN_SHIFT
+        value = h & _VALUE_MASK
+        if value < bins[slot]:
+            bins[slot] = value
+
+    if _EMPTY in bins:
+        bins = [_borrow(bins, slot) for slot in range(NUM_PERM)]
+    return array('I', bins)
+
+
+def _borrow(bins: list, slot: int) -> int:
+    step = 0
+    while bins[(slot + step) % NUM_PERM] == _EMPTY:
+        step += 1
+    return bins[(slot + step) % NUM_PERM] + (step << _VALUE_BITS)
+
+
+def similarity(first, second) -> float:
+    """
+    Estimated Jaccard similarity of two signatures
+    """
+    return sum(map(operator.eq, first, second)) / NUM_PERM
+
+
+def band_keys(sig) -> list:
+    return [hash(sig[band * ROWS:(band + 1) * ROWS].tobytes()) for band in range(BANDS)]
+
+
+# ═══════════════════════════════════════════
+# INDEX
+# ═══════════════════════════════════════════
+class NearDuplicateIndex:
+    """
+    Thread-safe LSH index of signatures -> stored LLM records
+    Bounded by max_entries (LRU) and ttl
+    """
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, ttl: float = TTL, threshold: float = THRESHOLD):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.threshold = threshold
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()    # text key -> (expires_at, signature, record)
+        self._bands = [{} for _ in range(BANDS)]    # band hash -> text key, or a set of them
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, text: str, record: dict, sig=None) -> bool:
+        """
+        Indexes text with the LLM record to hand out for its near-duplicates
+        Returns: False when the text is too short to index
+        """
+        sig = signature(text) if sig is None else sig
+        if sig is None:
+            return False
+        key = text_key(text)
+        record = {field: record[field] for field in RECORD_FIELDS if field in record}
+        with self._lock:
+            if key in self._entries:
+                self._evict(key)
+            self._entries[key] = (time.time() + self.ttl, sig, record)
+            for band, band_key in enumerate(band_keys(sig)):
+                buckets = self._bands[band]
+                bucket = buckets.get(band_key)
+                if bucket is None:
+                    buckets[band_key] = key    # most buckets hold one entry
+                elif isinstance(bucket, set):
+                    bucket.add(key)
+                else:
+                    buckets[band_key] = {bucket, key}
+            while len(self._entries) > self.max_entries:
+                self._evict(next(iter(self._entries)))
+        return True
+
+    def lookup(self, text: str, sig=None):
+        """
+        Best stored match at or above the threshold
+        Returns: (similarity, record) or None
+        """
+        sig = signature(text) if sig is None else sig
+        best = None
+        now = time.time()
+        with self._lock:
+            if sig is not None:
+                candidates = set()
+                for band, band_key in enumerate(band_keys(sig)):
+                    bucket = self._bands[band].get(band_key)
+                    if isinstance(bucket, set):
+                        candidates.update(bucket)
+                    elif bucket is not None:
+                        candidates.add(bucket)
+
+                for key in candidates:
+                    expires, stored, record = self._entries[key]
+                    if expires <= now:
+                        self._evict(key)
+                        continue
+                    score = similarity(sig, stored)
+                    if score >= self.threshold and (best is None or score > best[0]):
+                        best = (score, record, key)
+
+            if best is None:
+                self.misses += 1
+                metrics.inc('cache_requests_total', cache='near_duplicate', result='miss')
+                return None
+            self._entries.move_to_end(best[2])
+            self.hits += 1
+        metrics.inc('cache_requests_total', cache='near_duplicate', result='hit')
+        return (round(best[0], 3), dict(best[1]))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            for buckets in self._bands:
+                buckets.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+    def _evict(self, key):
+        # Caller holds the lock
+        _, sig, _ = self._entries.pop(key)
+        for band, band_key in enumerate(band_keys(sig)):
+            buckets = self._bands[band]
+            bucket = buckets.get(band_key)
+            if bucket == key:
+                del buckets[band_key]
+            elif isinstance(bucket, set):
+                bucket.discard(key)
+                if len(bucket) == 1:
+                    buckets[band_key] = bucket.pop()
+
+
+INDEX = NearDuplicateIndex()
+
+
+def lookup(text: str):
+    """
+    Returns: (similarity, LLM record) of a stored near-duplicate SCAM, or None
+    """
+    if not ENABLED:
+        return None
+    with metrics.timer('near_duplicate'):
+        return INDEX.lookup(text)
+
+
+def remember(text: str, llm: dict):
+    """
+    Indexes a posting the pipeline just called a SCAM with its LLM record
+    """
+    if ENABLED:
+        INDEX.add(text, llm)
@@ -0,0 +1,166 @@
+import atexit
+import hashlib
+import io
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+import metrics
+from verdict_cache import TTLCache
+
+
+# ═══════════════════════════════════════════
+# SETTINGS
+# ═══════════════════════════════════════════
+# Binary: env override, else whatever `tesseract` is on PATH
+TESSERACT_CMD = os.environ.get('SCAMSHIELD_TESSERACT_CMD') or shutil.which('tesseract') or 'tesseract'
+OCR_CONFIG = os.environ.get('SCAMSHIELD_OCR_CONFIG', r'--oem 3 --psm 6 -l eng')
+OCR_WORKERS = int(os.environ.get('SCAMSHIELD_OCR_WORKERS', 2))
+OCR_TIMEOUT = float(os.environ.get('SCAMSHIELD_OCR_TIMEOUT', 30))   # seconds per image
+
+# Forwarded screenshots repeat a lot: cache text by image content hash
+OCR_CACHE = TTLCache(
+    maxsize=int(os.environ.get('SCAMSHIELD_OCR_CACHE_SIZE', 2048)),
+    ttl=float(os.environ.get('SCAMSHIELD_OCR_CACHE_TTL', 86400)),
+    path=os.environ.get('SCAMSHIELD_CACHE_DB'),
+    table='ocr_text'
+)
+
+_pool = None
+_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_latency = {'count': 0, 'total': 0.0, 'max': 0.0}
+
+
+# ═══════════════════════════════════════════
+# WORKER SIDE (runs in the pool processes)
+# ═══════════════════════════════════════════
+def _init_worker(tesseract_cmd: str):
+    # Pay the imports once per worker, not once per image
+    global pytesseract, Image
+    import pytesseract
+    from PIL import Image
+    pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+
+
+def _ocr_bytes(data: bytes, config: str) -> str:
+    try:
+        image = Image.open(io.BytesIO(data))
+        image = image.convert('L')  # Grayscale
+        return pytesseract.image_to_string(image, config=config)
+    except Exception as e:
+        # pytesseract's exceptions don't survive pickling back to the caller
+        raise RuntimeError(f"{type(e).__name__}: {e}") from None
+
+
+def _ping():
+    return os.getpid()
+
+
+# ═══════════════════════════════════════════
+# CALLER SIDE
+# ═══════════════════════════════════════════
+def get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(
+                    max_workers=OCR_WORKERS,
+                    initializer=_init_worker,
+                    initargs=(TESSERACT_CMD,)
+                )
+    return _pool
+
+
+def warm_up():
+    """
+    Starts every worker now so the first screenshot doesn't pay for
+    process start-up and the pytesseract/PIL imports
+    """
+    pool = get_pool()
+    for future in [pool.submit(_ping) for _ in range(OCR_WORKERS)]:
+        future.result()
+
+
+def shutdown():
+    global _pool
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+atexit.register(shutdown)
+
+
+def submit(file_path: str) -> Future:
+    """
+    Queues OCR for an image file on the worker pool
+    Cache hits come back as an already-completed future
+    Returns: Future resolving to the extracted text
+    """
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    key = hashlib.sha256(data).hexdigest()
+    started = time.perf_counter()
+
+    cached = OCR_CACHE.get(key)
+    if cached is not None:
+        future = Future()
+        future.set_result(cached)
+        _record(started)
+        return future
+
+    future = get_pool().submit(_ocr_bytes, data, OCR_CONFIG)
+
+    def _done(f):
+        # Cancelled by shutdown(cancel_futures=True): nothing ran, nothing to record
+        if f.cancelled():
+            return
+        _record(started)
+        error = f.exception()
+        if error is None:
+            OCR_CACHE.set(key, f.result())
+        elif isinstance(error, BrokenProcessPool):
+            shutdown()  # a worker died; start a fresh pool next time
+
+    future.add_done_callback(_done)
+    return future
+
+
+def extract_text(file_path: str, timeout: float = None) -> str:
+    """
+    OCR an image file, blocking until the text is ready
+    """
+    with metrics.timer('ocr'):
+        try:
+            return submit(file_path).result(timeout=OCR_TIMEOUT if timeout is None else timeout)
+        except FutureTimeout:
+            metrics.inc('timeouts_total', stage='ocr')
+            raise
+
+
+def stats() -> dict:
+    """
+    Latency (ms, cache hits included) and cache hit rate
+    """
+    with _stats_lock:
+        count = _latency['count']
+        return {
+            'requests': count,
+            'avg_latency_ms': round(_latency['total'] / count * 1000, 2) if count else 0.0,
+            'max_latency_ms': round(_latency['max'] * 1000, 2),
+            'cache': OCR_CACHE.stats()
+        }
+
+
+def _record(started: float):
+    elapsed = time.perf_counter() - started
+    with _stats_lock:
+        _latency['count'] += 1
+        _latency['total'] += elapsed
+        _latency['max'] = max(_latency['max'], elapsed)
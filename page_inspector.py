@@ -0,0 +1,158 @@
+import codecs
+from collections import namedtuple
+from html.parser import HTMLParser
+
+
+CHUNK_SIZE = 64 * 1024
+# Text inside these elements isn't page text (BeautifulSoup's get_text skips it too)
+NON_TEXT_TAGS = ('script', 'style', 'template')
+
+
+class PageInspector(HTMLParser):
+    """
+    Incremental HTML scan for the signals check_url scores:
+    first og:type meta, first JSON-LD script, and which job / scam
+    keywords appear in the visible text. Feed it decoded chunks; nothing
+    but the signals (and a short keyword tail) is kept.
+    """
+
+    def __init__(self, job_keywords, scam_keywords, collect_text: bool = False):
+        super().__init__(convert_charrefs=True)
+        self.job_keywords = list(job_keywords)
+        self.scam_keywords = list(scam_keywords)
+        self.og_type = None           # content of the first og:type meta
+        self.ld_json = None           # text of the first JSON-LD script
+        self.job_found = set()
+        self.scam_found = set()
+        self.text_parts = [] if collect_text else None
+
+        self._skip_tag = None         # inside script/style/template
+        self._ld_parts = None         # collecting the first JSON-LD script
+        self._ld_done = False
+        self._tail = ''               # end of the previous text piece
+        self._tail_len = max(map(len, self.job_keywords + self.scam_keywords), default=1) - 1
+
+    # ═══════════════════════════════════════════
+    # PARSER CALLBACKS
+    # ═══════════════════════════════════════════
+    def handle_starttag(self, tag, attrs):
+        if tag == 'meta' and self.og_type is None:
+            attrs = dict(attrs)
+            if attrs.get('property') == 'og:type':
+                self.og_type = attrs.get('content') or ''
+
+        elif tag in NON_TEXT_TAGS and self._skip_tag is None:
+            self._skip_tag = tag
+            if tag == 'script' and not self._ld_done and dict(attrs).get('type') == 'application/ld+json':
+                self._ld_parts = []
+
+    def handle_endtag(self, tag):
+        if tag == self._skip_tag:
+            self._skip_tag = None
+            if self._ld_parts is not None:
+                self.ld_json = ''.join(self._ld_parts)
+                self._ld_parts = None
+                self._ld_done = True
+
+    def handle_data(self, data):
+        if self._skip_tag is not None:
+            if self._ld_parts is not None:
+                self._ld_parts.append(data)
+            return
+        if self.text_parts is not None:
+            self.text_parts.append(data)
+
+        # Adjacent text nodes join without a separator, like get_text()
+        window = self._tail + data.lower()
+        for keyword in self.job_keywords:
+            if keyword not in self.job_found and keyword in window:
+                self.job_found.add(keyword)
+        for keyword in self.scam_keywords:
+            if keyword not in self.scam_found and keyword in window:
+                self.scam_found.add(keyword)
+        self._tail = window[-self._tail_len:] if self._tail_len else ''
+
+    # ═══════════════════════════════════════════
+    # RESULTS
+    # ═══════════════════════════════════════════
+    @property
+    def decided(self) -> bool:
+        """True once more input can't change any signal"""
+        return (
+            self.og_type is not None and
+            self._ld_done and
+            len(self.job_found) == len(self.job_keywords) and
+            len(self.scam_found) == len(self.scam_keywords)
+        )
+
+    def signals(self) -> dict:
+        return {
+            'og_job': 'job' in (self.og_type or '').lower(),
+            'job_schema': 'JobPosting' in (self.ld_json or ''),
+            'keyword_count': len(self.job_found),
+            'scam_count': len(self.scam_found)
+        }
+
+
+# Whole-page parse result, shared by every stage that needs the page
+# (see fetch_context.py): visible text plus the structured-data bits
+PageDocument = namedtuple('PageDocument', ['text', 'og_type', 'ld_json'])
+
+
+def _decoder(encoding: str):
+    try:
+        return codecs.getincrementaldecoder(encoding or 'utf-8')(errors='replace')
+    except LookupError:
+        return codecs.getincrementaldecoder('utf-8')(errors='replace')
+
+
+def _feed(inspector: PageInspector, chunks, encoding: str, max_bytes: int, stop_early: bool) -> int:
+    decoder = _decoder(encoding)
+    bytes_read = 0
+    for chunk in chunks:
+        if bytes_read + len(chunk) > max_bytes:
+            chunk = chunk[:max_bytes - bytes_read]
+        bytes_read += len(chunk)
+        inspector.feed(decoder.decode(chunk))
+        if bytes_read >= max_bytes or (stop_early and inspector.decided):
+            break
+    else:
+        inspector.feed(decoder.decode(b'', final=True))
+    inspector.close()
+    return bytes_read
+
+
+def inspect_stream(chunks, encoding: str, job_keywords, scam_keywords,
+                   max_bytes: int) -> tuple:
+    """
+    Decodes and parses raw byte chunks until max_bytes or until every
+    signal is decided, whichever comes first
+    Returns: (signals_dict, bytes_read)
+    """
+    inspector = PageInspector(job_keywords, scam_keywords)
+    bytes_read = _feed(inspector, chunks, encoding, max_bytes, stop_early=True)
+    return (inspector.signals(), bytes_read)
+
+
+def parse_document(chunks, encoding: str, max_bytes: int) -> PageDocument:
+    """
+    Parses a whole page (up to max_bytes) once
+    Text nodes are joined without a separator, like BeautifulSoup's get_text()
+    Returns: PageDocument
+    """
+    inspector = PageInspector((), (), collect_text=True)
+    _feed(inspector, chunks, encoding, max_bytes, stop_early=False)
+    return PageDocument(''.join(inspector.text_parts), inspector.og_type, inspector.ld_json)
+
+
+def document_signals(document: PageDocument, job_keywords, scam_keywords) -> dict:
+    """
+    Same signals inspect_stream reports, from an already parsed page
+    """
+    text = document.text.lower()
+    return {
+        'og_job': 'job' in (document.og_type or '').lower(),
+        'job_schema': 'JobPosting' in (document.ld_json or ''),
+        'keyword_count': sum(1 for keyword in job_keywords if keyword in text),
+        'scam_count': sum(1 for keyword in scam_keywords if keyword in text)
+    }
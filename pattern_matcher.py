@@ -0,0 +1,104 @@
+from collections import deque
+
+
+class AhoCorasick:
+    """
+    Multi-pattern substring matcher (Aho-Corasick automaton)
+    Build it once from (pattern, value) pairs, then every scan is one
+    linear pass over the text no matter how many patterns are loaded.
+    """
+
+    def __init__(self, patterns):
+        self._values = []
+        goto = [{}]
+        outputs = [[]]
+
+        # ═══════════════════════════════════════════
+        # BUILD THE TRIE
+        # ═══════════════════════════════════════════
+        for pattern, value in patterns:
+            if not pattern:
+                raise ValueError("Empty pattern")
+            state = 0
+            for ch in pattern:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    goto.append({})
+                    outputs.append([])
+                    nxt = len(goto) - 1
+                    goto[state][ch] = nxt
+                state = nxt
+            outputs[state].append(len(self._values))
+            self._values.append(value)
+
+        # ═══════════════════════════════════════════
+        # FAILURE LINKS (breadth-first)
+        # ═══════════════════════════════════════════
+        fail = [0] * len(goto)
+        order = []
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            order.append(state)
+            for ch, nxt in goto[state].items():
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                target = goto[f].get(ch, 0)
+                fail[nxt] = target if target != nxt else 0
+                outputs[nxt] = outputs[nxt] + outputs[fail[nxt]]
+                queue.append(nxt)
+
+        # ═══════════════════════════════════════════
+        # FLATTEN INTO A DFA
+        # Each state keeps only the transitions that differ from the
+        # root's, so a miss falls back to one lookup in the root table.
+        # ═══════════════════════════════════════════
+        root = goto[0]
+        delta = [None] * len(goto)
+        delta[0] = {}
+        full = [None] * len(goto)
+        full[0] = dict(root)
+        for state in order:
+            table = dict(full[fail[state]])
+            table.update(goto[state])
+            full[state] = table
+            delta[state] = {ch: nxt for ch, nxt in table.items() if root.get(ch, 0) != nxt}
+
+        self._root = root
+        self._delta = delta
+        self._outputs = [tuple(out) for out in outputs]
+
+    def __len__(self):
+        return len(self._values)
+
+    def iter_matches(self, text: str):
+        """
+        Yields (end_index, value) for every occurrence, overlaps included
+        """
+        delta = self._delta
+        outputs = self._outputs
+        values = self._values
+        root_get = self._root.get
+        state = 0
+        for i, ch in enumerate(text):
+            state = delta[state].get(ch) or root_get(ch, 0)
+            for idx in outputs[state]:
+                yield (i, values[idx])
+
+    def matches(self, text: str) -> set:
+        """
+        Returns the set of values whose pattern occurs anywhere in text
+        """
+        delta = self._delta
+        outputs = self._outputs
+        root_get = self._root.get
+        hit_states = set()
+        state = 0
+        for ch in text:
+            state = delta[state].get(ch) or root_get(ch, 0)
+            if outputs[state]:
+                hit_states.add(state)
+
+        values = self._values
+        return {values[idx] for state in hit_states for idx in outputs[state]}
@@ -0,0 +1,344 @@
+"""
+Headless ScamShield: runs the flow's components in-process, without Langflow
+
+Usage:
+    python pipeline.py "job posting text or URL"
+    cat posting.txt | python pipeline.py --json
+    python pipeline.py --stream --json "..."    # provisional results as JSON lines
+"""
+import argparse
+import contextvars
+import json
+import os
+import queue
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import fetch_context
+import llm_client
+import local_model
+import metrics
+import near_duplicate
+import result_cache
+import startup
+from domain_validator import EnhancedDomainValidator
+from feature_extractor import extract_features
+from heuristic_scorer import score_many
+from llm_parser import parse_llm_stream
+from prompt_compactor import compact, compaction_stats
+from result_formatter import format_report
+from score_combiner import TIMINGS, combine_results, early_exit_verdict, provisional_result
+from text_processor import MAX_PROMPT_SOURCE_CHARS, process_user_input, scorer_text
+
+asyncio = startup.lazy_import('asyncio')      # analyze_stream only
+requests = startup.lazy_import('requests')    # exception types only
+
+
+# Three branches per analysis; room for a few analyses in flight
+BRANCH_WORKERS = int(os.environ.get('SCAMSHIELD_BRANCH_WORKERS', 12))
+
+# Cascade: run heuristic + domain first, call the LLM only if it can still
+# change the verdict (SCAMSHIELD_CASCADE=1 or --cascade to make it the default)
+CASCADE = os.environ.get('SCAMSHIELD_CASCADE', '0') == '1'
+
+_branches = ThreadPoolExecutor(max_workers=BRANCH_WORKERS, thread_name_prefix="branch")
+_validator = EnhancedDomainValidator()
+_cascade_lock = threading.Lock()
+_cascade_stats = {'evaluated': 0, 'llm_skipped': 0}
+
+# Heavy imports and first-use setup on a background thread (startup.py)
+startup.maybe_warm_up()
+
+
+# ═══════════════════════════════════════════
+# STAGES (same wiring as the flow's edges)
+#
+#   Text Processor ─┬─ Heuristic Scorer ──┐
+#                   ├─ Domain Validator ──┼─ Score Combiner ─ Result Formatter
+#                   └─ OpenRouter ─ LLM Parser ─┘
+# ═══════════════════════════════════════════
+def run_heuristic(text: str) -> dict:
+    return score_many([text])[0]
+
+
+def run_domain(text: str) -> dict:
+    with metrics.timer('domain'):
+        return _validator.validate_text(text)
+
+
+def run_local(text: str):
+    # Sub-millisecond, so it runs inline; never fails the analysis
+    try:
+        return local_model.score(text)
+    except Exception as e:
+        metrics.inc('errors_total', stage='local_model')
+        metrics.log.warning("Local model failed: %s", e)
+        return None
+
+
+def run_llm(text: str) -> dict:
+    # Only the highest-signal sentences go to the model (prompt_compactor.py)
+    compaction = compact(text)
+    try:
+        # Streamed: the parser stops generation once the verdict fields are in
+        llm = parse_llm_stream(llm_client.stream(compaction.text))
+    except Exception as e:
+        if isinstance(e, requests.exceptions.Timeout):
+            metrics.inc('timeouts_total', stage='llm')
+        else:
+            metrics.inc('errors_total', stage='llm')
+        metrics.log.warning("LLM call failed: %s", e)
+        return {
+            'llm_score': 50,
+            'top_reasons': [f"AI analysis unavailable: {str(e)[:100]}"],
+            'explain_brief': "AI analysis unavailable; verdict based on pattern and domain checks.",
+            'unavailable': True
+        }
+    if llm.get('parse_error'):
+        metrics.inc('errors_total', stage='llm_parse')
+    return {**llm, 'prompt': compaction_stats(compaction)}
+
+
+def reuse_or_run_llm(text: str) -> dict:
+    """
+    The LLM record of a near-duplicate SCAM analyzed before (same template,
+    swapped numbers or names; see near_duplicate.py), else a fresh LLM call
+    """
+    match = near_duplicate.lookup(text)
+    if match is None:
+        return run_llm(text)
+    metrics.inc('llm_skipped_total', reason='near_duplicate')
+    score, record = match
+    return {**record, 'near_duplicate': {'similarity': score}}
+
+
+def remember_scam(text: str, llm: dict, result: dict):
+    # Only verdicts the LLM itself took part in, and not reused ones
+    if (result['final_verdict'] == "SCAM" and 'near_duplicate' not in llm
+            and not llm.get('parse_error') and not llm.get('unavailable')):
+        near_duplicate.remember(text, llm)
+
+
+def submit(fn, text: str):
+    # Branch threads see the caller's context, so their stage timers
+    # land in the same collect_timings() dict
+    return _branches.submit(contextvars.copy_context().run, fn, text)
+
+
+def run_stages(text: str, cascade: bool = False, timings: dict = None, emit=None,
+               reuse: bool = True, use_llm: bool = True, prompt_text: str = None) -> dict:
+    """
+    Runs the three independent branches concurrently and combines them
+    Latency is the slowest branch, not the sum
+    With cascade=True the LLM waits for the other two and is skipped
+    when their scores already fix a SCAM/SAFE verdict
+    emit, if given, gets a provisional result as soon as the heuristic
+    lands and another once the domain checks do (see analyze_stream)
+    reuse=False always calls the LLM and leaves the near-duplicate index alone
+    A confident local model (local_model.py) skips the LLM call as well;
+    use_llm=False never makes it
+    prompt_text, if given, is the longer text the LLM stage compacts
+    (text_processor.MAX_PROMPT_SOURCE_CHARS); the scorers get text
+    """
+    llm_stage = reuse_or_run_llm if reuse else run_llm
+    prompt_text = text if prompt_text is None else prompt_text
+    extract_features(text)   # once, before the branches race to fill the cache
+    heuristic = submit(run_heuristic, text)
+    domain = submit(run_domain, text)
+    local = run_local(text)
+    skip_for_local = local_model.skips_llm(local)
+    llm = None if cascade or skip_for_local or not use_llm else submit(llm_stage, prompt_text)
+    
+    heuristic = heuristic.result()
+    if emit:
+        emit(provisional_result(heuristic))
+    domain = domain.result()
+    if emit:
+        emit(provisional_result(heuristic, domain))
+    
+    if cascade:
+        skip_llm = early_exit_verdict(heuristic, domain) is not None
+        with _cascade_lock:
+            _cascade_stats['evaluated'] += 1
+            _cascade_stats['llm_skipped'] += skip_llm
+        if skip_llm:
+            metrics.inc('llm_skipped_total', reason='cascade')
+            return combine_results(heuristic, domain, None, timings, local, skip_reason='cascade')
+    
+    if skip_for_local:
+        metrics.inc('llm_skipped_total', reason='local_model')
+        return combine_results(heuristic, domain, None, timings, local, skip_reason='local_model')
+    if not use_llm:
+        return combine_results(heuristic, domain, None, timings, local, skip_reason='disabled')
+    
+    llm = llm.result() if llm is not None else llm_stage(prompt_text)
+    result = combine_results(heuristic, domain, llm, timings, local)
+    if reuse:
+        remember_scam(prompt_text, llm, result)
+    return result
+
+
+def cascade_stats() -> dict:
+    """
+    How many cascade runs skipped the LLM call
+    """
+    with _cascade_lock:
+        stats = dict(_cascade_stats)
+    stats['saved_ratio'] = round(stats['llm_skipped'] / stats['evaluated'], 4) if stats['evaluated'] else 0.0
+    return stats
+
+
+# ═══════════════════════════════════════════
+# LIBRARY ENTRY POINTS
+# ═══════════════════════════════════════════
+def analyze(user_input, use_cache: bool = True, cascade: bool = None, timings: bool = None,
+            emit=None, use_llm: bool = True) -> dict:
+    """
+    Full analysis of one chat input (text, URL, or message with an image)
+    use_cache=False skips both the exact result cache and near-duplicate reuse
+    use_llm=False runs only the local stages; those results are not cached,
+    so they never stand in for a full analysis
+    timings=True (or SCAMSHIELD_TIMINGS=1) adds per-stage ms as result['timings']
+    emit gets the provisional results on the way (not on a cache hit)
+    Returns: the SmartScoreCombiner result dict
+    """
+    cascade = CASCADE if cascade is None else cascade
+    timings = TIMINGS if timings is None else timings
+    
+    # One fetch scope per analysis: a URL the Text Processor downloaded is
+    # reused by the Domain Validator instead of being fetched again
+    with metrics.collect_timings() as collected, fetch_context.scope():
+        with metrics.timer('text_processor'):
+            text = process_user_input(user_input, MAX_PROMPT_SOURCE_CHARS)
+        
+        # Scorers get the first MAX_TEXT_CHARS; the LLM a compacted prompt
+        # picked from all of it, so the cache is keyed on all of it
+        compute = lambda t: run_stages(scorer_text(t), cascade, emit=emit, reuse=use_cache,
+                                       use_llm=use_llm, prompt_text=t)
+        if use_cache and use_llm:
+            # An early exit (cascade, confident local model) is only a
+            # valid answer for calls with the same settings
+            variant = f"cascade={cascade:d};local_skip={local_model.SKIP_LLM:d}"
+            result, _ = result_cache.get_or_compute(text, compute, variant)
+        else:
+            result = compute(text)
+    
+    if timings:
+        # Added after the cache so stored results never carry stale timings
+        result = {**result, 'timings': metrics.timings_ms(collected)}
+    return result
+
+
+def analyze_report(user_input, use_cache: bool = True, cascade: bool = None) -> str:
+    """
+    Same as analyze(), rendered by the Result Formatter
+    """
+    return format_report(analyze(user_input, use_cache=use_cache, cascade=cascade))
+
+
+# ═══════════════════════════════════════════
+# PROGRESSIVE RESULTS
+# A provisional verdict from the heuristic score (milliseconds), an
+# update when the domain checks land, then the final verdict. Every
+# update lists the stages still 'pending'; the last one has none.
+# ═══════════════════════════════════════════
+_STREAM_END = object()
+
+
+class _StreamError:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def _start_stream(user_input, put, **options):
+    # Own thread per stream: it waits on branch futures, so running it
+    # on the branch pool could starve that pool under load
+    def work():
+        try:
+            put({**analyze(user_input, emit=put, **options), 'pending': []})
+        except BaseException as e:
+            put(_StreamError(e))
+        finally:
+            put(_STREAM_END)
+    
+    context = contextvars.copy_context()
+    threading.Thread(target=context.run, args=(work,), name="analysis-stream", daemon=True).start()
+
+
+def analyze_stream(user_input, use_cache: bool = True, cascade: bool = None, timings: bool = None):
+    """
+    Same analysis as analyze(), yielded progressively
+    Yields: provisional result dicts (provisional=True, pending=[...]),
+    then the final one (pending=[]); a cache hit yields only the final one
+    """
+    updates = queue.Queue()
+    _start_stream(user_input, updates.put, use_cache=use_cache, cascade=cascade, timings=timings)
+    while True:
+        update = updates.get()
+        if update is _STREAM_END:
+            return
+        if isinstance(update, _StreamError):
+            raise update.error
+        yield update
+
+
+async def analyze_stream_async(user_input, use_cache: bool = True, cascade: bool = None,
+                               timings: bool = None):
+    """
+    analyze_stream() as an async iterator; the event loop is never blocked
+    """
+    loop = asyncio.get_running_loop()
+    updates = asyncio.Queue()
+    _start_stream(user_input, lambda update: loop.call_soon_threadsafe(updates.put_nowait, update),
+                  use_cache=use_cache, cascade=cascade, timings=timings)
+    while True:
+        update = await updates.get()
+        if update is _STREAM_END:
+            return
+        if isinstance(update, _StreamError):
+            raise update.error
+        yield update
+
+
+# ═══════════════════════════════════════════
+# CLI
+# ═══════════════════════════════════════════
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('text', nargs='*', help="posting text or URL (default: read stdin)")
+    parser.add_argument('--json', action='store_true', help="print the combined JSON result")
+    parser.add_argument('--no-cache', action='store_true', help="skip the result cache")
+    parser.add_argument('--cascade', action='store_true', help="skip the LLM when the verdict is already decided")
+    parser.add_argument('--timings', action='store_true', help="add per-stage ms to the JSON result")
+    parser.add_argument('--stream', action='store_true', help="print provisional results as stages finish")
+    parser.add_argument('--metrics', metavar='FILE', help="write Prometheus metrics here ('-' for stderr)")
+    args = parser.parse_args(argv)
+
+    user_input = ' '.join(args.text) if args.text and args.text != ['-'] else sys.stdin.read()
+    if not user_input.strip():
+        parser.error("no input text")
+
+    options = dict(use_cache=not args.no_cache, cascade=args.cascade or None, timings=args.timings or None)
+    if args.stream:
+        # One JSON object per line (--json) or one report per update
+        for update in analyze_stream(user_input, **options):
+            if args.json:
+                print(json.dumps(update, ensure_ascii=False), flush=True)
+            else:
+                print(format_report(update) + "\n", flush=True)
+    else:
+        result = analyze(user_input, **options)
+        if args.json:
+            print(json.dumps(result, ensure_ascii=False, indent=2))
+        else:
+            print(format_report(result))
+    
+    if args.metrics == '-':
+        sys.stderr.write(metrics.render_prometheus())
+    elif args.metrics:
+        metrics.write_textfile(args.metrics)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Provisional verdicts as incremental chat messages inside Langflow
+
+Langflow runs the Score Combiner only once every branch is done, so the
+branches report instead: the Heuristic Scorer and Domain Validator record
+their result here as they finish, and each posts a provisional report
+(score_combiner.provisional_result) through the component's send_message
+as soon as the heuristic score is known. The final report follows through
+the normal Combiner -> Formatter -> Chat Output path.
+
+Headless callers get the same updates from pipeline.analyze_stream().
+Set SCAMSHIELD_PROGRESSIVE=0 to turn the chat messages off.
+"""
+try:
+    from langflow.schema.message import Message
+except ImportError:  # headless use without Langflow (see pipeline.py)
+    from headless import Message
+import inspect
+import os
+import threading
+
+import startup
+from metrics import log
+from result_cache import text_key
+from result_formatter import format_report
+from score_combiner import provisional_result
+from verdict_cache import TTLCache
+
+# Only needed inside Langflow, where it is long loaded
+asyncio = startup.lazy_import('asyncio')
+
+
+PROGRESSIVE = os.environ.get('SCAMSHIELD_PROGRESSIVE', '1') == '1'
+
+# Finished branch results per run and processed text; dropped once both
+# branches are in, so a repeat of the same text starts empty
+_stages = TTLCache(maxsize=1024, ttl=300, table='progress')
+STAGES = ('heuristic', 'domain')
+_lock = threading.Lock()
+_pending_sends = set()   # keeps scheduled async sends alive
+
+
+def run_id(component) -> str:
+    """
+    The Langflow run (or else session) the component belongs to; '' when
+    there is none
+    """
+    try:
+        graph = component.graph
+        return str(getattr(graph, 'run_id', None) or getattr(graph, 'session_id', None) or '')
+    except Exception:
+        return ''
+
+
+def record(text: str, stage: str, result: dict, run: str = ''):
+    """
+    Remembers one finished branch ('heuristic' or 'domain') of run for text
+    Returns: the provisional result for what is known now, or None
+    while the heuristic score is still missing
+    """
+    key = f"{run}:{text_key(text)}"
+    with _lock:
+        stages = {**(_stages.get(key) or {}), stage: result}
+        if all(name in stages for name in STAGES):
+            _stages.delete(key)
+        else:
+            _stages.set(key, stages)
+    if 'heuristic' not in stages:
+        return None
+    return provisional_result(stages['heuristic'], stages.get('domain'))
+
+
+def report(component, text: str, stage: str, result: dict):
+    """
+    Posts a provisional report from inside a branch component
+    No-op without Langflow's send_message; never fails the branch
+    """
+    send = getattr(component, 'send_message', None)
+    if not PROGRESSIVE or send is None:
+        return
+    try:
+        provisional = record(text, stage, result, run_id(component))
+        if provisional is None:
+            return
+        sent = send(Message(text=format_report(provisional)))
+        if inspect.isawaitable(sent):
+            # Newer Langflow versions make send_message a coroutine
+            try:
+                task = asyncio.get_running_loop().create_task(sent)
+            except RuntimeError:
+                asyncio.run(sent)
+            else:
+                _pending_sends.add(task)
+                task.add_done_callback(_pending_sends.discard)
+    except Exception as e:
+        log.debug("Could not post provisional result: %r", e)
@@ -0,0 +1,206 @@
+try:
+    from langflow.custom import Component
+    from langflow.io import MessageTextInput, Output
+    from langflow.schema.message import Message
+except ImportError:  # headless use without Langflow (see pipeline.py)
+    from headless import Component, MessageTextInput, Output, Message
+from collections import namedtuple
+import os
+import re
+import time
+
+import metrics
+from feature_extractor import (ANNUAL_SALARY_RE, DAILY_SALARY_RE, EMAIL_RE,
+                               INTL_PHONE_RE, PHONE_RE)
+from heuristic_scorer import RULE_MATCHER
+from url_extractor import URL_RE, extract_domains
+
+
+# ═══════════════════════════════════════════
+# PROMPT COMPACTION
+# Prompt length drives LLM latency and cost, and long postings are mostly
+# boilerplate. Instead of sending a prefix, keep the sentences that carry
+# signal (keyword rule hits, links, numbers, salaries, emails), plus the
+# opening (title / company) and the closing (contact / call to action),
+# under a token budget. Kept sentences stay in their original order; a
+# '…' marks each cut.
+# ═══════════════════════════════════════════
+
+# Budget for the posting part of the prompt (the system prompt is fixed)
+TOKEN_BUDGET = int(os.environ.get('SCAMSHIELD_PROMPT_TOKENS', 500))
+
+# Rough BPE size: ~4 characters per token for English text
+CHARS_PER_TOKEN = 4
+
+# Unpunctuated runs (scraped pages) are cut into pieces of this many words,
+# and of this many characters (scripts without spaces between words)
+MAX_SENTENCE_WORDS = 40
+MAX_SENTENCE_CHARS = 240
+
+# CJK and Devanagari full stops need no space after them
+SENTENCE_BREAK = re.compile(r'(?<=[.!?])\s+|(?<=[。！？।])\s*|\s*[•▪●|]\s*')
+
+# Score per sentence; a keyword rule counts its heuristic weight
+CATEGORY_WEIGHTS = {'required': 8, 'manipulation': 10, 'grammar': 3}
+ENTITY_WEIGHTS = (
+    (URL_RE, 20),
+    (PHONE_RE, 20),
+    (INTL_PHONE_RE, 20),
+    (EMAIL_RE, 15),
+    (DAILY_SALARY_RE, 20),
+    (ANNUAL_SALARY_RE, 20),
+)
+DOMAIN_WEIGHT = 10      # bare domain with a known TLD
+LEAD_SENTENCES = 2      # title / company line
+LEAD_BONUS = 15
+TAIL_BONUS = 10         # last sentence: contact / how to apply
+GAP = '…'
+
+Compaction = namedtuple('Compaction', [
+    'text',             # what goes to the LLM
+    'tokens_in',        # estimated tokens of the processed text
+    'tokens_out',       # estimated tokens of `text`
+    'sentences_in',
+    'sentences_out',
+])
+
+
+def estimate_tokens(text: str) -> int:
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def split_sentences(text: str) -> list:
+    """
+    Sentence-ish units: breaks after . ! ? 。 ！ ？ । and at bullet / pipe
+    separators, long runs without any cut into MAX_SENTENCE_WORDS /
+    MAX_SENTENCE_CHARS pieces
+    Returns: list of non-empty strings, in order
+    """
+    sentences = []
+    for part in SENTENCE_BREAK.split(text):
+        words = part.split()
+        for i in range(0, len(words), MAX_SENTENCE_WORDS):
+            piece = ' '.join(words[i:i + MAX_SENTENCE_WORDS])
+            for j in range(0, len(piece), MAX_SENTENCE_CHARS):
+                sentences.append(piece[j:j + MAX_SENTENCE_CHARS])
+    return sentences
+
+
+def sentence_score(sentence: str, index: int, count: int) -> int:
+    """
+    Signal in one sentence: keyword rule weights + entity weights + position
+    """
+    lower = sentence.lower()
+    score = 0
+    for rule in RULE_MATCHER.matches(lower):
+        score += rule.weight or CATEGORY_WEIGHTS.get(rule.category, 0)
+    for pattern, weight in ENTITY_WEIGHTS:
+        if pattern.search(lower):
+            score += weight
+    if extract_domains(lower, limit=1):
+        score += DOMAIN_WEIGHT
+    if index < LEAD_SENTENCES:
+        score += LEAD_BONUS
+    if index == count - 1:
+        score += TAIL_BONUS
+    return score
+
+
+def compact(text: str, budget: int = None) -> Compaction:
+    """
+    Picks the highest-signal sentences that fit the token budget
+    Text that already fits is returned unchanged; repeated sentences
+    (boilerplate) are sent once
+    Returns: Compaction
+    """
+    started = time.perf_counter()
+    budget = TOKEN_BUDGET if budget is None else budget
+    tokens_in = estimate_tokens(text)
+    sentences = split_sentences(text)
+
+    if tokens_in <= budget:
+        kept = list(range(len(sentences)))
+        compacted = text
+    else:
+        # Highest score first, earlier sentence on ties
+        seen = set()
+        ranked = []
+        for i, sentence in enumerate(sentences):
+            key = sentence.lower()
+            if key in seen:
+                continue
+            seen.add(key)
+            ranked.append((-sentence_score(sentence, i, len(sentences)), i))
+        ranked.sort()
+
+        kept = []
+        used = 0
+        for _, i in ranked:
+            cost = estimate_tokens(sentences[i]) + 1   # + separator / gap mark
+            if used + cost > budget:
+                continue
+            kept.append(i)
+            used += cost
+        kept.sort()
+
+        parts = []
+        previous = -1
+        for i in kept:
+            if i != previous + 1:
+                parts.append(GAP)
+            parts.append(sentences[i])
+            previous = i
+        if kept and kept[-1] != len(sentences) - 1:
+            parts.append(GAP)
+        compacted = ' '.join(parts)
+        if not kept:
+            # Not even one unit fits (a tiny budget): send the opening
+            compacted = text[:max(budget - 1, 0) * CHARS_PER_TOKEN].rstrip() + GAP
+
+    result = Compaction(
+        text=compacted,
+        tokens_in=tokens_in,
+        tokens_out=estimate_tokens(compacted),
+        sentences_in=len(sentences),
+        sentences_out=len(kept)
+    )
+    metrics.inc('prompt_tokens_total', result.tokens_in, kind='original')
+    metrics.inc('prompt_tokens_total', result.tokens_out, kind='sent')
+    metrics.observe('compact', time.perf_counter() - started)
+    return result
+
+
+def compaction_stats(compaction: Compaction) -> dict:
+    """
+    Per-request numbers for the combined result's `prompt` block
+    Returns: {'tokens_in', 'tokens_out', 'tokens_saved', 'ratio'}
+    """
+    return {
+        'tokens_in': compaction.tokens_in,
+        'tokens_out': compaction.tokens_out,
+        'tokens_saved': max(0, compaction.tokens_in - compaction.tokens_out),
+        'ratio': round(compaction.tokens_out / compaction.tokens_in, 3) if compaction.tokens_in else 1.0
+    }
+
+
+class PromptCompactor(Component):
+    display_name = "Prompt Compactor"
+    description = "Keeps the highest-signal sentences under a token budget (goes before OpenRouter)"
+
+    inputs = [
+        MessageTextInput(
+            name="processed_text",
+            display_name="Processed Text"
+        )
+    ]
+
+    outputs = [
+        Output(display_name="Prompt Text", name="output", method="compact_prompt")
+    ]
+
+    def compact_prompt(self) -> Message:
+        compaction = compact(str(self.processed_text))
+        stats = compaction_stats(compaction)
+        metrics.log.debug("Prompt compacted: %(tokens_in)d -> %(tokens_out)d tokens (ratio %(ratio)s)", stats)
+        self.status = f"{stats['tokens_in']} -> {stats['tokens_out']} tokens"
+        return Message(text=compaction.text)
@@ -0,0 +1,67 @@
+import copy
+import hashlib
+import os
+
+from verdict_cache import TTLCache
+
+
+# ═══════════════════════════════════════════
+# WHOLE-PIPELINE RESULT CACHE
+# Keyed on the text UnifiedTextProcessor hands to the scorers and the
+# prompt compactor, so any exact repeat of a message skips heuristics,
+# domain checks and the LLM.
+# ═══════════════════════════════════════════
+RESULT_CACHE = TTLCache(
+    maxsize=int(os.environ.get('SCAMSHIELD_RESULT_CACHE_SIZE', 50000)),
+    maxbytes=int(os.environ.get('SCAMSHIELD_RESULT_CACHE_BYTES', 64 * 1024 * 1024)),
+    ttl=float(os.environ.get('SCAMSHIELD_RESULT_CACHE_TTL', 6 * 3600)),
+    path=os.environ.get('SCAMSHIELD_RESULT_CACHE_DB') or os.environ.get('SCAMSHIELD_CACHE_DB'),
+    table='pipeline_results'
+)
+
+
+def text_key(text: str, variant: str = '') -> str:
+    """
+    Content address of processed text: whitespace-normalized, SHA-256
+    variant names the options the result depends on (see get_or_compute)
+    """
+    normalized = ' '.join(text.split())
+    if variant:
+        normalized = f"{variant}\0{normalized}"
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+def lookup(text: str, variant: str = ''):
+    """
+    Returns: a copy of the stored SmartScoreCombiner result dict, or None
+    """
+    result = RESULT_CACHE.get(text_key(text, variant))
+    return copy.deepcopy(result) if result is not None else None
+
+
+def store(text: str, result: dict, variant: str = ''):
+    RESULT_CACHE.set(text_key(text, variant), copy.deepcopy(result))
+
+
+def get_or_compute(text: str, compute, variant: str = '') -> tuple:
+    """
+    Runs compute(text) only when no result is stored for this text and
+    variant (the options that change the result, e.g. 'cascade=1')
+    Degraded results (a failed LLM call or URL check) are returned but not
+    stored, so the next request tries again
+    Callers get their own copy; editing it doesn't touch the cache
+    Returns: (result_dict, cache_hit)
+    """
+    key = text_key(text, variant)
+    result = RESULT_CACHE.get(key)
+    if result is not None:
+        return (copy.deepcopy(result), True)
+
+    result = compute(text)
+    if not result.get('degraded'):
+        RESULT_CACHE.set(key, copy.deepcopy(result))
+    return (result, False)
+
+
+def stats() -> dict:
+    return RESULT_CACHE.stats()
@@ -1,8 +1,189 @@
-from langflow.custom import Component
-from langflow.io import MessageTextInput, Output
-from langflow.schema.message import Message
+try:
+    from langflow.custom import Component
+    from langflow.io import MessageTextInput, Output
+    from langflow.schema.message import Message
+except ImportError:  # headless use without Langflow (see pipeline.py)
+    from headless import Component, MessageTextInput, Output, Message
 import json
 
+from score_combiner import STAGE_NAMES
+
+
+def format_report(data: dict) -> str:
+    """
+    Renders a SmartScoreCombiner result as the chat report
+    """
+    # Extract data
+    score = round(data.get('final_score', 0))
+    verdict = data.get('final_verdict', 'UNKNOWN')
+    color = data.get('color', 'green')
+    risk_level = data.get('risk_level', 'Unknown Risk')
+    explanation = data.get('explain_brief', 'No explanation provided')
+    
+    # Score breakdown
+    breakdown = data.get('breakdown', {})
+    heuristic = breakdown.get('heuristic', 0)
+    domain = breakdown.get('domain', 0)
+    llm = breakdown.get('llm', 0)
+    
+    # Flags and recommendations
+    heuristic_flags = data.get('heuristic_flags', [])
+    top_reasons = data.get('top_reasons', [])
+    next_steps = data.get('next_steps', [])
+    
+    # Combine unique flags
+    all_flags = list(set(heuristic_flags + top_reasons))
+    
+    # Progressive updates: which stages are still running
+    pending = data.get('pending', []) if data.get('provisional') else []
+    
+    # Status indicators
+    status_icon = {
+        'green': '✓',
+        'yellow': '⚠',
+        'red': '✕'
+    }.get(color, '•')
+    
+    # Progress bar
+    bar_length = 20
+    filled = int((score / 100) * bar_length)
+    bar = '█' * filled + '░' * (bar_length - filled)
+    
+    # ═══════════════════════════════════════════
+    # BUILD OUTPUT - FORCE LINE BREAKS
+    # ═══════════════════════════════════════════
+    
+    output = "**SCAMSHIELD ANALYSIS REPORT**"
+    output += "\n\n"
+    
+    if pending:
+        waiting = ', '.join(STAGE_NAMES.get(stage, stage) for stage in pending)
+        output += f"⏳ *Provisional result, still running: {waiting}*"
+        output += "\n\n"
+    
+    output += f"**Status:** {status_icon} {verdict.upper()}"
+    output += "\n\n"
+    
+    output += f"**Risk Level:** {risk_level}"
+    output += "\n\n"
+    
+    output += f"**Risk Score:** {score}/100"
+    output += "\n\n"
+    
+    output += f"[{bar}]"
+    output += "\n\n"
+
+    # Confidence (if available)
+    if 'confidence' in data:
+        confidence = data['confidence']
+        output += f"**Analysis Confidence:** {confidence}"
+        output += "\n\n"
+
+    output += "─" * 50
+    output += "\n\n"
+    
+    # Assessment
+    output += "**ASSESSMENT**"
+    output += "\n\n"
+    
+    output += f"{explanation}"
+    output += "\n\n"
+    
+    output += "─" * 50
+    output += "\n\n"
+    
+    # Key Findings
+    output += "**KEY FINDINGS**"
+    output += "\n\n"
+    
+    if all_flags:
+        for i, flag in enumerate(all_flags[:6], 1):
+            clean_flag = flag.replace('🚨', '').replace('⚠️', '').replace('✅', '').strip()
+            output += f"{i}. {clean_flag}"
+            output += "\n"
+        output += "\n"
+    else:
+        output += "No significant risk indicators detected."
+        output += "\n\n"
+    
+    output += "─" * 50
+    output += "\n\n"
+    
+    # Recommendations
+    output += "**RECOMMENDATIONS**"
+    output += "\n\n"
+    
+    if next_steps:
+        for i, step in enumerate(next_steps[:4], 1):
+            clean_step = step.replace('✅', '').replace('⚠️', '').replace('🚨', '').strip()
+            output += f"{i}. {clean_step}"
+            output += "\n"
+        output += "\n"
+    else:
+        output += "Proceed with standard verification."
+        output += "\n\n"
+    
+    output += "─" * 50
+    output += "\n\n"
+    
+    # Analysis Breakdown
+    output += "**ANALYSIS BREAKDOWN**"
+    output += "\n\n"
+    
+    output += f"**Pattern Recognition:** {heuristic}/100"
+    output += "\n\n"
+    
+    if 'domain' in pending:
+        output += "**Domain Validation:** pending"
+    else:
+        output += f"**Domain Validation:** {domain}/100"
+    output += "\n\n"
+    
+    if 'llm' in pending:
+        output += "**AI Contextual Analysis:** pending"
+    elif llm is None and data.get('skip_reason') == 'local_model':
+        output += "**AI Contextual Analysis:** skipped (local model confident)"
+    elif llm is None and data.get('skip_reason') == 'disabled':
+        output += "**AI Contextual Analysis:** not run"
+    elif llm is None:
+        output += "**AI Contextual Analysis:** skipped (verdict already decided)"
+    elif data.get('near_duplicate'):
+        similarity = round(data['near_duplicate']['similarity'] * 100)
+        output += f"**AI Contextual Analysis:** {llm}/100 (reused from a {similarity}% similar scam)"
+    else:
+        output += f"**AI Contextual Analysis:** {llm}/100"
+    output += "\n\n"
+    
+    if breakdown.get('local') is not None:
+        output += f"**Local Model:** {breakdown['local']}/100"
+        output += "\n\n"
+
+    # Weights (if available)
+    if 'weights_used' in data:
+        weights = data['weights_used']
+        output += "**Weighting Applied:**"
+        output += "\n\n"
+        
+        output += f"• Pattern: {int(weights['h']*100)}%"
+        output += "\n\n"
+        
+        output += f"• Domain: {int(weights['d']*100)}%"
+        output += "\n\n"
+        
+        output += f"• AI: {int(weights['l']*100)}%"
+        output += "\n\n"
+        
+        if weights.get('m'):
+            output += f"• Local model: {int(weights['m']*100)}%"
+            output += "\n\n"
+
+    output += "─" * 50
+    output += "\n\n"
+    
+    output += "Note: Analysis is ephemeral. No data is stored or tracked."
+
+    return output.strip()
+
 
 class ResultFormatter(Component):
     display_name = "Result Formatter"
@@ -25,145 +206,7 @@ class ResultFormatter(Component):
             # Parse JSON input
             data = json.loads(self.json_input)
             
-            # Extract data
-            score = round(data.get('final_score', 0))
-            verdict = data.get('final_verdict', 'UNKNOWN')
-            color = data.get('color', 'green')
-            risk_level = data.get('risk_level', 'Unknown Risk')
-            explanation = data.get('explain_brief', 'No explanation provided')
-            
-            # Score breakdown
-            breakdown = data.get('breakdown', {})
-            heuristic = breakdown.get('heuristic', 0)
-            domain = breakdown.get('domain', 0)
-            llm = breakdown.get('llm', 0)
-            
-            # Flags and recommendations
-            heuristic_flags = data.get('heuristic_flags', [])
-            top_reasons = data.get('top_reasons', [])
-            next_steps = data.get('next_steps', [])
-            
-            # Combine unique flags
-            all_flags = list(set(heuristic_flags + top_reasons))
-            
-            # Status indicators
-            status_icon = {
-                'green': '✓',
-                'yellow': '⚠',
-                'red': '✕'
-            }.get(color, '•')
-            
-            # Progress bar
-            bar_length = 20
-            filled = int((score / 100) * bar_length)
-            bar = '█' * filled + '░' * (bar_length - filled)
-            
-            # ═══════════════════════════════════════════
-            # BUILD OUTPUT - FORCE LINE BREAKS
-            # ═══════════════════════════════════════════
-            
-            output = "**SCAMSHIELD ANALYSIS REPORT**"
-            output += "\n\n"
-            
-            output += f"**Status:** {status_icon} {verdict.upper()}"
-            output += "\n\n"
-            
-            output += f"**Risk Level:** {risk_level}"
-            output += "\n\n"
-            
-            output += f"**Risk Score:** {score}/100"
-            output += "\n\n"
-            
-            output += f"[{bar}]"
-            output += "\n\n"
-
-            # Confidence (if available)
-            if 'confidence' in data:
-                confidence = data['confidence']
-                output += f"**Analysis Confidence:** {confidence}"
-                output += "\n\n"
-
-            output += "─" * 50
-            output += "\n\n"
-            
-            # Assessment
-            output += "**ASSESSMENT**"
-            output += "\n\n"
-            
-            output += f"{explanation}"
-            output += "\n\n"
-            
-            output += "─" * 50
-            output += "\n\n"
-            
-            # Key Findings
-            output += "**KEY FINDINGS**"
-            output += "\n\n"
-            
-            if all_flags:
-                for i, flag in enumerate(all_flags[:6], 1):
-                    clean_flag = flag.replace('🚨', '').replace('⚠️', '').replace('✅', '').strip()
-                    output += f"{i}. {clean_flag}"
-                    output += "\n"
-                output += "\n"
-            else:
-                output += "No significant risk indicators detected."
-                output += "\n\n"
-            
-            output += "─" * 50
-            output += "\n\n"
-            
-            # Recommendations
-            output += "**RECOMMENDATIONS**"
-            output += "\n\n"
-            
-            if next_steps:
-                for i, step in enumerate(next_steps[:4], 1):
-                    clean_step = step.replace('✅', '').replace('⚠️', '').replace('🚨', '').strip()
-                    output += f"{i}. {clean_step}"
-                    output += "\n"
-                output += "\n"
-            else:
-                output += "Proceed with standard verification."
-                output += "\n\n"
-            
-            output += "─" * 50
-            output += "\n\n"
-            
-            # Analysis Breakdown
-            output += "**ANALYSIS BREAKDOWN**"
-            output += "\n\n"
-            
-            output += f"**Pattern Recognition:** {heuristic}/100"
-            output += "\n\n"
-            
-            output += f"**Domain Validation:** {domain}/100"
-            output += "\n\n"
-            
-            output += f"**AI Contextual Analysis:** {llm}/100"
-            output += "\n\n"
-
-            # Weights (if available)
-            if 'weights_used' in data:
-                weights = data['weights_used']
-                output += "**Weighting Applied:**"
-                output += "\n\n"
-                
-                output += f"• Pattern: {int(weights['h']*100)}%"
-                output += "\n\n"
-                
-                output += f"• Domain: {int(weights['d']*100)}%"
-                output += "\n\n"
-                
-                output += f"• AI: {int(weights['l']*100)}%"
-                output += "\n\n"
-
-            output += "─" * 50
-            output += "\n\n"
-            
-            output += "Note: Analysis is ephemeral. No data is stored or tracked."
-            
-            return Message(text=output.strip())
+            return Message(text=format_report(data))
             
         except json.JSONDecodeError:
             return Message(text="ERROR: Invalid data format. Please try again.")
@@ -1,7 +1,329 @@
-from langflow.custom import Component
-from langflow.io import MessageTextInput, Output
-from langflow.schema.message import Message
+try:
+    from langflow.custom import Component
+    from langflow.io import MessageTextInput, Output
+    from langflow.schema.message import Message
+except ImportError:  # headless use without Langflow (see pipeline.py)
+    from headless import Component, MessageTextInput, Output, Message
 import json
+import os
+import time
+
+import metrics
+
+
+# Verdict thresholds on the 0-100 final score
+SAFE_MAX = 25
+SUSPICIOUS_MAX = 60
+
+# Add a per-stage `timings` block (ms) to every result
+TIMINGS = os.environ.get('SCAMSHIELD_TIMINGS', '0') == '1'
+
+# Part of the AI weight the local model (local_model.py) takes when it
+# ran next to the LLM; without the LLM it takes the whole AI weight
+LOCAL_SHARE = float(os.environ.get('SCAMSHIELD_LOCAL_SHARE', 0.25))
+
+
+def pick_weights(heuristic: dict, d_score: int) -> dict:
+    """
+    Dynamic weighting; depends only on the heuristic flags and domain score
+    """
+    # If heuristic finds critical flags, trust it more
+    critical_flags = len([f for f in heuristic.get('heuristic_flags', []) 
+                         if '🚨' in f])
+    
+    if critical_flags >= 2:
+        # Obvious scam - trust heuristics more
+        return {'h': 0.50, 'd': 0.25, 'l': 0.25}
+    elif d_score > 70:
+        # Domain issues - trust domain check more
+        return {'h': 0.25, 'd': 0.50, 'l': 0.25}
+    else:
+        # Normal case - trust LLM more
+        return {'h': 0.30, 'd': 0.30, 'l': 0.40}
+
+
+def decision_bounds(heuristic: dict, domain: dict) -> tuple:
+    """
+    Lowest and highest final score any LLM score (0-100) could produce
+    Returns: (low, high)
+    """
+    h_score = heuristic.get('heuristic_score', 0)
+    d_score = domain.get('domain_score', 0)
+    weights = pick_weights(heuristic, d_score)
+    
+    base = h_score * weights['h'] + d_score * weights['d']
+    return (round(base), round(base + 100 * weights['l']))
+
+
+def early_exit_verdict(heuristic: dict, domain: dict):
+    """
+    'SCAM' or 'SAFE' when the LLM can no longer change the verdict, else None
+    """
+    low, high = decision_bounds(heuristic, domain)
+    if low > SUSPICIOUS_MAX:
+        return "SCAM"
+    if high <= SAFE_MAX:
+        return "SAFE"
+    return None
+
+
+def verdict_for(final_score: int) -> tuple:
+    """
+    Returns: (verdict, risk_level, color) for a 0-100 score
+    """
+    if final_score <= SAFE_MAX:
+        return ("SAFE", "Low Risk", "green")
+    elif final_score <= SUSPICIOUS_MAX:
+        return ("SUSPICIOUS", "Medium Risk", "yellow")
+    else:
+        return ("SCAM", "High Risk", "red")
+
+
+NEXT_STEPS = {
+    "SAFE": [
+        "✅ Verify company on official website",
+        "✅ Read employee reviews on Glassdoor",
+        "✅ Check if job is on company's career page",
+        "✅ Proceed with standard application"
+    ],
+    "SUSPICIOUS": [
+        "⚠️ DO NOT share personal documents yet",
+        "⚠️ Verify company registration (MCA database)",
+        "⚠️ Request interview on official platform",
+        "⚠️ Ask for official company email",
+        "⚠️ Check company address on Google Maps"
+    ],
+    "SCAM": [
+        "🚨 DO NOT ENGAGE with this posting",
+        "🚨 DO NOT send money or documents",
+        "🚨 Report to cybercrime.gov.in",
+        "🚨 Block contact immediately",
+        "🚨 Warn others in your network"
+    ],
+}
+
+
+def combine_results(heuristic: dict, domain: dict, llm: dict = None, timings: dict = None,
+                    local: dict = None, skip_reason: str = 'disabled') -> dict:
+    """
+    Weights the stage results into the final verdict
+    Pass llm=None when the LLM was skipped: the score then comes from the
+    other stages alone, and is marked early_exit with the caller's
+    skip_reason ('cascade', 'local_model', or 'disabled' when it was
+    turned off)
+    local is the optional local model result (local_model.py); it takes
+    LOCAL_SHARE of the AI weight, or all of it without the LLM
+    Pass timings (stage -> seconds, see metrics.collect_timings) to get
+    them back in ms as result['timings'], plus this stage's own time
+    Returns: the combined result dict the formatter renders
+    """
+    started = time.perf_counter()
+    h_score = heuristic.get('heuristic_score', 0)
+    d_score = domain.get('domain_score', 0)
+    m_score = local.get('local_score') if local else None
+    early_exit = llm is None
+    # Built on a failed LLM call or an unreachable page: fine to show,
+    # not to keep (result_cache.py)
+    degraded = bool(domain.get('fetch_failed') or
+                    (llm and (llm.get('unavailable') or llm.get('parse_error'))))
+    
+    # ═══════════════════════════════════════════
+    # DYNAMIC WEIGHTING (NEW!)
+    # ═══════════════════════════════════════════
+    weights = pick_weights(heuristic, d_score)
+    
+    if early_exit:
+        score_bounds = list(decision_bounds(heuristic, domain))
+        if m_score is None:
+            # Spread the LLM's share over the two stages we have; the result
+            # stays inside the bounds, so the verdict is the guaranteed one
+            known = weights['h'] + weights['d']
+            weights = {'h': weights['h'] / known, 'd': weights['d'] / known, 'l': 0.0}
+            explain = "Pattern and domain checks alone decide this verdict; AI review was skipped."
+        else:
+            # The local model stands in for the LLM (0-100 as well, so the
+            # bounds still hold)
+            weights = {'h': weights['h'], 'd': weights['d'], 'l': 0.0, 'm': weights['l']}
+            explain = "Pattern checks, domain checks and the local model decide this verdict; AI review was skipped."
+        llm = {
+            'top_reasons': [],
+            'explain_brief': explain
+        }
+        l_score = None
+        scores = [h_score, d_score]
+    else:
+        l_score = llm.get('llm_score', 0)
+        scores = [h_score, d_score, l_score]
+        if m_score is not None:
+            weights = {**weights, 'l': round(weights['l'] * (1 - LOCAL_SHARE), 4),
+                       'm': round(weights['l'] * LOCAL_SHARE, 4)}
+    
+    if m_score is not None:
+        scores.append(m_score)
+    
+    final_score = (
+        h_score * weights['h'] +
+        d_score * weights['d'] +
+        (l_score or 0) * weights['l'] +
+        (m_score or 0) * weights.get('m', 0.0)
+    )
+    
+    final_score = round(final_score)
+    
+    # ═══════════════════════════════════════════
+    # SMART VERDICT (NEW!)
+    # ═══════════════════════════════════════════
+    
+    # If all stages agree (within 20 points), high confidence
+    score_range = max(scores) - min(scores)
+    
+    if score_range < 20:
+        confidence = "High"
+    elif score_range < 40:
+        confidence = "Medium"
+    else:
+        confidence = "Low"
+    
+    verdict, risk_level, color = verdict_for(final_score)
+    
+    # ═══════════════════════════════════════════
+    # SMART RECOMMENDATIONS (NEW!)
+    # ═══════════════════════════════════════════
+    next_steps = list(NEXT_STEPS[verdict])
+    
+    # Combine all flags
+    all_flags = (
+        heuristic.get('heuristic_flags', []) +
+        domain.get('domain_flags', []) +
+        llm.get('top_reasons', [])
+    )
+    
+    result = {
+        'final_score': final_score,
+        'final_verdict': verdict,
+        'risk_level': risk_level,
+        'color': color,
+        'confidence': confidence,  # NEW!
+        'breakdown': {
+            'heuristic': h_score,
+            'domain': d_score,
+            'llm': l_score
+        },
+        'weights_used': weights,  # NEW!
+        'heuristic_flags': heuristic.get('heuristic_flags', []),
+        'domain_flags': domain.get('domain_flags', []),
+        'top_reasons': llm.get('top_reasons', []),
+        'explain_brief': llm.get('explain_brief', ''),
+        'next_steps': next_steps,
+        'all_flags': list(set(all_flags))[:8]  # Top 8 unique flags
+    }
+    
+    if m_score is not None:
+        result['breakdown']['local'] = m_score
+    if degraded:
+        result['degraded'] = True
+    
+    if early_exit:
+        result['early_exit'] = True
+        result['score_bounds'] = score_bounds
+        result['skip_reason'] = skip_reason
+    else:
+        # Prompt compaction numbers (prompt_compactor.py), or the match
+        # whose LLM assessment was reused (near_duplicate.py)
+        for key in ('prompt', 'near_duplicate'):
+            if llm.get(key):
+                result[key] = llm[key]
+    
+    elapsed = time.perf_counter() - started
+    metrics.observe('combine', elapsed)
+    if timings is not None:
+        result['timings'] = metrics.timings_ms({**timings, 'combine': elapsed})
+    
+    return result
+
+
+# ═══════════════════════════════════════════
+# PROVISIONAL VERDICTS (progressive output)
+# ═══════════════════════════════════════════
+STAGE_NAMES = {'domain': "domain checks", 'llm': "AI review"}
+
+
+def partial_bounds(heuristic: dict, domain: dict = None) -> tuple:
+    """
+    Range the final score can still land in, given the stages done so far
+    With the domain pending, every domain score (0-100) is tried, since
+    it also moves the weights
+    Returns: (low, high)
+    """
+    if domain is not None:
+        return decision_bounds(heuristic, domain)
+    bounds = [decision_bounds(heuristic, {'domain_score': d}) for d in range(101)]
+    return (min(low for low, _ in bounds), max(high for _, high in bounds))
+
+
+def provisional_result(heuristic: dict, domain: dict = None) -> dict:
+    """
+    Verdict from the stages finished so far, while the others still run:
+    the heuristic alone, then heuristic + domain (weights renormalized the
+    same way the cascade does)
+    Marked provisional, with the pending stages and the score bounds;
+    verdict_locked means no pending result can change the verdict
+    Returns: a result dict the formatter renders like the final one
+    """
+    started = time.perf_counter()
+    h_score = heuristic.get('heuristic_score', 0)
+    
+    if domain is None:
+        pending = ['domain', 'llm']
+        d_score = None
+        weights = {'h': 1.0, 'd': 0.0, 'l': 0.0}
+        final_score = h_score
+    else:
+        pending = ['llm']
+        d_score = domain.get('domain_score', 0)
+        weights = pick_weights(heuristic, d_score)
+        known = weights['h'] + weights['d']
+        weights = {'h': weights['h'] / known, 'd': weights['d'] / known, 'l': 0.0}
+        final_score = round(h_score * weights['h'] + d_score * weights['d'])
+    
+    low, high = partial_bounds(heuristic, domain)
+    verdict, risk_level, color = verdict_for(final_score)
+    locked = verdict_for(low)[0] == verdict_for(high)[0]
+    
+    waiting = ', '.join(STAGE_NAMES[stage] for stage in pending)
+    heuristic_flags = heuristic.get('heuristic_flags', [])
+    domain_flags = (domain or {}).get('domain_flags', [])
+    
+    result = {
+        'final_score': final_score,
+        'final_verdict': verdict,
+        'risk_level': risk_level,
+        'color': color,
+        'confidence': "Provisional",
+        'breakdown': {
+            'heuristic': h_score,
+            'domain': d_score,
+            'llm': None
+        },
+        'weights_used': weights,
+        'heuristic_flags': heuristic_flags,
+        'domain_flags': domain_flags,
+        'top_reasons': [],
+        'explain_brief': (
+            f"Early result; still waiting for {waiting}. "
+            + ("The verdict can no longer change." if locked
+               else f"The final score will land between {low} and {high}.")
+        ),
+        'next_steps': list(NEXT_STEPS[verdict]),
+        'all_flags': list(set(heuristic_flags + domain_flags))[:8],
+        'provisional': True,
+        'pending': pending,
+        'score_bounds': [low, high],
+        'verdict_locked': locked
+    }
+    
+    metrics.observe('combine', time.perf_counter() - started)
+    return result
 
 
 class SmartScoreCombiner(Component):
@@ -11,7 +333,9 @@ class SmartScoreCombiner(Component):
     inputs = [
         MessageTextInput(name="heuristic_result", display_name="Heuristic Result"),
         MessageTextInput(name="domain_result", display_name="Domain Result"),
-        MessageTextInput(name="llm_result", display_name="LLM Result")
+        MessageTextInput(name="llm_result", display_name="LLM Result"),
+        MessageTextInput(name="local_result", display_name="Local Model Result",
+                         info="Optional: Local Model Scorer output", required=False)
     ]
     
     outputs = [
@@ -23,119 +347,7 @@ class SmartScoreCombiner(Component):
         heuristic = json.loads(self.heuristic_result)
         domain = json.loads(self.domain_result)
         llm = json.loads(self.llm_result)
+        local = json.loads(self.local_result) if getattr(self, 'local_result', None) else None
         
-        h_score = heuristic.get('heuristic_score', 0)
-        d_score = domain.get('domain_score', 0)
-        l_score = llm.get('llm_score', 0)
-        
-        # ═══════════════════════════════════════════
-        # DYNAMIC WEIGHTING (NEW!)
-        # ═══════════════════════════════════════════
-        
-        # If heuristic finds critical flags, trust it more
-        critical_flags = len([f for f in heuristic.get('heuristic_flags', []) 
-                             if '🚨' in f])
-        
-        if critical_flags >= 2:
-            # Obvious scam - trust heuristics more
-            weights = {'h': 0.50, 'd': 0.25, 'l': 0.25}
-        elif d_score > 70:
-            # Domain issues - trust domain check more
-            weights = {'h': 0.25, 'd': 0.50, 'l': 0.25}
-        else:
-            # Normal case - trust LLM more
-            weights = {'h': 0.30, 'd': 0.30, 'l': 0.40}
-        
-        final_score = (
-            h_score * weights['h'] +
-            d_score * weights['d'] +
-            l_score * weights['l']
-        )
-        
-        final_score = round(final_score)
-        
-        # ═══════════════════════════════════════════
-        # SMART VERDICT (NEW!)
-        # ═══════════════════════════════════════════
-        
-        # If all three agree (within 20 points), high confidence
-        scores = [h_score, d_score, l_score]
-        score_range = max(scores) - min(scores)
-        
-        if score_range < 20:
-            confidence = "High"
-        elif score_range < 40:
-            confidence = "Medium"
-        else:
-            confidence = "Low"
-        
-        # Determine verdict
-        if final_score <= 25:
-            verdict = "SAFE"
-            risk_level = "Low Risk"
-            color = "green"
-        elif final_score <= 60:
-            verdict = "SUSPICIOUS"
-            risk_level = "Medium Risk"
-            color = "yellow"
-        else:
-            verdict = "SCAM"
-            risk_level = "High Risk"
-            color = "red"
-        
-        # ═══════════════════════════════════════════
-        # SMART RECOMMENDATIONS (NEW!)
-        # ═══════════════════════════════════════════
-        
-        if final_score <= 25:
-            next_steps = [
-                "✅ Verify company on official website",
-                "✅ Read employee reviews on Glassdoor",
-                "✅ Check if job is on company's career page",
-                "✅ Proceed with standard application"
-            ]
-        elif final_score <= 60:
-            next_steps = [
-                "⚠️ DO NOT share personal documents yet",
-                "⚠️ Verify company registration (MCA database)",
-                "⚠️ Request interview on official platform",
-                "⚠️ Ask for official company email",
-                "⚠️ Check company address on Google Maps"
-            ]
-        else:
-            next_steps = [
-                "🚨 DO NOT ENGAGE with this posting",
-                "🚨 DO NOT send money or documents",
-                "🚨 Report to cybercrime.gov.in",
-                "🚨 Block contact immediately",
-                "🚨 Warn others in your network"
-            ]
-        
-        # Combine all flags
-        all_flags = (
-            heuristic.get('heuristic_flags', []) +
-            domain.get('domain_flags', []) +
-            llm.get('top_reasons', [])
-        )
-        
-        result = {
-            'final_score': final_score,
-            'final_verdict': verdict,
-            'risk_level': risk_level,
-            'color': color,
-            'confidence': confidence,  # NEW!
-            'breakdown': {
-                'heuristic': h_score,
-                'domain': d_score,
-                'llm': l_score
-            },
-            'weights_used': weights,  # NEW!
-            'heuristic_flags': heuristic.get('heuristic_flags', []),
-            'domain_flags': domain.get('domain_flags', []),
-            'top_reasons': llm.get('top_reasons', []),
-            'explain_brief': llm.get('explain_brief', ''),
-            'next_steps': next_steps,
-            'all_flags': list(set(all_flags))[:8]  # Top 8 unique flags
-        }
-        
-        return Message(text=json.dumps(result))
+        timings = (metrics.current_timings() or {}) if TIMINGS else None
+        return Message(text=json.dumps(combine_results(heuristic, domain, llm, timings, local or None)))
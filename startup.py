@@ -0,0 +1,204 @@
+"""
+Fast cold start: lazy imports of the heavy dependencies + background warm-up
+
+requests (with urllib3 and certifi), NumPy and asyncio are most of the
+time it takes to import the pipeline, and no request needs all of them:
+NumPy only once a local model is trained, asyncio only for streaming.
+Modules reference them through lazy_import(), which does the real import
+on first attribute access instead of at module load.
+
+warm_up() then does the imports and the other first-use work (HTTP
+session, local model, domain lists, indicator store) on a background
+thread at process start. A freshly scaled worker accepts traffic right
+away, and by its first request that work is usually done. A request
+that arrives mid-warm-up just waits on the same import/initialization
+lock it would have taken anyway.
+
+SCAMSHIELD_WARMUP=0 turns the warm-up off (everything then loads on
+first use); SCAMSHIELD_WARMUP_OCR=1 also starts the OCR worker processes.
+"""
+import importlib
+import importlib.util
+import os
+import sys
+import threading
+import time
+
+import metrics
+from metrics import log
+
+
+WARMUP = os.environ.get('SCAMSHIELD_WARMUP', '1') == '1'
+WARMUP_OCR = os.environ.get('SCAMSHIELD_WARMUP_OCR', '0') == '1'
+
+_proxies = {}
+_import_seconds = {}    # module -> seconds its deferred import took (0.0: already loaded)
+
+
+# ═══════════════════════════════════════════
+# LAZY IMPORTS
+# ═══════════════════════════════════════════
+class LazyModule:
+    """
+    Stands in for a module until an attribute is first read
+    requests = lazy_import('requests'); requests.get(...) imports it then
+    """
+    __slots__ = ('_name', '_module')
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        # importlib's per-module lock makes concurrent first uses import once
+        if self._module is None:
+            already = self._name in sys.modules
+            started = time.perf_counter()
+            module = importlib.import_module(self._name)
+            _import_seconds.setdefault(self._name, 0.0 if already else time.perf_counter() - started)
+            self._module = module
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = 'loaded' if self._module is not None else 'not loaded'
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """
+    Returns: the shared stand-in for module `name`
+    """
+    proxy = _proxies.get(name)
+    if proxy is None:
+        proxy = _proxies.setdefault(name, LazyModule(name))
+    return proxy
+
+
+def available(name: str) -> bool:
+    """
+    Whether a module could be imported, without importing it
+    """
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def import_times() -> dict:
+    """
+    Returns: {module: ms} for the deferred imports done so far
+    """
+    return {name: round(seconds * 1000, 2) for name, seconds in _import_seconds.items()}
+
+
+# ═══════════════════════════════════════════
+# WARM-UP
+# Each step does what the first request of its kind would otherwise pay
+# for. Imports stay inside the steps so this module loads instantly.
+# ═══════════════════════════════════════════
+def _warm_http():
+    import http_client
+    http_client.get_session()
+
+
+def _warm_lists():
+    import domain_lists
+    import indicator_store
+    domain_lists.trusted()
+    domain_lists.blocked()
+    indicator_store.get_store()
+
+
+def _warm_local_model():
+    import local_model
+    local_model.get_model()
+
+
+def _warm_asyncio():
+    # Streaming only (analyze_stream, progress updates)
+    lazy_import('asyncio')._load()
+
+
+def _warm_ocr():
+    import ocr_engine
+    ocr_engine.warm_up()
+
+
+WARMUP_STEPS = [
+    ('http', _warm_http),
+    ('domain_lists', _warm_lists),
+    ('local_model', _warm_local_model),
+    ('asyncio', _warm_asyncio),
+]
+
+_ready = threading.Event()
+_thread = None
+_thread_lock = threading.Lock()
+_step_seconds = {}
+
+
+def _run_steps(steps: list):
+    started = time.perf_counter()
+    for name, step in steps:
+        step_started = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            # Warm-up is best effort: the request path retries and reports it
+            metrics.inc('errors_total', stage='warm_up')
+            log.warning("Warm-up step %s failed: %s", name, e)
+        _step_seconds[name] = time.perf_counter() - step_started
+    metrics.observe('warm_up', time.perf_counter() - started)
+    log.info("Warm-up done in %.0f ms", (time.perf_counter() - started) * 1000)
+    _ready.set()
+
+
+def warm_up(background: bool = True, ocr: bool = None):
+    """
+    Runs the warm-up steps once per process (later calls are no-ops)
+    background=False runs them on the calling thread
+    ocr=True (or SCAMSHIELD_WARMUP_OCR=1) also starts the OCR workers
+    Returns: the warm-up thread, or None when run inline / already started
+    """
+    global _thread
+    steps = WARMUP_STEPS + ([('ocr', _warm_ocr)] if (WARMUP_OCR if ocr is None else ocr) else [])
+    with _thread_lock:
+        if _thread is not None or _ready.is_set():
+            return None
+        if not background:
+            _thread = threading.current_thread()
+        else:
+            _thread = threading.Thread(target=_run_steps, args=(steps,), daemon=True, name="warm-up")
+            _thread.start()
+            return _thread
+    _run_steps(steps)
+    return None
+
+
+def maybe_warm_up():
+    """
+    Starts the background warm-up unless SCAMSHIELD_WARMUP=0
+    """
+    if WARMUP:
+        warm_up()
+
+
+def wait_ready(timeout: float = None) -> bool:
+    """
+    Blocks until the warm-up finished (for readiness probes)
+    Returns: False on timeout or when no warm-up was started
+    """
+    if _thread is None:
+        return False
+    return _ready.wait(timeout)
+
+
+def stats() -> dict:
+    return {
+        'ready': _ready.is_set(),
+        'steps_ms': {name: round(seconds * 1000, 2) for name, seconds in _step_seconds.items()},
+        'imports_ms': import_times()
+    }
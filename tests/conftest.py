@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Flat modules at the repo root; no background warm-up or persistent caches in tests
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ['SCAMSHIELD_WARMUP'] = '0'
+for name in ('SCAMSHIELD_CACHE_DB', 'SCAMSHIELD_RESULT_CACHE_DB'):
+    os.environ.pop(name, None)
@@ -0,0 +1,71 @@
+import argparse
+import gc
+import json
+from collections import Counter
+
+import pytest
+
+import bulk_analyze
+
+POSTINGS = [f"Data entry operator {n}: earn 4000 per day from home, pay the registration fee today."
+            for n in range(10)]
+
+
+def run_args(tmp_path, **overrides):
+    args = {'input': str(tmp_path / 'postings.jsonl'), 'out': str(tmp_path / 'results.jsonl'),
+            'text_field': 'text', 'id_field': 'id', 'workers': 1, 'threads': 2, 'chunk_size': 2,
+            'llm': False, 'cascade': False, 'no_cache': True, 'full': False, 'checkpoint': None,
+            'fresh': False}
+    args.update(overrides)
+    return argparse.Namespace(**args)
+
+
+def test_rows_that_are_not_objects_or_strings_are_skipped(tmp_path):
+    path = tmp_path / 'postings.jsonl'
+    path.write_text('{"id": "a", "text": "first"}\n'
+                    '42\n'
+                    '["not", "a", "posting"]\n'
+                    '{"id": \n'
+                    '\n'
+                    '"second"\n', encoding='utf-8')
+    stats = Counter()
+
+    rows = list(bulk_analyze.read_postings(str(path), 'text', 'id', stats))
+
+    assert rows == [('a', 'first'), (6, 'second')]
+    assert stats['bad_rows'] == 3
+
+
+def test_interrupted_run_resumes_without_duplicates(tmp_path, monkeypatch):
+    (tmp_path / 'postings.jsonl').write_text(
+        ''.join(json.dumps({'id': n, 'text': text}) + '\n' for n, text in enumerate(POSTINGS)),
+        encoding='utf-8')
+    args = run_args(tmp_path)
+
+    # Checkpoint after every chunk, then die right after the third chunk's
+    # rows are written but before a checkpoint records them
+    monkeypatch.setattr(bulk_analyze, 'CHECKPOINT_EVERY', 0.0)
+    mark_done = bulk_analyze.Checkpoint.mark_done
+    calls = []
+
+    def crash_on_third(self, index, rows):
+        calls.append(index)
+        if len(calls) == 3:
+            raise RuntimeError("killed")
+        mark_done(self, index, rows)
+
+    monkeypatch.setattr(bulk_analyze.Checkpoint, 'mark_done', crash_on_third)
+    with pytest.raises(RuntimeError):
+        bulk_analyze.run(args)
+    gc.collect()   # flush the abandoned output file, as the OS would on exit
+
+    written = (tmp_path / 'results.jsonl').read_text(encoding='utf-8').splitlines()
+    assert 4 < len(written) < len(POSTINGS)
+
+    monkeypatch.setattr(bulk_analyze.Checkpoint, 'mark_done', mark_done)
+    summary = bulk_analyze.run(args)
+
+    ids = [json.loads(line)['id'] for line in (tmp_path / 'results.jsonl').read_text(encoding='utf-8').splitlines()]
+    assert sorted(ids) == list(range(len(POSTINGS)))
+    assert summary['rows'] == len(POSTINGS)
+    assert summary['skipped_chunks'] == 2
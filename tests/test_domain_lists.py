@@ -0,0 +1,61 @@
+import os
+import time
+
+import domain_lists
+from domain_lists import DomainList
+
+
+def write_list(path, names, mtime=None):
+    path.write_text('\n'.join(names) + '\n', encoding='utf-8')
+    if mtime is not None:
+        os.utime(path, ns=(mtime, mtime))
+
+
+def test_suffix_match_on_label_boundaries(tmp_path):
+    path = tmp_path / 'trusted.txt'
+    write_list(path, ['linkedin.com', '*.naukri.com', 'WWW.Indeed.com.'])
+    domains = DomainList(str(path))
+
+    assert domains.match('in.linkedin.com') == 'linkedin.com'
+    assert domains.match('LinkedIn.com.') == 'linkedin.com'
+    assert domains.match('jobs.naukri.com') == 'naukri.com'
+    assert domains.match('indeed.com') == 'indeed.com'
+    assert domains.match('linkedin.com.evil.xyz') is None
+    assert domains.match('notlinkedin.com') is None
+    assert domains.match('com') is None
+
+
+def test_public_suffixes_are_refused(tmp_path):
+    path = tmp_path / 'blocked.txt'
+    write_list(path, ['co.in', 'github.io', 'com', 'scam-jobs.co.in', 'evil.github.io'])
+    domains = DomainList(str(path))
+
+    assert len(domains) == 2
+    assert domains.match('tcs.co.in') is None
+    assert domains.match('someone.github.io') is None
+    assert domains.match('apply.scam-jobs.co.in') == 'scam-jobs.co.in'
+    assert domains.match('evil.github.io') == 'evil.github.io'
+
+
+def test_index_is_rebuilt_when_the_list_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(domain_lists, 'RELOAD_CHECK', 0)
+    path = tmp_path / 'blocked.txt'
+    index = tmp_path / 'blocked.txt.idx'
+    earlier = time.time_ns() - 60 * 10 ** 9
+    write_list(path, ['old-scam.com'], mtime=earlier)
+    domains = DomainList(str(path))
+    assert index.exists()
+    os.utime(index, ns=(earlier, earlier))
+    first_version = domains.version
+
+    write_list(path, ['old-scam.com', 'new-scam.com'])
+
+    assert domains.match('new-scam.com') == 'new-scam.com'
+    assert domains.version != first_version
+    assert os.stat(index).st_mtime_ns >= os.stat(path).st_mtime_ns
+    # A fresh reader maps the rebuilt index instead of the stale one
+    assert DomainList(str(path)).match('new-scam.com') == 'new-scam.com'
+
+
+def test_missing_list_is_empty(tmp_path):
+    assert DomainList(str(tmp_path / 'missing.txt')).match('example.com') is None
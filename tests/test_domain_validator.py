@@ -0,0 +1,25 @@
+import pytest
+
+import indicator_store
+from domain_validator import EnhancedDomainValidator
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = indicator_store.IndicatorStore(str(tmp_path / 'indicators.ssi'))
+    monkeypatch.setattr(indicator_store, '_store', store)
+    return store
+
+
+def test_reported_email_domain_gets_no_corporate_bonus(store):
+    store.append([('domain', 'quick-hire-jobs.com')])
+    result = EnhancedDomainValidator().validate_text("Send your CV to hr@quick-hire-jobs.com today")
+
+    assert not any('Corporate email' in flag for flag in result['domain_flags'])
+    assert any('reported scam domain: quick-hire-jobs.com' in flag for flag in result['domain_flags'])
+    assert result['domain_score'] >= 50
+
+
+def test_unreported_corporate_email_keeps_the_bonus(store):
+    result = EnhancedDomainValidator().validate_text("Send your CV to hr@quick-hire-jobs.com today")
+    assert any('Corporate email' in flag for flag in result['domain_flags'])
@@ -0,0 +1,93 @@
+import time
+
+import pytest
+import requests
+
+import fetch_context
+import host_scheduler
+import http_client
+from host_scheduler import HostScheduler
+
+
+class StallingResponse:
+    """Headers arrive at once; the body times out after the first chunk"""
+    url = 'http://stall.example/page'
+    status_code = 200
+    history = []
+    encoding = 'utf-8'
+
+    def iter_content(self, chunk_size=None):
+        yield b'<html>'
+        raise requests.exceptions.ReadTimeout("read timed out")
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    scheduler = HostScheduler(max_per_host=1, rate=0, max_wait=0.05, failure_threshold=2)
+    monkeypatch.setattr(host_scheduler, 'ENABLED', True)
+    monkeypatch.setattr(host_scheduler, 'SCHEDULER', scheduler)
+    monkeypatch.setattr(http_client, 'get', lambda url, **kwargs: StallingResponse())
+    return scheduler
+
+
+def test_stalled_body_opens_the_breaker(scheduler):
+    for _ in range(2):
+        with fetch_context.scope():
+            page = fetch_context.fetch(StallingResponse.url)
+            with pytest.raises(requests.exceptions.ReadTimeout):
+                page.read_all()
+
+    assert scheduler.state('stall.example') == host_scheduler.OPEN
+    with pytest.raises(host_scheduler.CircuitOpen):
+        fetch_context.fetch(StallingResponse.url)
+
+
+def test_slot_is_held_until_the_page_is_released(scheduler):
+    with fetch_context.scope():
+        fetch_context.fetch(StallingResponse.url)
+        with pytest.raises(host_scheduler.HostBusy):
+            fetch_context.fetch('http://stall.example/other')
+    assert scheduler.stats()['active'] == 0
+
+
+def test_release_after_the_host_was_dropped(scheduler):
+    lease = scheduler.acquire('stall.example')
+    scheduler.clear()
+    lease.release()
+    lease.release()
+    assert lease.host.active == 0
+    assert scheduler.acquire('stall.example').host is not lease.host
+
+
+def open_breaker(scheduler, key):
+    for _ in range(scheduler.failure_threshold):
+        scheduler.acquire(key).release(requests.exceptions.ConnectTimeout("timed out"))
+    assert scheduler.state(key) == host_scheduler.OPEN
+
+
+def test_cooled_down_open_host_is_dropped_first():
+    scheduler = HostScheduler(rate=0, failure_threshold=1, cool_down=0.05, max_hosts=2)
+    open_breaker(scheduler, 'cooled.example')
+    scheduler.acquire('idle.example').release()
+    time.sleep(0.06)
+    scheduler.acquire('new.example').release()
+
+    assert scheduler.stats()['hosts'] == 2
+    assert scheduler.stats()['open'] == []
+    assert scheduler.state('idle.example') == host_scheduler.CLOSED
+
+
+def test_table_stays_capped_but_keeps_leased_hosts():
+    scheduler = HostScheduler(rate=0, failure_threshold=1, cool_down=60, max_hosts=2)
+    lease = scheduler.acquire('busy.example')
+    open_breaker(scheduler, 'cooling.example')
+    for n in range(5):
+        scheduler.acquire(f'host{n}.example').release()
+
+    assert scheduler.stats()['hosts'] == 2
+    assert scheduler.stats()['active'] == 1
+    assert scheduler.stats()['open'] == []
+    lease.release()
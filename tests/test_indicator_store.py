@@ -0,0 +1,36 @@
+import random
+
+from indicator_store import IndicatorStore, indicator_hash, indicator_key, write_store
+
+
+def test_append_is_visible_before_and_after_compact(tmp_path):
+    path = str(tmp_path / 'indicators.ssi')
+    store = IndicatorStore(path)
+    assert store.append([('phone', '+91 98765 43210'), ('upi', 'Quickjob@YBL'),
+                         ('domain', 'www.scam-jobs.in')]) == 3
+
+    assert store.contains('phone', '098765-43210')
+    assert store.contains('upi', 'quickjob@ybl')
+    assert store.match_domain('apply.scam-jobs.in') == 'scam-jobs.in'
+    assert not store.contains('phone', '9876543211')
+
+    store.compact()
+    assert store.contains('phone', '9876543210')
+
+    reopened = IndicatorStore(path)
+    assert len(reopened) == 3
+    assert reopened.contains('upi', 'quickjob@ybl')
+    assert reopened.match_domain('scam-jobs.in') == 'scam-jobs.in'
+
+
+def test_no_false_negatives(tmp_path):
+    rng = random.Random(3)
+    phones = {str(rng.randint(6000000000, 9999999999)) for _ in range(5000)}
+    path = str(tmp_path / 'indicators.ssi')
+    write_store(path, (indicator_hash(indicator_key('phone', phone)) for phone in phones))
+    store = IndicatorStore(path)
+
+    assert len(store) == len(phones)
+    assert all(store.contains('phone', phone) for phone in phones)
+    misses = sum(store.contains('phone', str(n)) for n in range(5000000000, 5000002000))
+    assert misses == 0
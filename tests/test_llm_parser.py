@@ -0,0 +1,66 @@
+import json
+import time
+
+from llm_parser import StreamingJSONParser, parse_llm_stream, parse_llm_text
+
+REPLY = json.dumps({
+    'llm_score': 87,
+    'top_reasons': ["Asks for a \"registration\" fee", "Pay via {UPI} only"],
+    'explain_brief': "Fee before hiring: a classic scam.",
+    'scam_type': 'advance_fee'
+})
+
+
+def test_reply_split_one_character_per_chunk():
+    record = parse_llm_stream(iter(REPLY))
+    assert record['llm_score'] == 87
+    assert record['top_reasons'] == ['Asks for a "registration" fee', 'Pay via {UPI} only']
+    assert record['explain_brief'] == "Fee before hiring: a classic scam."
+
+
+def test_escaped_quotes_and_braces_in_strings():
+    reply = '{"llm_score": 70, "explain_brief": "He said \\"pay {now}\\", then [left] \\\\", "top_reasons": []}'
+    record = parse_llm_text(reply)
+    assert record['llm_score'] == 70
+    assert record['explain_brief'] == 'He said "pay {now}", then [left] \\'
+
+
+def test_brace_pair_in_prose_before_the_object():
+    reply = "Sure {see below}, here is the JSON:\n```json\n" + REPLY + "\n```"
+    record = parse_llm_text(reply)
+    assert record['llm_score'] == 87
+    assert record['scam_type'] == 'advance_fee'
+
+
+def test_reply_cut_off_mid_value():
+    cut = REPLY[:REPLY.index('Fee before') + 5]
+    record = parse_llm_text(cut)
+    assert record['llm_score'] == 87
+    assert len(record['top_reasons']) == 2
+    assert record['explain_brief'] == ''
+
+
+def test_stream_stops_once_the_stop_fields_are_in():
+    parser = StreamingJSONParser()
+    chunks = [REPLY[i:i + 7] for i in range(0, len(REPLY), 7)]
+    fed = 0
+    for chunk in chunks:
+        fed += 1
+        if parser.feed(chunk):
+            break
+    assert fed < len(chunks)
+    assert 'scam_type' not in parser.fields
+
+
+def test_work_is_linear_in_the_number_of_chunks():
+    def feed_seconds(size):
+        reply = '{"explain_brief": "' + 'x' * size + '", "llm_score": 10}'
+        parser = StreamingJSONParser(stop_fields=())
+        started = time.perf_counter()
+        for c in reply:
+            parser.feed(c)
+        assert parser.result()['llm_score'] == 10
+        return time.perf_counter() - started
+
+    small, large = feed_seconds(20000), feed_seconds(160000)
+    assert large < small * 8 * 3
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+import local_model
+from local_model import LocalModel
+
+SCAMS = ["Pay registration fee on WhatsApp to get the job",
+         "Earn 5000 daily from home, deposit 999 to start",
+         "Urgent hiring, no interview, send security deposit today"]
+LEGIT = ["Backend engineer, Bengaluru office, apply on our careers page",
+         "Accountant role in Pune, five years experience, 8 LPA",
+         "Join our design team, hybrid work, interviews over two weeks"]
+
+
+@pytest.fixture(scope='module')
+def model():
+    return local_model.train(SCAMS * 20 + LEGIT * 20, [1] * 60 + [0] * 60, dim_bits=16, epochs=4)
+
+
+def test_saved_float16_model_scores_like_the_in_memory_one(model, tmp_path):
+    path = str(tmp_path / 'model.npz')
+    model.save(path)
+    loaded = LocalModel.load(path)
+
+    texts = SCAMS + LEGIT + ["Completely new posting about a warehouse shift in Chennai"]
+    assert loaded.dim_bits == model.dim_bits
+    np.testing.assert_allclose(loaded.predict_proba(texts), model.predict_proba(texts), atol=2e-3)
+    assert (loaded.predict_proba(SCAMS) > 0.5).all() and (loaded.predict_proba(LEGIT) < 0.5).all()
+
+
+def test_unknown_format_version_is_refused(model, tmp_path, monkeypatch):
+    path = str(tmp_path / 'model.npz')
+    model.save(path)
+    monkeypatch.setattr(local_model, 'FORMAT_VERSION', local_model.FORMAT_VERSION + 1)
+    with pytest.raises(ValueError):
+        LocalModel.load(path)
@@ -0,0 +1,53 @@
+import time
+
+from near_duplicate import NearDuplicateIndex
+
+TEMPLATE = ("Dear candidate, {company} is hiring remote data entry operators. Earn 45000 per month "
+            "working two hours a day from your phone. To confirm your seat pay the refundable "
+            "registration fee of 1999 rupees on the UPI ID given below before tonight. Seats are "
+            "limited and will be allotted on first come first serve basis. Contact our HR desk on "
+            "WhatsApp for the joining letter.")
+RECORD = {'llm_score': 92, 'top_reasons': ["Upfront fee"], 'explain_brief': "Fee to get hired.",
+          'scam_type': 'advance_fee', 'prompt': {'tokens_in': 80}}
+UNRELATED = ("Senior backend engineer for our Bengaluru payments team. You will design APIs in Go, "
+             "own services end to end and mentor two juniors. Five years of experience, hybrid "
+             "work, salary 40 LPA. Apply on our careers page; interviews take two weeks.")
+
+
+def test_company_name_swap_is_a_near_duplicate():
+    index = NearDuplicateIndex()
+    assert index.add(TEMPLATE.format(company="Sunrise Infotech"), RECORD)
+
+    match = index.lookup(TEMPLATE.format(company="Bluewave Solutions"))
+    assert match is not None
+    similarity, record = match
+    assert similarity >= index.threshold
+    assert record['llm_score'] == 92
+    assert 'prompt' not in record     # only the LLM assessment is kept
+
+    assert index.lookup(UNRELATED) is None
+
+
+def test_expired_entries_are_not_returned():
+    index = NearDuplicateIndex(ttl=0.05)
+    index.add(TEMPLATE.format(company="Sunrise Infotech"), RECORD)
+    time.sleep(0.1)
+
+    assert index.lookup(TEMPLATE.format(company="Sunrise Infotech")) is None
+    assert len(index) == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    third = ("Warehouse associates needed for night shifts in Chennai. Forklift licence preferred, "
+             "overtime paid weekly, canteen and transport provided. Walk in with your ID proof and "
+             "two photographs any weekday between nine and five at the gate office.")
+    index = NearDuplicateIndex(max_entries=2)
+    index.add(TEMPLATE.format(company="Sunrise Infotech"), RECORD)
+    index.add(UNRELATED, {**RECORD, 'llm_score': 10})
+    assert index.lookup(TEMPLATE.format(company="Sunrise Infotech")) is not None   # now most recent
+    index.add(third, {**RECORD, 'llm_score': 20})
+
+    assert len(index) == 2
+    assert index.lookup(UNRELATED) is None
+    assert index.lookup(TEMPLATE.format(company="Sunrise Infotech"))[1]['llm_score'] == 92
+    assert index.lookup(third)[1]['llm_score'] == 20
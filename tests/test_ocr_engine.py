@@ -0,0 +1,36 @@
+import logging
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import ocr_engine
+
+
+class QueuedPool:
+    def __init__(self):
+        self.futures = []
+
+    def submit(self, fn, *args):
+        future = Future()
+        self.futures.append(future)
+        return future
+
+
+def test_cancelled_and_broken_jobs_finish_quietly(tmp_path, monkeypatch, caplog):
+    pool = QueuedPool()
+    monkeypatch.setattr(ocr_engine, 'get_pool', lambda: pool)
+    shutdowns = []
+    monkeypatch.setattr(ocr_engine, 'shutdown', lambda: shutdowns.append(True))
+    images = []
+    for i in range(3):
+        image = tmp_path / f"shot{i}.png"
+        image.write_bytes(b"not really a png %d" % i)
+        images.append(ocr_engine.submit(str(image)))
+
+    with caplog.at_level(logging.ERROR, logger='concurrent.futures'):
+        images[0].set_running_or_notify_cancel()
+        images[0].set_exception(BrokenProcessPool("worker died"))
+        images[1].cancel()
+        images[2].cancel()
+
+    assert shutdowns == [True]
+    assert "exception calling callback" not in caplog.text
@@ -0,0 +1,60 @@
+import random
+
+from heuristic_scorer import RULE_MATCHER, score_many
+from pattern_matcher import AhoCorasick
+
+PATTERNS = ['he', 'she', 'his', 'hers', 'fee', 'registration fee', 'pay', 'pay for training']
+
+
+def brute_force(patterns, text):
+    return {pattern for pattern in patterns if pattern in text}
+
+
+def test_overlapping_keywords():
+    matcher = AhoCorasick((p, p) for p in PATTERNS)
+    assert matcher.matches('ushers') == {'she', 'he', 'hers'}
+    assert sorted(matcher.iter_matches('ushers')) == [(3, 'he'), (3, 'she'), (5, 'hers')]
+
+
+def test_shared_prefixes():
+    matcher = AhoCorasick((p, p) for p in PATTERNS)
+    assert matcher.matches('pay for training now') == {'pay', 'pay for training'}
+    assert matcher.matches('pay for train') == {'pay'}
+    assert matcher.matches('the registration fee') == {'he', 'registration fee', 'fee'}
+
+
+def test_substring_semantics_at_word_boundaries():
+    # Same as the `keyword in text` checks it replaced: a keyword counts
+    # at a word boundary and inside a longer word alike
+    matcher = AhoCorasick((p, p) for p in ['dont', 'telegram'])
+    assert matcher.matches('dont reply') == {'dont'}
+    assert matcher.matches('reply, dont.') == {'dont'}
+    assert matcher.matches('dontcare telegrams') == {'dont', 'telegram'}
+    assert matcher.matches('don t tele gram') == set()
+
+
+def test_case_folding_is_the_callers_job():
+    matcher = AhoCorasick((p, p) for p in ['gift card'])
+    assert matcher.matches('GIFT CARD') == set()
+    assert matcher.matches('GIFT CARD'.lower()) == {'gift card'}
+    # The heuristic lowercases before matching
+    assert any('gift card' in flag.lower() for flag in score_many(["Pay with a GIFT CARD"])[0]['heuristic_flags'])
+
+
+def test_matches_brute_force_on_random_text():
+    rng = random.Random(7)
+    patterns = [rule.pattern for rule in RULE_MATCHER._values]
+    alphabet = 'abcdefghinoprstuy :'
+    for _ in range(300):
+        text = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 80)))
+        text += ' ' + rng.choice(patterns)[:rng.randint(1, 12)]
+        found = {rule.pattern for rule in RULE_MATCHER.matches(text)}
+        assert found == brute_force(patterns, text)
+
+
+def test_empty_pattern_is_rejected():
+    try:
+        AhoCorasick([('', 'x')])
+    except ValueError:
+        return
+    raise AssertionError("empty pattern accepted")
@@ -0,0 +1,44 @@
+import pytest
+
+import llm_client
+import local_model
+import pipeline
+
+CLEAR_SCAM = ("URGENT hiring, work from home and earn 5000 per day guaranteed. No experience needed. "
+              "Pay the 499 registration fee on WhatsApp +91 98765 43210 or mail hiring.desk@gmail.com "
+              "and hr.team@yahoo.com to confirm your seat today.")
+
+
+@pytest.fixture(autouse=True)
+def no_llm_calls(monkeypatch):
+    def stream(text):
+        raise AssertionError("the LLM should have been skipped")
+    monkeypatch.setattr(llm_client, 'stream', stream)
+
+
+def test_local_model_skip_emits_both_provisional_results(monkeypatch):
+    monkeypatch.setattr(local_model, 'score', lambda text: {'local_score': 95, 'confident': True})
+    monkeypatch.setattr(local_model, 'SKIP_LLM', True)
+    updates = []
+    result = pipeline.analyze(CLEAR_SCAM, use_cache=False, cascade=False, emit=updates.append)
+
+    assert [update['pending'] for update in updates] == [['domain', 'llm'], ['llm']]
+    assert result['skip_reason'] == 'local_model'
+
+
+def test_cascade_skip_is_labelled_cascade(monkeypatch):
+    monkeypatch.setattr(local_model, 'score', lambda text: None)
+    updates = []
+    result = pipeline.analyze(CLEAR_SCAM, use_cache=False, cascade=True, emit=updates.append)
+
+    assert [update['pending'] for update in updates] == [['domain', 'llm'], ['llm']]
+    assert result['final_verdict'] == 'SCAM'
+    assert result['skip_reason'] == 'cascade'
+
+
+def test_llm_turned_off_is_labelled_disabled(monkeypatch):
+    monkeypatch.setattr(local_model, 'score', lambda text: None)
+    result = pipeline.analyze(CLEAR_SCAM, use_cache=False, cascade=False, use_llm=False)
+
+    assert result['final_verdict'] == 'SCAM'
+    assert result['skip_reason'] == 'disabled'
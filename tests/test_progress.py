@@ -0,0 +1,22 @@
+import progress
+
+HEURISTIC = {'heuristic_score': 80, 'heuristic_flags': []}
+DOMAIN = {'domain_score': 60, 'domain_flags': []}
+
+
+def test_repeat_run_of_the_same_text_starts_empty():
+    assert progress.record("same text", 'domain', DOMAIN) is None
+    assert progress.record("same text", 'heuristic', HEURISTIC)['pending'] == ['llm']
+
+    # Second run: no stale domain result from the first one
+    assert progress.record("same text", 'heuristic', HEURISTIC)['pending'] == ['domain', 'llm']
+
+
+def test_runs_are_kept_apart():
+    progress.record("shared text", 'domain', DOMAIN, run='run-1')
+    assert progress.record("shared text", 'heuristic', HEURISTIC, run='run-2')['pending'] == ['domain', 'llm']
+    assert progress.record("shared text", 'heuristic', HEURISTIC, run='run-1')['pending'] == ['llm']
+
+
+def test_run_id_without_a_graph():
+    assert progress.run_id(object()) == ''
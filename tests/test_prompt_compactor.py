@@ -0,0 +1,43 @@
+from prompt_compactor import compact, estimate_tokens, split_sentences
+
+SCAM = ("Urgent hiring for data entry. Earn 5000 per day from home. "
+        "Pay the 499 registration fee on WhatsApp +91 98765 43210 to start today. ")
+
+
+def test_text_under_budget_is_unchanged():
+    assert compact("Senior engineer, Berlin office.", budget=100).text == "Senior engineer, Berlin office."
+
+
+def test_long_posting_fits_the_budget():
+    compaction = compact(SCAM + "We value teamwork and growth. " * 200, budget=100)
+    assert compaction.tokens_out <= 100
+    assert "registration fee" in compaction.text
+
+
+def test_text_without_spaces_is_not_dropped():
+    text = '急招在家兼职，日赚五千，先交押金' * 150
+    compaction = compact(text, budget=100)
+    assert compaction.text.strip('…')
+    assert compaction.tokens_out <= 100
+    assert all(len(unit) <= 240 for unit in split_sentences(text))
+
+
+def test_devanagari_full_stop_splits_sentences():
+    text = 'घर से काम करें। रोज़ 5000 कमाएँ। पंजीकरण शुल्क जमा करें।'
+    assert len(split_sentences(text)) == 3
+
+
+def test_tiny_budget_falls_back_to_the_opening():
+    compaction = compact(SCAM * 5, budget=2)
+    assert compaction.text.startswith("Urge")
+    assert estimate_tokens(compaction.text) <= 3
+
+
+def test_scorers_keep_their_cap_while_the_prompt_sees_the_tail():
+    from text_processor import MAX_PROMPT_SOURCE_CHARS, MAX_TEXT_CHARS, process_user_input, scorer_text
+
+    posting = "We value teamwork and growth. " * 200 + "Pay the 499 registration fee on WhatsApp."
+    prompt_source = process_user_input(posting, MAX_PROMPT_SOURCE_CHARS)
+    assert process_user_input(posting) == scorer_text(prompt_source)
+    assert len(scorer_text(prompt_source)) <= MAX_TEXT_CHARS == 3000
+    assert "registration fee" in compact(prompt_source).text
@@ -0,0 +1,79 @@
+import pytest
+
+import llm_client
+import local_model
+import near_duplicate
+import pipeline
+import requests
+import result_cache
+
+POSTING = "Work from home data entry, earn 5000 per day. Pay the registration fee to start."
+
+
+@pytest.fixture(autouse=True)
+def clean_cache(monkeypatch):
+    result_cache.RESULT_CACHE.clear()
+    monkeypatch.setattr(local_model, 'skips_llm', lambda local: False)
+    monkeypatch.setattr(near_duplicate, 'ENABLED', False)
+    yield
+    result_cache.RESULT_CACHE.clear()
+
+
+def test_failed_llm_call_is_not_reused(monkeypatch):
+    calls = []
+
+    def failing_stream(text):
+        calls.append(text)
+        raise requests.exceptions.ConnectionError("provider down")
+
+    monkeypatch.setattr(llm_client, 'stream', failing_stream)
+    first = pipeline.analyze(POSTING, cascade=False)
+    second = pipeline.analyze(POSTING, cascade=False)
+
+    assert first['degraded'] and second['degraded']
+    assert len(calls) == 2
+    assert len(result_cache.RESULT_CACHE) == 0
+
+
+def test_successful_result_is_reused(monkeypatch):
+    calls = []
+
+    def stream(text):
+        calls.append(text)
+        yield '{"llm_score": 90, "top_reasons": ["Upfront fee"], "explain_brief": "Asks for a fee."}'
+
+    monkeypatch.setattr(llm_client, 'stream', stream)
+    first = pipeline.analyze(POSTING, cascade=False)
+    second = pipeline.analyze(POSTING, cascade=False)
+
+    assert 'degraded' not in first
+    assert second == first
+    assert len(calls) == 1
+
+
+def test_cascade_result_does_not_answer_a_full_analysis(monkeypatch):
+    calls = []
+
+    def stream(text):
+        calls.append(text)
+        yield '{"llm_score": 90, "top_reasons": ["Upfront fee"], "explain_brief": "Asks for a fee."}'
+
+    monkeypatch.setattr(llm_client, 'stream', stream)
+    posting = ("URGENT hiring, work from home and earn 5000 per day guaranteed. No experience needed. "
+               "Pay the 499 registration fee on WhatsApp +91 98765 43210 or mail hiring.desk@gmail.com "
+               "and hr.team@yahoo.com to confirm your seat today.")
+    cascaded = pipeline.analyze(posting, cascade=True)
+    full = pipeline.analyze(posting, cascade=False)
+
+    assert cascaded['skip_reason'] == 'cascade'
+    assert 'early_exit' not in full
+    assert len(calls) == 1
+
+
+def test_callers_get_a_copy():
+    result_cache.get_or_compute("some text", lambda text: {'final_verdict': 'SAFE', 'all_flags': []})
+    cached, hit = result_cache.get_or_compute("some text", lambda text: None)
+    cached['all_flags'].append("edited")
+
+    assert hit
+    assert result_cache.lookup("some text") == {'final_verdict': 'SAFE', 'all_flags': []}
@@ -0,0 +1,46 @@
+import time
+
+from url_extractor import MAX_DOMAIN_CANDIDATES, MAX_URL_CANDIDATES, extract_domains, extract_urls
+
+
+def test_url_cap():
+    text = ' '.join(f"https://site{i}.com/job" for i in range(200))
+    urls = extract_urls(text)
+    assert len(urls) == MAX_URL_CANDIDATES == 50
+    assert urls[0] == 'https://site0.com/job'
+
+
+def test_domain_cap():
+    text = ' '.join(f"site{i}.com" for i in range(200))
+    assert len(extract_domains(text)) == MAX_DOMAIN_CANDIDATES
+
+
+def test_trailing_punctuation_is_dropped():
+    text = 'Apply at https://jobs.example.com/apply?id=7. Or (see https://example.org/wiki/Foo_(bar))!'
+    assert extract_urls(text) == ['https://jobs.example.com/apply?id=7', 'https://example.org/wiki/Foo_(bar)']
+
+
+def test_duplicates_and_invalid_hosts():
+    text = 'https://Example.com/a https://example.com/a https://-bad-.com/x http://999999'
+    assert extract_urls(text) == ['https://example.com/a']
+
+
+def test_unknown_tlds_are_not_bare_domains():
+    text = 'Experience.Apply now at quick-jobs.xyz or www.careers.in, not report.final or a@mail.com'
+    assert extract_domains(text) == ['quick-jobs.xyz', 'careers.in']
+
+
+def test_url_hosts_come_first():
+    text = 'Visit https://www.apply-now.tk/form and hr-portal.com'
+    assert extract_domains(text, extract_urls(text)) == ['apply-now.tk', 'hr-portal.com']
+
+
+def test_pathological_input_stays_linear():
+    def seconds(size):
+        text = ('a.' * size) + ('-' * size) + ('http://' + 'x' * size) + (')' * size)
+        started = time.perf_counter()
+        extract_domains(text, extract_urls(text))
+        return time.perf_counter() - started
+
+    small, large = seconds(5000), seconds(40000)
+    assert large < small * 8 * 4 + 0.05
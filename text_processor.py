@@ -1,9 +1,140 @@
-from langflow.custom import Component
-from langflow.io import MessageTextInput, Output
-from langflow.schema.message import Message
+try:
+    from langflow.custom import Component
+    from langflow.io import MessageTextInput, Output
+    from langflow.schema.message import Message
+except ImportError:  # headless use without Langflow (see pipeline.py)
+    from headless import Component, MessageTextInput, Output, Message
 import re
 import os
 
+import fetch_context
+import metrics
+import ocr_engine
+from metrics import log
+
+
+# Processed text the scorers (heuristics, domain checks, local model) analyze
+MAX_TEXT_CHARS = int(os.environ.get('SCAMSHIELD_MAX_TEXT_CHARS', 3000))
+
+# The LLM only gets a compacted part of the text (prompt_compactor.py), so
+# compaction picks from a longer stretch and long postings keep their
+# closing lines
+MAX_PROMPT_SOURCE_CHARS = int(os.environ.get('SCAMSHIELD_MAX_PROMPT_SOURCE_CHARS', 12000))
+
+
+def fetch_page_text(url: str, max_chars: int = MAX_TEXT_CHARS) -> str:
+    """
+    Downloads a posting URL and returns it followed by the page's visible
+    text (max max_chars chars), so the Domain Validator checks the link itself
+    The page and its parse are shared with that check (see fetch_context.py)
+    """
+    with metrics.timer('fetch'):
+        page = fetch_context.fetch(url, timeout=10)
+    
+    with metrics.timer('html_parse'):
+        text = page.document().text
+        return ' '.join([url] + text.split())[:max_chars]
+
+
+def process_user_input(user_input, max_chars: int = MAX_TEXT_CHARS) -> str:
+    """
+    Turns raw chat input (text, URL, or a message carrying an image)
+    into the cleaned text every downstream stage analyzes
+    Pass max_chars=MAX_PROMPT_SOURCE_CHARS for the text prompt compaction
+    picks from; scorer_text() cuts that down for the scorers
+    """
+    processed_text = ""
+    
+    log.debug("Input received (%s): %.200r", type(user_input).__name__, user_input)
+    
+    # Check if user_input is a Message object with files
+    if hasattr(user_input, 'files') and user_input.files:
+        try:
+            file_path = user_input.files[0]
+            log.debug("OCR on attached file: %s", file_path)
+            
+            # OCR on the warm worker pool (cached by image hash)
+            processed_text = ocr_engine.extract_text(file_path)
+            
+            log.debug("OCR extracted: %.200s", processed_text)
+            
+        except Exception as e:
+            metrics.inc('errors_total', stage='ocr')
+            log.warning("OCR failed: %s", e)
+            processed_text = f"Error: {str(e)}"
+    
+    # Check if user_input has a text attribute
+    elif hasattr(user_input, 'text'):
+        text_content = user_input.text
+        log.debug("Text from message: %.100s", text_content or 'EMPTY')
+        
+        # If text is empty but there might be a file reference
+        if not text_content or text_content.strip() == "":
+            # Check if there's a file reference in the message data
+            if hasattr(user_input, 'data') and user_input.data:
+                log.debug("Message data: %r", user_input.data)
+                
+                # Look for file path in data
+                if 'file_path' in user_input.data:
+                    try:
+                        file_path = user_input.data['file_path']
+                        log.debug("OCR on file path from data: %s", file_path)
+                        
+                        processed_text = ocr_engine.extract_text(file_path)
+                        
+                        log.debug("OCR from data path: %.200s", processed_text)
+                    except Exception as e:
+                        metrics.inc('errors_total', stage='ocr')
+                        log.warning("OCR failed for file from data: %s", e)
+                        processed_text = ""
+            else:
+                processed_text = ""
+        else:
+            # Handle URL
+            if text_content.startswith('http'):
+                try:
+                    processed_text = fetch_page_text(text_content, max_chars)
+                except Exception as e:
+                    metrics.inc('errors_total', stage='fetch', kind='input_url')
+                    log.info("Could not fetch %s, analyzing the URL text: %s", text_content, e)
+                    processed_text = text_content
+            else:
+                # Plain text
+                processed_text = text_content
+    
+    # Fallback: treat as string
+    else:
+        user_input_str = str(user_input)
+        log.debug("String input: %.100s", user_input_str)
+        
+        if user_input_str.startswith('http'):
+            # URL handling
+            try:
+                processed_text = fetch_page_text(user_input_str, max_chars)
+            except Exception as e:
+                metrics.inc('errors_total', stage='fetch', kind='input_url')
+                log.info("Could not fetch %s, analyzing the URL text: %s", user_input_str, e)
+                processed_text = user_input_str
+        else:
+            processed_text = user_input_str
+    
+    # Clean text
+    if processed_text:
+        processed_text = re.sub(r'\s+', ' ', processed_text)
+        processed_text = processed_text[:max_chars].strip()
+    
+    log.debug("Processed text (%d chars): %.200s", len(processed_text), processed_text)
+    
+    return processed_text if processed_text else "No text could be extracted from input"
+
+
+def scorer_text(text: str) -> str:
+    """
+    The scorers' MAX_TEXT_CHARS share of longer processed text
+    """
+    return text[:MAX_TEXT_CHARS].strip()
+
+
 class UnifiedTextProcessor(Component):
     display_name = "Text Processor"
     description = "Handles text/image/URL inputs"
@@ -17,129 +148,14 @@ class UnifiedTextProcessor(Component):
     ]
     
     outputs = [
-        Output(display_name="Processed Text", name="output", method="process_input")
+        Output(display_name="Processed Text", name="output", method="process_input"),
+        # Longer text for the Prompt Compactor; OCR and page fetches are
+        # cached, so the second output doesn't repeat them
+        Output(display_name="Prompt Source Text", name="prompt_source", method="prompt_source")
     ]
     
     def process_input(self) -> Message:
-        user_input = self.user_input
-        processed_text = ""
-        
-        print(f"DEBUG - Input received: {user_input}")
-        print(f"DEBUG - Input type: {type(user_input)}")
-        
-        # Check if user_input is a Message object with files
-        if hasattr(user_input, 'files') and user_input.files:
-            print("DEBUG - Files attribute found")
-            try:
-                import pytesseract
-                from PIL import Image
-                
-                file_path = user_input.files[0]
-                print(f"DEBUG - File path: {file_path}")
-                
-                # Configure Tesseract
-                pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
-                
-                # Open and process image
-                image = Image.open(file_path)
-                image = image.convert('L')  # Grayscale
-                
-                # OCR
-                custom_config = r'--oem 3 --psm 6 -l eng'
-                processed_text = pytesseract.image_to_string(image, config=custom_config)
-                
-                print(f"DEBUG - OCR extracted: {processed_text[:200]}")
-                
-            except Exception as e:
-                print(f"DEBUG - OCR Error: {str(e)}")
-                processed_text = f"Error: {str(e)}"
-        
-        # Check if user_input has a text attribute
-        elif hasattr(user_input, 'text'):
-            text_content = user_input.text
-            print(f"DEBUG - Text from message: {text_content[:100] if text_content else 'EMPTY'}")
-            
-            # If text is empty but there might be a file reference
-            if not text_content or text_content.strip() == "":
-                # Check if there's a file reference in the message data
-                if hasattr(user_input, 'data') and user_input.data:
-                    print(f"DEBUG - Message data: {user_input.data}")
-                    
-                    # Look for file path in data
-                    if 'file_path' in user_input.data:
-                        try:
-                            import pytesseract
-                            from PIL import Image
-                            
-                            file_path = user_input.data['file_path']
-                            print(f"DEBUG - Found file path in data: {file_path}")
-                            
-                            pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
-                            
-                            image = Image.open(file_path)
-                            image = image.convert('L')
-                            custom_config = r'--oem 3 --psm 6 -l eng'
-                            processed_text = pytesseract.image_to_string(image, config=custom_config)
-                            
-                            print(f"DEBUG - OCR from data path: {processed_text[:200]}")
-                        except Exception as e:
-                            print(f"DEBUG - Error processing file from data: {str(e)}")
-                            processed_text = ""
-                else:
-                    processed_text = ""
-            else:
-                # Handle URL
-                if text_content.startswith('http'):
-                    try:
-                        import requests
-                        from bs4 import BeautifulSoup
-                        
-                        headers = {'User-Agent': 'Mozilla/5.0'}
-                        response = requests.get(text_content, headers=headers, timeout=10)
-                        soup = BeautifulSoup(response.content, 'html.parser')
-                        
-                        for script in soup(["script", "style"]):
-                            script.decompose()
-                        
-                        processed_text = soup.get_text()
-                        processed_text = ' '.join(processed_text.split())[:3000]
-                    except Exception as e:
-                        processed_text = text_content
-                else:
-                    # Plain text
-                    processed_text = text_content
-        
-        # Fallback: treat as string
-        else:
-            user_input_str = str(user_input)
-            print(f"DEBUG - String input: {user_input_str[:100]}")
-            
-            if user_input_str.startswith('http'):
-                # URL handling
-                try:
-                    import requests
-                    from bs4 import BeautifulSoup
-                    
-                    headers = {'User-Agent': 'Mozilla/5.0'}
-                    response = requests.get(user_input_str, headers=headers, timeout=10)
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    
-                    for script in soup(["script", "style"]):
-                        script.decompose()
-                    
-                    processed_text = soup.get_text()
-                    processed_text = ' '.join(processed_text.split())[:3000]
-                except:
-                    processed_text = user_input_str
-            else:
-                processed_text = user_input_str
-        
-        # Clean text
-        if processed_text:
-            processed_text = re.sub(r'\s+', ' ', processed_text)
-            processed_text = processed_text[:3000].strip()
-        
-        print(f"DEBUG - Final output length: {len(processed_text)}")
-        print(f"DEBUG - Final output preview: {processed_text[:200]}")
-        
-        return Message(text=processed_text if processed_text else "No text could be extracted from input")
+        return Message(text=process_user_input(self.user_input))
+    
+    def prompt_source(self) -> Message:
+        return Message(text=process_user_input(self.user_input, MAX_PROMPT_SOURCE_CHARS))
@@ -0,0 +1,126 @@
+import re
+from itertools import islice
+from urllib.parse import urlsplit
+
+from verdict_cache import normalize_url
+
+
+# ═══════════════════════════════════════════
+# LINEAR-TIME URL / DOMAIN EXTRACTION
+# Every pattern can only start at a token boundary (negative lookbehind)
+# and has no nested unbounded repeats, so a scan does a bounded amount of
+# work per input character whatever the text looks like; islice caps the
+# number of candidates we ever look at.
+# ═══════════════════════════════════════════
+MAX_URL_CANDIDATES = 50
+MAX_DOMAIN_CANDIDATES = 50
+MAX_URL_LENGTH = 2048
+
+# Scheme at a word start, then a run of characters URLs may contain
+URL_RE = re.compile(r'(?<![\w])https?://[^\s<>"\'`{}|\\^]{1,%d}' % MAX_URL_LENGTH, re.IGNORECASE)
+
+# host.name.tld, not part of an email (@), path (/) or longer token
+DOMAIN_RE = re.compile(
+    r'(?<![\w.@/-])'
+    r'((?:[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?\.){1,6}([a-z]{2,24}))'
+    r'(?![\w-])',
+    re.IGNORECASE
+)
+
+TRAILING_PUNCTUATION = '.,;:!?\'"*'
+BRACKETS = {')': '(', ']': '['}
+
+# Bare "word.word" only counts as a domain when the last label is a real,
+# commonly seen TLD ("experience.Apply" is not a domain)
+COMMON_TLDS = frozenset("""
+    com net org info biz edu gov mil int co io ai app dev me tv cc ws
+    in uk us ca au de fr nl it es ru cn jp kr sg my ae pk bd lk np id ph
+    vn th hk tw nz za ng ke br mx ar ch se no dk fi pl eu asia
+    online site website store shop tech live life work jobs careers career
+    today space world link click xyz top club vip win loan email pro cloud
+    agency company services solutions digital global network group team
+    ly gl gd to tk ml ga cf gq pw icu buzz fun host press news blog
+""".split())
+
+
+def clean_url(url: str) -> str:
+    """
+    Drops trailing sentence punctuation and unbalanced closing brackets
+    """
+    # Count once and walk back, so a run of ')))...' stays linear
+    unbalanced = {close: url.count(close) - url.count(open_) for close, open_ in BRACKETS.items()}
+    end = len(url)
+    while end:
+        last = url[end - 1]
+        if last in TRAILING_PUNCTUATION:
+            end -= 1
+        elif last in BRACKETS and unbalanced[last] > 0:
+            unbalanced[last] -= 1
+            end -= 1
+        else:
+            break
+    return url[:end]
+
+
+def valid_host(host: str) -> bool:
+    """
+    DNS-shaped hostname: dot-separated labels of letters/digits/hyphens,
+    no empty labels or edge hyphens, and a dot unless it's localhost
+    """
+    host = (host or '').rstrip('.')
+    if not host or len(host) > 253 or ('.' not in host and host != 'localhost'):
+        return False
+    for label in host.split('.'):
+        if not label or len(label) > 63 or label[0] == '-' or label[-1] == '-':
+            return False
+        if not label.replace('-', '').isalnum():
+            return False
+    return True
+
+
+def extract_urls(text: str, limit: int = MAX_URL_CANDIDATES) -> list:
+    """
+    http(s) URLs in order of appearance, cleaned, normalized and deduplicated
+    Returns: at most `limit` URLs
+    """
+    urls = []
+    seen = set()
+    for match in islice(URL_RE.finditer(text), limit):
+        url = clean_url(match.group(0))
+        try:
+            if not valid_host(urlsplit(url).hostname):
+                continue
+            url = clean_url(normalize_url(url))   # dropping '#...' can expose punctuation
+        except ValueError:
+            continue   # e.g. a port outside 0-65535
+        if url not in seen:
+            seen.add(url)
+            urls.append(url)
+    return urls
+
+
+def extract_domains(text: str, urls: list = (), limit: int = MAX_DOMAIN_CANDIDATES) -> list:
+    """
+    Hosts of `urls` plus bare domains mentioned in the text, lowercased,
+    without a leading 'www.', deduplicated
+    Returns: at most `limit` domains
+    """
+    domains = []
+    seen = set()
+
+    def add(domain):
+        domain = domain.lower().rstrip('.')
+        while domain.startswith('www.') and '.' in domain[4:]:
+            domain = domain[4:]
+        if domain and domain not in seen:
+            seen.add(domain)
+            domains.append(domain)
+
+    for url in urls:
+        add(urlsplit(url).hostname or '')
+
+    for match in islice(DOMAIN_RE.finditer(text), limit):
+        if match.group(2).lower() in COMMON_TLDS:
+            add(match.group(1))
+
+    return domains[:limit]
@@ -0,0 +1,148 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlsplit, urlunsplit
+
+import metrics
+
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+PRUNE_EVERY = 256   # writes between sweeps of expired rows on disk
+
+
+def normalize_url(url: str) -> str:
+    """
+    Canonical cache key for a URL: lowercase scheme/host, no default
+    port, no fragment, empty path as '/'. Query strings are kept as-is.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').rstrip('.')
+    netloc = host
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        netloc = f"{host}:{parts.port}"
+    if parts.username:
+        userinfo = parts.username + (f":{parts.password}" if parts.password else '')
+        netloc = f"{userinfo}@{netloc}"
+    return urlunsplit((scheme, netloc, parts.path or '/', parts.query, ''))
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache with per-entry TTL and hit/miss counters
+    Pass `path` to write entries through to SQLite so they survive
+    restarts; values must be JSON-serializable. `maxbytes` adds a memory
+    bound on top of `maxsize`, measured as each value's JSON length.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600.0,
+                 path: str = None, table: str = 'cache', maxbytes: int = None):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()     # key -> (expires_at, value, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._table = table
+        self._writes = 0
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL)"
+            )
+            self._prune_disk(time.time())
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key: str, default=None):
+        now = time.time()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    metrics.inc('cache_requests_total', cache=self._table, result='hit')
+                    return entry[1]
+                self._evict(key)
+
+            if self._db is not None:
+                row = self._db.execute(
+                    f"SELECT value, expires FROM {self._table} WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and row[1] > now:
+                    value = json.loads(row[0])
+                    self._store(key, value, row[1], len(row[0]))
+                    self.hits += 1
+                    metrics.inc('cache_requests_total', cache=self._table, result='disk_hit')
+                    return value
+
+            self.misses += 1
+            metrics.inc('cache_requests_total', cache=self._table, result='miss')
+            return default
+
+    def set(self, key: str, value):
+        expires = time.time() + self.ttl
+        encoded = json.dumps(value) if (self._db is not None or self.maxbytes) else None
+        with self._lock:
+            self._store(key, value, expires, len(encoded) if encoded else 0)
+            if self._db is not None:
+                self._db.execute(
+                    f"INSERT OR REPLACE INTO {self._table} (key, value, expires) VALUES (?, ?, ?)",
+                    (key, encoded, expires)
+                )
+                self._writes += 1
+                if self._writes % PRUNE_EVERY == 0:
+                    self._prune_disk(time.time())
+                self._db.commit()
+
+    def delete(self, key: str):
+        with self._lock:
+            if key in self._data:
+                self._evict(key)
+            if self._db is not None:
+                self._db.execute(f"DELETE FROM {self._table} WHERE key = ?", (key,))
+                self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+            self.hits = self.misses = 0
+            if self._db is not None:
+                self._db.execute(f"DELETE FROM {self._table}")
+                self._db.commit()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._data),
+            'bytes': self._bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+    def _store(self, key, value, expires, size):
+        # Caller holds the lock
+        if key in self._data:
+            self._evict(key)
+        self._data[key] = (expires, value, size)
+        self._bytes += size
+        while len(self._data) > self.maxsize or (
+                self.maxbytes and self._bytes > self.maxbytes and len(self._data) > 1):
+            self._evict(next(iter(self._data)))
+
+    def _evict(self, key):
+        self._bytes -= self._data.pop(key)[2]
+
+    def _prune_disk(self, now):
+        self._db.execute(f"DELETE FROM {self._table} WHERE expires <= ?", (now,))
+        self._db.commit()